@@ -0,0 +1,116 @@
+"""
+Benchmark of the DICOM series loading: sitk.ImageSeriesReader (serial decoding) against
+hesperos.image_io.readers.read_dicom_series (parallel decoding into a preallocated array), with a header pass to sort
+the files or with files already sorted (e.g. by the DICOM folder index).
+
+A synthetic multi-file series is written in a temporary folder (optionally JPEG-2000 compressed).
+
+Usage:
+    python benchmarks/bench_dicom_loading.py --slices 300 --size 512 --compressor JPEG2000 --workers 8
+"""
+# ============ Import python files ============
+from hesperos.image_io.readers import read_dicom_series
+
+
+# ============ Import python packages ============
+import time
+import argparse
+import tempfile
+import numpy as np
+import SimpleITK as sitk
+from pathlib import Path
+
+
+# ============ Synthetic series ============
+def write_synthetic_series(folder, nbr_slices, size, compressor=None):
+    """
+    Write a synthetic CT-like DICOM series, one file per slice, in a shuffled file order
+
+    Parameters
+    ----------
+    folder : Path
+        output folder
+    nbr_slices : int
+        number of slices (files)
+    size : int
+        number of rows and columns of a slice
+    compressor : str
+        SimpleITK compressor name (e.g. "JPEG2000"), None for uncompressed files
+
+    """
+    rng = np.random.default_rng(0)
+    yy, xx = np.mgrid[:size, :size]
+    disk = ((yy - size / 2) ** 2 + (xx - size / 2) ** 2) < (size / 3) ** 2
+
+    writer = sitk.ImageFileWriter()
+    writer.KeepOriginalImageUIDOn()
+    if compressor is not None:
+        writer.SetUseCompression(True)
+        writer.SetCompressor(compressor)
+
+    for file_index, ind_z in enumerate(rng.permutation(nbr_slices)):
+        slice_arr = (disk * 1000 + rng.normal(0, 20, (size, size))).astype(np.int16)[np.newaxis]
+        slice_sitk = sitk.GetImageFromArray(slice_arr)
+        slice_sitk.SetSpacing((0.7, 0.7, 1.25))
+
+        position = (0.0, 0.0, 1.25 * ind_z)
+        for key, value in [
+            ("0008|0060", "CT"),
+            ("0020|000e", "1.2.826.0.1.3680043.2.1125.1"),
+            ("0020|0013", str(ind_z)),
+            ("0020|0032", "\\".join(str(p) for p in position)),
+            ("0020|0037", "1\\0\\0\\0\\1\\0"),
+        ]:
+            slice_sitk.SetMetaData(key, value)
+
+        writer.SetFileName(str(folder.joinpath(f"IM{file_index:05d}.dcm")))
+        writer.Execute(slice_sitk)
+
+
+# ============ Benchmark ============
+def run_benchmark(nbr_slices, size, compressor, nbr_workers, repeat):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        folder = Path(tmp_dir)
+        write_synthetic_series(folder, nbr_slices, size, compressor)
+
+        reader = sitk.ImageSeriesReader()
+        file_names = reader.GetGDCMSeriesFileNames(str(folder))
+
+        serial_times, parallel_times, sorted_times = [], [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            reader = sitk.ImageSeriesReader()
+            reader.SetFileNames(file_names)
+            reference_sitk = reader.Execute()
+            reference_arr = sitk.GetArrayFromImage(reference_sitk)
+            serial_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            image_arr, image_geometry = read_dicom_series(file_names, nbr_workers)
+            parallel_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            sorted_arr, sorted_geometry = read_dicom_series(file_names, nbr_workers, isSorted=True)
+            sorted_times.append(time.perf_counter() - start)
+
+        for arr, geometry in [(image_arr, image_geometry), (sorted_arr, sorted_geometry)]:
+            assert np.array_equal(reference_arr, arr)
+            assert np.allclose(reference_sitk.GetSpacing(), geometry.spacing)
+            assert np.allclose(reference_sitk.GetOrigin(), geometry.origin)
+
+    print(f"{nbr_slices} slices of {size}x{size}, compressor={compressor}, workers={nbr_workers}")
+    print(f"  sitk.ImageSeriesReader : {min(serial_times):.3f} s")
+    print(f"  read_dicom_series      : {min(parallel_times):.3f} s ({min(serial_times) / min(parallel_times):.2f}x)")
+    print(f"  read_dicom_series (sorted files) : {min(sorted_times):.3f} s ({min(serial_times) / min(sorted_times):.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slices", type=int, default=200)
+    parser.add_argument("--size", type=int, default=256)
+    parser.add_argument("--compressor", default=None, help="e.g. JPEG2000 (default: uncompressed)")
+    parser.add_argument("--workers", type=int, default=None, help="number of decoding threads (default: ThreadPoolExecutor default)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    run_benchmark(args.slices, args.size, args.compressor, args.workers, args.repeat)
@@ -0,0 +1,153 @@
+"""
+Benchmark of the plugin startup: import time of the hesperos modules (python -X importtime, in a new interpreter for
+each run) and time until the dock widget is shown in a napari viewer.
+
+The heavy libraries imported at startup are listed: scikit-learn, pandas, scikit-image and scipy should only be
+imported when a segmentation is run, SimpleITK and tifffile when a file is read or written.
+
+Usage:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --dock-widget manual
+"""
+# ============ Import python packages ============
+import os
+import sys
+import argparse
+import subprocess
+
+
+# ============ Constants ============
+DEFAULT_MODULES = ["hesperos", "hesperos._manual_widget", "hesperos._oneshot_widget"]
+HEAVY_MODULES = ["sklearn", "pandas", "skimage", "scipy", "SimpleITK", "tifffile"]
+
+DOCK_WIDGET_SCRIPT = """
+import time
+start = time.perf_counter()
+
+import napari
+from qtpy.QtWidgets import QApplication
+napari_time = time.perf_counter() - start
+
+viewer = napari.Viewer()
+viewer_time = time.perf_counter() - start
+
+from hesperos import {widget_class}
+widget = {widget_class}(viewer)
+viewer.window.add_dock_widget(widget)
+QApplication.processEvents()
+
+print(napari_time, viewer_time, time.perf_counter() - start)
+viewer.close()
+"""
+DOCK_WIDGET_CLASSES = {"manual": "ManualSegmentationWidget", "oneshot": "OneShotWidget"}
+
+
+# ============ Import time ============
+def parse_importtime(output):
+    """
+    Parse the output of python -X importtime
+
+    Parameters
+    ----------
+    output : str
+        stderr of the interpreter
+
+    Returns
+    ----------
+    cumulative_times : dict[str, float]
+        cumulative import time (in seconds) of each imported module
+
+    """
+    cumulative_times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        _, cumulative, name = line[len("import time:"):].split("|")
+        cumulative_times[name.strip()] = int(cumulative) / 1e6
+
+    return cumulative_times
+
+
+def measure_import_time(module_name):
+    """
+    Import a module in a new interpreter with python -X importtime
+
+    Parameters
+    ----------
+    module_name : str
+        module to import
+
+    Returns
+    ----------
+    import_time : float
+        cumulative import time of the module in seconds. None if the module cannot be imported.
+    heavy_modules : list[str]
+        heavy libraries (HEAVY_MODULES) imported with the module
+    error : str
+        last line of the error if the module cannot be imported
+
+    """
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module_name}"], capture_output=True, text=True)
+    cumulative_times = parse_importtime(process.stderr)
+
+    if process.returncode != 0:
+        return None, [], process.stderr.strip().splitlines()[-1]
+
+    heavy_modules = [name for name in HEAVY_MODULES if name in cumulative_times]
+
+    return cumulative_times.get(module_name), heavy_modules, ""
+
+
+# ============ Dock widget ============
+def measure_dock_widget_time(widget_name):
+    """
+    Start napari in a new interpreter, add the widget as a dock widget and wait until it is shown
+
+    Parameters
+    ----------
+    widget_name : str
+        "manual" or "oneshot"
+
+    Returns
+    ----------
+    times : tuple(float, float, float)
+        times (in seconds) since the start to import napari, to create the viewer and to show the dock widget
+
+    """
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    script = DOCK_WIDGET_SCRIPT.format(widget_class=DOCK_WIDGET_CLASSES[widget_name])
+    process = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env)
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1])
+
+    return tuple(float(value) for value in process.stdout.split()[-3:])
+
+
+def run_benchmark(module_names, repeat, dock_widget=None):
+    for module_name in module_names:
+        results = [measure_import_time(module_name) for _ in range(repeat)]
+        _, heavy_modules, error = results[0]
+
+        if error != "":
+            print(f"{module_name:<28}: not importable ({error})")
+            continue
+
+        best_time = min(result[0] for result in results)
+        print(f"{module_name:<28}: {best_time:.3f} s, heavy libraries imported: {', '.join(heavy_modules) or 'none'}")
+
+    if dock_widget is not None:
+        times = min((measure_dock_widget_time(dock_widget) for _ in range(repeat)), key=lambda t: t[-1])
+        print(f"{dock_widget} dock widget shown after {times[2]:.3f} s (napari imported: {times[0]:.3f} s, viewer created: {times[1]:.3f} s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--dock-widget", choices=list(DOCK_WIDGET_CLASSES), default=None)
+    args = parser.parse_args()
+
+    run_benchmark(args.modules, args.repeat, args.dock_widget)
@@ -0,0 +1,115 @@
+"""
+Benchmark of the oriented landmarks loading: the previous DIVA JSON parsing (json.loads + pd.json_normalize twice)
+against hesperos.landmarks.landmark_io (JSON parsed straight into arrays, and binary .npz sidecar).
+
+A synthetic landmark set is written in a temporary folder.
+
+Usage:
+    python benchmarks/bench_landmark_io.py --landmarks 100000
+"""
+# ============ Import python files ============
+from hesperos.landmarks.landmark_io import (
+    read_oriented_landmarks,
+    read_oriented_landmarks_json,
+    write_oriented_landmarks,
+)
+
+
+# ============ Import python packages ============
+import json
+import time
+import argparse
+import tempfile
+import numpy as np
+from pathlib import Path
+
+
+# ============ Previous implementation ============
+def read_with_pandas(file_path):
+    """
+    Parse a DIVA file as the widget did before (pandas DataFrames)
+
+    Parameters
+    ----------
+    file_path : str
+        path of the JSON file
+
+    Returns
+    ----------
+    diva_positions : ndarray
+        (N, 3) array of DIVA positions (x, y, z)
+    quaternions : ndarray
+        (N, 4) array of local rotations (x, y, z, w)
+
+    """
+    import pandas as pd
+
+    with open(file_path, 'r') as f:
+        oriented_landmarks_data = json.loads(f.read())
+    positions_df = pd.json_normalize(oriented_landmarks_data['_oriented_landmarks_parameters'], record_path=['_volume_positions'])
+    orientations_df = pd.json_normalize(oriented_landmarks_data['_oriented_landmarks_parameters'], record_path=['_local_rotations'])
+
+    return positions_df[["x", "y", "z"]].to_numpy(), orientations_df[["x", "y", "z", "w"]].to_numpy()
+
+
+# ============ Benchmark ============
+def time_function(function, repeat):
+    """
+    Best execution time of a function
+
+    Parameters
+    ----------
+    function : func
+        function without argument
+    repeat : int
+        number of executions
+
+    Returns
+    ----------
+    best_time : float
+        best time in seconds
+    result : object
+        result of the last execution
+
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+
+    return min(times), result
+
+
+def run_benchmark(nbr_landmarks, repeat):
+    rng = np.random.default_rng(0)
+    diva_positions = rng.integers(0, 512, size=(nbr_landmarks, 3))
+    quaternions = rng.normal(size=(nbr_landmarks, 4))
+    quaternions /= np.linalg.norm(quaternions, axis=1, keepdims=True)
+
+    with tempfile.TemporaryDirectory() as folder:
+        file_path = Path(folder).joinpath("landmarks.json")
+
+        write_time, _ = time_function(lambda: write_oriented_landmarks(file_path, diva_positions, quaternions, isSidecarWritten=True), repeat)
+        pandas_time, (pandas_positions, pandas_quaternions) = time_function(lambda: read_with_pandas(file_path), repeat)
+        json_time, (json_positions, json_quaternions) = time_function(lambda: read_oriented_landmarks_json(file_path), repeat)
+        npz_time, (npz_positions, npz_quaternions) = time_function(lambda: read_oriented_landmarks(file_path), repeat)
+
+        for positions, rotations in [(pandas_positions, pandas_quaternions), (json_positions, json_quaternions), (npz_positions, npz_quaternions)]:
+            assert np.array_equal(positions, diva_positions)
+            assert np.array_equal(rotations, quaternions)
+
+    print(f"{nbr_landmarks} oriented landmarks")
+    print(f"  write (JSON + sidecar)          : {write_time:.3f} s")
+    print(f"  read, json + pd.json_normalize  : {pandas_time:.3f} s")
+    print(f"  read, JSON parsed into arrays   : {json_time:.3f} s")
+    print(f"  read, binary sidecar            : {npz_time:.4f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--landmarks", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    run_benchmark(args.landmarks, args.repeat)
@@ -0,0 +1,41 @@
+import numpy as np
+from hesperos.image_io.contrast import estimate_contrast_limits
+from hesperos.image_io.lazy_volume import LazyVolume
+
+
+def test_integer_range_is_widened_and_clamped():
+    array = np.random.default_rng(0).integers(-500, 500, (20, 32, 32)).astype(np.int32)
+
+    contrast_limits, contrast_limits_range = estimate_contrast_limits(array)
+
+    assert -500 <= contrast_limits[0] < contrast_limits[1] < 500
+    assert -1100 < contrast_limits_range[0] < -500
+    assert 500 < contrast_limits_range[1] < 1100
+    assert contrast_limits_range == tuple(np.round(contrast_limits_range))
+
+    _, contrast_limits_range = estimate_contrast_limits(array.clip(0, 255).astype(np.uint8))
+    assert contrast_limits_range == (0.0, 255.0)
+
+
+def test_float_range_ignores_non_finite_values():
+    array = np.random.default_rng(0).normal(0, 100, (40, 64, 64)).astype(np.float32)
+    array[::2, 3, 3] = np.nan
+    array[::2, 5, 5] = np.inf
+
+    contrast_limits, contrast_limits_range = estimate_contrast_limits(array)
+
+    assert np.isfinite(contrast_limits).all() and np.isfinite(contrast_limits_range).all()
+    assert contrast_limits_range[0] < contrast_limits[0] < contrast_limits[1] < contrast_limits_range[1]
+
+
+def test_lazy_volume_reads_only_sampled_slices():
+    array = np.random.default_rng(0).normal(0, 100, (40, 16, 16))
+    read_slices = []
+
+    def read_slice(ind_z):
+        read_slices.append(ind_z)
+        return array[ind_z]
+
+    estimate_contrast_limits(LazyVolume(read_slice, array.shape, array.dtype), max_nbr_slices=4)
+
+    assert len(set(read_slices)) == 4
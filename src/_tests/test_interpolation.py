@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from hesperos.label_tools.interpolation import interpolate_labels
+
+
+def run_worker(generator):
+    try:
+        while True:
+            next(generator)
+    except StopIteration as stop:
+        return stop.value
+
+
+def ball_volume(shape=(40, 40, 40), center=(20, 20, 20), radius=12, label=3):
+    zz, yy, xx = np.mgrid[:shape[0], :shape[1], :shape[2]]
+    isBall = (zz - center[0]) ** 2 + (yy - center[1]) ** 2 + (xx - center[2]) ** 2 < radius ** 2
+    return isBall.astype(np.uint8) * label
+
+
+def keep_slices(volume, axis, step):
+    annotated = np.zeros_like(volume)
+    index = [slice(None)] * volume.ndim
+    index[axis] = slice(None, None, step)
+    annotated[tuple(index)] = volume[tuple(index)]
+    return annotated
+
+
+def dice(mask_a, mask_b):
+    return 2 * (mask_a & mask_b).sum() / (mask_a.sum() + mask_b.sum())
+
+
+@pytest.mark.parametrize("axis", [0, 1, 2])
+def test_ball_is_interpolated(axis):
+    truth = ball_volume()
+    segmentation_arr = keep_slices(truth, axis, 6)
+
+    indices, new_values = run_worker(interpolate_labels(segmentation_arr, axis))
+
+    assert (segmentation_arr[indices] == 0).all()
+    assert set(np.unique(new_values)) == {3}
+
+    segmentation_arr[indices] = new_values
+    assert dice(segmentation_arr == 3, truth == 3) > 0.9
+
+
+def test_labelled_voxels_are_kept():
+    truth = ball_volume()
+    segmentation_arr = keep_slices(truth, 0, 6)
+    segmentation_arr[15, 15:25, 15:25] = 5
+
+    indices, new_values = run_worker(interpolate_labels(segmentation_arr, 0, labels=[3]))
+
+    assert (segmentation_arr[indices] == 0).all()
+    assert set(np.unique(new_values)) == {3}
+
+
+def test_overlapping_labels_are_resolved():
+    segmentation_arr = keep_slices(ball_volume(center=(20, 20, 15), label=1), 0, 10)
+    segmentation_arr = np.maximum(segmentation_arr, keep_slices(ball_volume(center=(20, 20, 25), label=2), 0, 10))
+
+    indices, new_values = run_worker(interpolate_labels(segmentation_arr, 0))
+
+    flat_indices = np.ravel_multi_index(indices, segmentation_arr.shape)
+    assert len(np.unique(flat_indices)) == len(flat_indices)
+    assert set(np.unique(new_values)) == {1, 2}
+
+    # outside the intersection of the two balls, each voxel takes the label it is inside
+    assert (new_values[indices[2] < 14] == 1).all()
+    assert (new_values[indices[2] > 26] == 2).all()
+
+
+def test_max_gap():
+    segmentation_arr = keep_slices(ball_volume(), 0, 6)
+
+    indices, new_values = run_worker(interpolate_labels(segmentation_arr, 0, max_gap=5))
+
+    assert len(new_values) == 0
@@ -0,0 +1,114 @@
+import numpy as np
+from hesperos.label_tools.journal import (
+    EditJournal,
+    archive_journal,
+    decode_edit,
+    encode_edit,
+    find_matching_journal,
+    get_archived_journal_paths,
+    is_same_base,
+    read_journal,
+    replay_journal,
+)
+
+
+SHAPE = (4, 16, 16)
+
+
+def random_edit(rng, nbr_voxels=50):
+    flat_indices = rng.choice(np.prod(SHAPE), size=nbr_voxels, replace=False)
+    indices = np.unravel_index(flat_indices, SHAPE)
+    old_values = rng.integers(0, 5, nbr_voxels).astype(np.uint8)
+    new_values = rng.integers(0, 5, nbr_voxels).astype(np.uint8)
+    return indices, old_values, new_values
+
+
+def test_encode_decode_round_trip():
+    indices, old_values, new_values = random_edit(np.random.default_rng(0))
+
+    flat_indices, decoded_old, decoded_new = decode_edit(encode_edit(indices, old_values, new_values, SHAPE))
+
+    order = np.argsort(np.ravel_multi_index(indices, SHAPE))
+    assert np.array_equal(flat_indices, np.ravel_multi_index(indices, SHAPE)[order])
+    assert np.array_equal(decoded_old, old_values[order])
+    assert np.array_equal(decoded_new, new_values[order])
+
+
+def test_encode_decode_single_label():
+    indices = (np.array([0, 1]), np.array([2, 3]), np.array([4, 5]))
+
+    _, old_values, new_values = decode_edit(encode_edit(indices, np.array([0, 1], dtype=np.uint8), 3, SHAPE))
+
+    assert np.array_equal(old_values, [0, 1])
+    assert new_values.ndim == 0 and new_values == 3
+
+
+def test_journal_replay(tmp_path):
+    rng = np.random.default_rng(1)
+    file_path = tmp_path / "journal.bin"
+    segmentation_arr = np.zeros(SHAPE, dtype=np.uint8)
+    header = {"shape": list(SHAPE), "base_file": None}
+
+    journal = EditJournal(file_path, header)
+    for _ in range(5):
+        indices, _, new_values = random_edit(rng)
+        journal.record(indices, segmentation_arr[indices], new_values)
+        segmentation_arr[indices] = new_values
+    journal.close()
+    assert journal.nbr_records == 5
+
+    read_header, records = read_journal(file_path)
+    assert is_same_base(read_header, header)
+    assert len(records) == 5
+
+    replayed_arr = np.zeros(SHAPE, dtype=np.uint8)
+    assert replay_journal(records, replayed_arr) == 5
+    assert np.array_equal(replayed_arr, segmentation_arr)
+
+
+def test_truncated_record_is_ignored(tmp_path):
+    file_path = tmp_path / "journal.bin"
+    journal = EditJournal(file_path, {"shape": list(SHAPE), "base_file": None})
+    for seed in range(3):
+        journal.record(*random_edit(np.random.default_rng(seed)))
+    journal.close()
+
+    with open(file_path, 'r+b') as f:
+        f.truncate(file_path.stat().st_size - 3)
+
+    _, records = read_journal(file_path)
+    assert len(records) == 2
+
+
+def test_header_mismatch(tmp_path):
+    file_path = tmp_path / "journal.bin"
+    journal = EditJournal(file_path, {"shape": list(SHAPE), "base_file": "/data/segmentation.tif"})
+    journal.record(*random_edit(np.random.default_rng(0)))
+    journal.close()
+
+    read_header, _ = read_journal(file_path)
+    assert not is_same_base(read_header, {"shape": list(SHAPE), "base_file": None})
+    assert not is_same_base(read_header, {"shape": [1, 16, 16], "base_file": "/data/segmentation.tif"})
+    assert not is_same_base(None, {"shape": list(SHAPE), "base_file": None})
+
+    journal_path, records = find_matching_journal(file_path, {"shape": list(SHAPE), "base_file": None})
+    assert journal_path is None and records == []
+
+
+def test_archived_journal_is_found(tmp_path):
+    file_path = tmp_path / "journal.bin"
+    header = {"shape": list(SHAPE), "base_file": "/data/segmentation.tif"}
+    journal = EditJournal(file_path, header)
+    journal.record(*random_edit(np.random.default_rng(0)))
+    journal.close()
+
+    archive_path = archive_journal(file_path)
+    assert not file_path.exists()
+    assert get_archived_journal_paths(file_path) == [archive_path]
+
+    # a new session on another segmentation does not overwrite the archived journal
+    EditJournal(file_path, {"shape": list(SHAPE), "base_file": None}).close()
+
+    journal_path, records = find_matching_journal(file_path, header)
+    assert journal_path == archive_path
+    assert len(records) == 1
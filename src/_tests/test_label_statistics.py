@@ -0,0 +1,72 @@
+import numpy as np
+from hesperos.label_tools.label_statistics import LabelStatistics, compute_label_statistics
+
+
+def reference_statistics(segmentation_arr, voxel_volume):
+    statistics = []
+    for label in np.unique(segmentation_arr[segmentation_arr > 0]):
+        positions = np.nonzero(segmentation_arr == label)
+        statistics.append({
+            "label": int(label),
+            "voxel_count": len(positions[0]),
+            "volume": float(len(positions[0]) * voxel_volume),
+            "bounding_box": (tuple(int(p.min()) for p in positions), tuple(int(p.max()) for p in positions)),
+        })
+    return statistics
+
+
+def test_full_computation():
+    segmentation_arr = np.zeros((10, 20, 30), dtype=np.uint8)
+    segmentation_arr[2:4, 5:10, 1:3] = 1
+    segmentation_arr[9, 0, 29] = 4
+
+    statistics = LabelStatistics(voxel_volume=0.5).get_statistics(segmentation_arr)
+
+    assert statistics == reference_statistics(segmentation_arr, 0.5)
+    assert statistics[0]["bounding_box"] == ((2, 5, 1), (3, 9, 2))
+
+
+def test_computation_in_a_new_instance():
+    segmentation_arr = np.zeros((10, 20, 30), dtype=np.uint8)
+    segmentation_arr[2:4, 5:10, 1:3] = 3
+
+    statistics = compute_label_statistics(segmentation_arr, voxel_volume=2.0)
+
+    assert statistics.isComputed
+    assert statistics.get_statistics(segmentation_arr) == reference_statistics(segmentation_arr, 2.0)
+
+
+def test_incremental_updates_match_full_computation():
+    rng = np.random.default_rng(0)
+    segmentation_arr = np.zeros((10, 20, 30), dtype=np.uint8)
+    segmentation_arr[2:6, 2:8, 2:8] = 1
+
+    label_statistics = LabelStatistics(voxel_volume=2.0)
+    label_statistics.compute(segmentation_arr)
+
+    for i in range(100):
+        flat_indices = np.unique(rng.integers(0, segmentation_arr.size, rng.integers(1, 100)))
+        indices = np.unravel_index(flat_indices, segmentation_arr.shape)
+        # brush (a single label) or undo/redo (several labels)
+        new_values = int(rng.integers(0, 8)) if i % 2 else rng.integers(0, 8, len(flat_indices)).astype(np.uint8)
+
+        old_values = segmentation_arr[indices].copy()
+        segmentation_arr[indices] = new_values
+        label_statistics.update(indices, old_values, new_values)
+
+        if i % 10 == 0:
+            assert label_statistics.get_statistics(segmentation_arr) == reference_statistics(segmentation_arr, 2.0)
+
+    assert label_statistics.get_statistics(segmentation_arr) == reference_statistics(segmentation_arr, 2.0)
+
+
+def test_updates_before_computation_are_ignored():
+    segmentation_arr = np.zeros((2, 4, 4), dtype=np.uint8)
+    label_statistics = LabelStatistics()
+
+    indices = (np.array([0]), np.array([1]), np.array([1]))
+    label_statistics.update(indices, segmentation_arr[indices], 3)
+    segmentation_arr[indices] = 3
+
+    assert not label_statistics.isComputed
+    assert label_statistics.get_statistics(segmentation_arr) == reference_statistics(segmentation_arr, 1.0)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from hesperos.landmarks import landmark_index
+from hesperos.landmarks.landmark_index import LandmarkIndex
+
+
+def brute_force_within_slices(positions, axis, slice_index, nbr_slices):
+    return np.flatnonzero(np.abs(positions[:, axis] - slice_index) <= nbr_slices)
+
+
+@pytest.mark.parametrize("max_nbr_pending", [1, 4, 1000])
+def test_queries_match_brute_force_after_edits(monkeypatch, max_nbr_pending):
+    monkeypatch.setattr(landmark_index, "MAX_NBR_PENDING", max_nbr_pending)
+    rng = np.random.default_rng(0)
+    positions = rng.integers(0, 50, size=(30, 3)).astype(np.float64)
+    index = LandmarkIndex(positions)
+
+    for _ in range(200):
+        if (len(positions) > 0) and (rng.random() < 0.3):
+            removed_index = int(rng.integers(len(positions)))
+            positions = np.delete(positions, removed_index, axis=0)
+            index.remove(removed_index)
+        else:
+            position = rng.integers(0, 50, size=3).astype(np.float64)
+            positions = np.vstack([positions, position])
+            index.add(position)
+
+        assert len(index) == len(positions)
+        assert np.array_equal(index.positions, positions)
+
+        axis, slice_index, nbr_slices = int(rng.integers(3)), int(rng.integers(50)), int(rng.integers(3))
+        assert np.array_equal(index.within_slices(axis, slice_index, nbr_slices), brute_force_within_slices(positions, axis, slice_index, nbr_slices))
+
+        point = rng.uniform(0, 50, size=3)
+        distances = np.linalg.norm(positions - point, axis=1)
+        assert np.isclose(distances[index.nearest(point)], distances.min())
+
+
+def test_empty_index():
+    index = LandmarkIndex()
+
+    assert index.nearest((1, 2, 3)) is None
+    assert len(index.within_slices(0, 5, 2)) == 0
@@ -0,0 +1,112 @@
+import json
+import numpy as np
+import pytest
+from hesperos.landmarks.landmark_io import (
+    get_sidecar_path,
+    parse_oriented_landmarks,
+    read_oriented_landmarks,
+    read_oriented_landmarks_json,
+    write_oriented_landmarks,
+)
+from hesperos.landmarks.orientation import are_inside_volume, diva_to_volume_positions, volume_to_diva_positions
+
+
+def random_landmarks(nbr_landmarks, seed=0):
+    rng = np.random.default_rng(seed)
+    diva_positions = rng.integers(0, 512, size=(nbr_landmarks, 3))
+    quaternions = rng.normal(size=(nbr_landmarks, 4))
+    quaternions /= np.linalg.norm(quaternions, axis=1, keepdims=True)
+    return diva_positions, quaternions
+
+
+def test_json_round_trip(tmp_path):
+    diva_positions, quaternions = random_landmarks(20)
+    file_path = tmp_path / "landmarks.json"
+
+    write_oriented_landmarks(file_path, diva_positions, quaternions)
+    read_positions, read_quaternions = read_oriented_landmarks_json(file_path)
+
+    assert np.array_equal(read_positions, diva_positions)
+    assert np.array_equal(read_quaternions, quaternions)
+    assert not get_sidecar_path(file_path).exists()
+
+
+def test_json_follows_diva_schema(tmp_path):
+    file_path = tmp_path / "landmarks.json"
+    write_oriented_landmarks(file_path, np.array([[1, 2, 3]]), np.array([[0.0, 1.0, 0.0, 0.0]]))
+
+    with open(file_path, 'r') as f:
+        data = json.load(f)
+
+    assert data == {
+        "_oriented_landmarks_parameters": {
+            "_volume_positions": [{"x": 1, "y": 2, "z": 3}],
+            "_local_rotations": [{"x": 0.0, "y": 1.0, "z": 0.0, "w": 0.0}],
+        }
+    }
+
+
+def test_sidecar_round_trip(tmp_path):
+    diva_positions, quaternions = random_landmarks(50)
+    file_path = tmp_path / "landmarks.json"
+
+    write_oriented_landmarks(file_path, diva_positions, quaternions, isSidecarWritten=True)
+    assert get_sidecar_path(file_path).exists()
+
+    read_positions, read_quaternions = read_oriented_landmarks(file_path)
+    assert np.array_equal(read_positions, diva_positions)
+    assert np.array_equal(read_quaternions, quaternions)
+
+
+def test_modified_json_ignores_sidecar(tmp_path):
+    diva_positions, quaternions = random_landmarks(50)
+    file_path = tmp_path / "landmarks.json"
+    write_oriented_landmarks(file_path, diva_positions, quaternions, isSidecarWritten=True)
+
+    # the JSON file is edited by another software (e.g. DIVA), the sidecar is outdated
+    with open(file_path, 'r') as f:
+        data = json.load(f)
+    data["_oriented_landmarks_parameters"]["_volume_positions"] = data["_oriented_landmarks_parameters"]["_volume_positions"][:10]
+    data["_oriented_landmarks_parameters"]["_local_rotations"] = data["_oriented_landmarks_parameters"]["_local_rotations"][:10]
+    with open(file_path, 'w') as f:
+        json.dump(data, f)
+
+    read_positions, read_quaternions = read_oriented_landmarks(file_path)
+    assert np.array_equal(read_positions, diva_positions[:10])
+    assert np.array_equal(read_quaternions, quaternions[:10])
+
+
+def test_empty_landmarks(tmp_path):
+    file_path = tmp_path / "landmarks.json"
+    write_oriented_landmarks(file_path, np.zeros((0, 3), dtype=int), np.zeros((0, 4)))
+
+    read_positions, read_quaternions = read_oriented_landmarks(file_path)
+    assert read_positions.shape == (0, 3)
+    assert read_quaternions.shape == (0, 4)
+
+
+def test_incorrect_schema():
+    with pytest.raises(ValueError):
+        parse_oriented_landmarks({"_oriented_landmarks_parameters": {"_volume_positions": [{"x": 1, "y": 2}], "_local_rotations": []}})
+
+    with pytest.raises(ValueError):
+        parse_oriented_landmarks({"_volume_positions": []})
+
+
+def test_volume_positions_round_trip():
+    shape = (100, 200, 300)
+    diva_positions, _ = random_landmarks(20)
+
+    positions = diva_to_volume_positions(diva_positions, shape)
+    assert np.array_equal(volume_to_diva_positions(positions, shape), diva_positions)
+
+
+@pytest.mark.parametrize("axis", [0, 1, 2])
+def test_position_at_the_volume_size_is_outside(axis):
+    shape = (10, 20, 30)
+    positions = np.zeros((4, 3), dtype=int)
+    positions[1, axis] = shape[axis] - 1
+    positions[2, axis] = shape[axis]
+    positions[3, axis] = -1
+
+    assert are_inside_volume(positions, shape).tolist() == [True, True, False, False]
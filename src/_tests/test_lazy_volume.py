@@ -0,0 +1,18 @@
+import warnings
+import numpy as np
+import pytest
+from hesperos.image_io.lazy_volume import LazyVolume
+
+
+def test_array_conversion():
+    array = np.arange(5 * 6 * 7, dtype=np.int16).reshape(5, 6, 7)
+    lazy_volume = LazyVolume(lambda ind_z: array[ind_z], array.shape, array.dtype)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert np.array_equal(np.asarray(lazy_volume), array)
+        assert np.asarray(lazy_volume, dtype=np.float32).dtype == np.float32
+        assert np.array_equal(np.array(lazy_volume, copy=True), array)
+
+    with pytest.raises(ValueError):
+        np.asarray(lazy_volume, copy=False)
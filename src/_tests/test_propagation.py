@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from hesperos.image_io.lazy_volume import LazyVolume
+from hesperos.label_tools.propagation import get_axis_slices, propagate_labels
+
+
+def run_worker(generator):
+    try:
+        while True:
+            next(generator)
+    except StopIteration as stop:
+        return stop.value
+
+
+def moving_disk_volume(shape=(20, 80, 90)):
+    zz, yy, xx = np.mgrid[:shape[0], :shape[1], :shape[2]]
+    isDisk = (yy - 30 - zz) ** 2 + (xx - 45) ** 2 < 15 ** 2
+    image_arr = (100 + 200 * isDisk + np.random.default_rng(0).normal(0, 5, shape)).astype(np.int16)
+    return image_arr, isDisk.astype(np.uint8) * 2
+
+
+@pytest.mark.parametrize("axis", [0, 1, 2])
+def test_axis_slices_of_lazy_volume(axis):
+    array = np.arange(5 * 6 * 7).reshape(5, 6, 7)
+    lazy_volume = LazyVolume(lambda ind_z: array[ind_z], array.shape, array.dtype)
+
+    slices = get_axis_slices(lazy_volume, axis, [3, 1])
+
+    assert np.array_equal(slices, np.moveaxis(array.take([3, 1], axis=axis), axis, 0))
+
+
+def test_propagation_follows_the_structure():
+    image_arr, truth = moving_disk_volume()
+    segmentation_arr = np.zeros_like(truth)
+    segmentation_arr[5] = truth[5]
+
+    indices, new_values = run_worker(propagate_labels(image_arr, segmentation_arr, 0, 5, list(range(6, 15))))
+    segmentation_arr[indices] = new_values
+
+    isPropagated = segmentation_arr[6:15] == 2
+    isTruth = truth[6:15] == 2
+    assert 2 * (isPropagated & isTruth).sum() / (isPropagated.sum() + isTruth.sum()) > 0.95
+    assert not segmentation_arr[15:].any()
+
+
+def test_existing_labels_are_kept():
+    image_arr, truth = moving_disk_volume()
+    segmentation_arr = np.zeros_like(truth)
+    segmentation_arr[5] = truth[5]
+    segmentation_arr[6, 0:5, 0:5] = 7
+
+    indices, new_values = run_worker(propagate_labels(image_arr, segmentation_arr, 0, 5, [6, 7]))
+
+    # only unlabelled voxels, the existing label guides the propagation to the next slice
+    assert (segmentation_arr[indices] == 0).all()
+    assert set(np.unique(new_values[indices[0] == 6])) == {2}
+    assert set(np.unique(new_values[indices[0] == 7])) == {2, 7}
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+import tifffile
+from hesperos.image_io.readers import read_dicom_series, read_dicom_series_lazy, read_tiff_lazy
+
+
+def write_dicom_series_with_rescaled_slices(folder):
+    import SimpleITK as sitk
+
+    writer = sitk.ImageFileWriter()
+    writer.KeepOriginalImageUIDOn()
+    file_names = []
+    for ind_z in range(4):
+        # the last slices are stored with a RescaleSlope of 0.5, they are decoded as float
+        if ind_z < 2:
+            slice_sitk = sitk.GetImageFromArray(np.full((1, 4, 4), 100 + ind_z, dtype=np.int16))
+            tags = []
+        else:
+            slice_sitk = sitk.GetImageFromArray(np.full((1, 4, 4), 3.5, dtype=np.float64))
+            tags = [("0028|0100", "16"), ("0028|0101", "16"), ("0028|0102", "15"), ("0028|0103", "1"), ("0028|1053", "0.5"), ("0028|1052", "0")]
+        tags += [("0020|000e", "1.2.3"), ("0008|0060", "CT"), ("0020|0032", f"0\\0\\{ind_z}"), ("0020|0037", "1\\0\\0\\0\\1\\0")]
+        for key, value in tags:
+            slice_sitk.SetMetaData(key, value)
+
+        file_names.append(str(folder / f"IM{ind_z}.dcm"))
+        writer.SetFileName(file_names[-1])
+        writer.Execute(slice_sitk)
+
+    return file_names
+
+
+def test_tiff_geometry_from_resolution_tags(tmp_path):
+    image_arr = np.arange(4 * 5 * 6, dtype=np.uint16).reshape(4, 5, 6)
+    file_path = str(tmp_path / "image.tif")
+    tifffile.imwrite(file_path, image_arr, resolution=(1 / 0.5, 1 / 0.25), metadata={'spacing': 2.0, 'unit': 'mm'}, imagej=True)
+
+    read_arr, image_geometry = read_tiff_lazy(file_path)
+
+    assert isinstance(read_arr, np.memmap)
+    assert np.array_equal(read_arr, image_arr)
+    assert image_geometry.size == (6, 5, 4)
+    assert np.allclose(image_geometry.spacing, (0.5, 0.25, 2.0))
+    assert np.isclose(image_geometry.voxel_volume, 0.25)
+    assert image_geometry.unit == "mm"
+
+
+def test_tiff_geometry_in_centimeters(tmp_path):
+    file_path = str(tmp_path / "image.tif")
+    tifffile.imwrite(file_path, np.zeros((5, 6), dtype=np.uint8), resolution=(4, 4), resolutionunit='CENTIMETER')
+
+    _, image_geometry = read_tiff_lazy(file_path)
+
+    assert image_geometry.size == (6, 5, 1)
+    assert np.allclose(image_geometry.spacing, (2.5, 2.5, 1.0))
+    assert image_geometry.unit == "mm"
+
+
+def test_tiff_without_resolution_unit_has_unknown_unit(tmp_path):
+    file_path = str(tmp_path / "image.tif")
+    tifffile.imwrite(file_path, np.zeros((3, 5, 6), dtype=np.uint8), photometric="minisblack")
+
+    _, image_geometry = read_tiff_lazy(file_path)
+
+    assert image_geometry.unit is None
+    assert image_geometry.voxel_volume == 1.0
+
+
+@pytest.mark.parametrize("isSorted", [True, False])
+def test_dicom_series_with_different_rescales_is_promoted(tmp_path, isSorted):
+    file_names = write_dicom_series_with_rescaled_slices(tmp_path)
+
+    image_arr, _ = read_dicom_series_lazy(file_names, isSorted=isSorted)
+    assert np.issubdtype(image_arr.dtype, np.floating)
+    assert np.array_equal(np.asarray(image_arr)[:, 0, 0], [100, 101, 3.5, 3.5])
+
+    image_arr, _ = read_dicom_series(file_names, nbr_workers=1, isSorted=isSorted)
+    assert np.array_equal(image_arr[:, 0, 0], [100, 101, 3.5, 3.5])
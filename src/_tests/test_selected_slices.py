@@ -0,0 +1,52 @@
+import pytest
+from hesperos.label_tools.selected_slices import (
+    SelectedSliceRegistry,
+    format_selected_slice,
+    parse_selected_slice,
+    parse_selected_slices_metadata,
+)
+
+
+def test_text_round_trip():
+    assert format_selected_slice(0, 123) == "123z"
+    assert parse_selected_slice("123z") == (0, 123)
+    assert parse_selected_slice(format_selected_slice(2, 7)) == (2, 7)
+
+    with pytest.raises(ValueError):
+        parse_selected_slice("123")
+
+
+def test_metadata_versions():
+    assert parse_selected_slices_metadata(["136z", "170y"]) == [(0, 136), (1, 170)]
+    assert parse_selected_slices_metadata("[136, 170]") == [(0, 136), (0, 170)]
+
+    with pytest.raises(ValueError):
+        parse_selected_slices_metadata(12)
+
+
+def test_registry_keeps_sorted_order():
+    registry = SelectedSliceRegistry([(0, 30), (1, 10), (0, 10), (0, 30)])
+
+    assert len(registry) == 3
+    assert registry.get_texts() == ["10z", "10y", "30z"]
+
+    assert registry.add(2, 20) == 2
+    assert registry.add(2, 20) is None
+    assert registry.get_texts() == ["10z", "10y", "20x", "30z"]
+
+    assert registry.remove(1, 10) == 1
+    assert registry.remove(1, 10) is None
+    assert (1, 10) not in registry
+    assert list(registry) == [(0, 10), (2, 20), (0, 30)]
+
+
+def test_adjacent_slices_on_an_axis():
+    registry = SelectedSliceRegistry([(0, 10), (0, 30), (1, 20)])
+
+    assert registry.get_next_slice(0, 10) == 30
+    assert registry.get_next_slice(0, 15) == 30
+    assert registry.get_next_slice(0, 30) is None
+    assert registry.get_previous_slice(0, 30) == 10
+    assert registry.get_previous_slice(0, 10) is None
+    assert registry.get_next_slice(1, 0) == 20
+    assert registry.get_next_slice(2, 0) is None
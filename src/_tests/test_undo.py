@@ -0,0 +1,125 @@
+import numpy as np
+from hesperos.label_tools.undo import (
+    DEFAULT_MEMORY_BUDGET,
+    UndoManager,
+    decode_run_lengths,
+    encode_run_lengths,
+)
+
+
+SHAPE = (4, 32, 32)
+
+
+def paint(undo_manager, segmentation_arr, indices, label, isNewOperation):
+    old_values = segmentation_arr[indices].copy()
+    segmentation_arr[indices] = label
+    undo_manager.record(indices, old_values, label, isNewOperation)
+
+
+def test_run_length_round_trip():
+    flat_indices = np.array([5, 6, 7, 20, 21, 8])
+    old_values = np.array([0, 0, 0, 1, 1, 0], dtype=np.uint8)
+
+    decoded_indices, decoded_old, decoded_new = decode_run_lengths(encode_run_lengths(flat_indices, old_values, 2))
+
+    assert np.array_equal(decoded_indices, [5, 6, 7, 8, 20, 21])
+    assert np.array_equal(decoded_old, [0, 0, 0, 0, 1, 1])
+    assert np.array_equal(decoded_new, [2] * 6)
+
+
+def test_run_length_keeps_first_old_and_last_new_value():
+    # voxel 3 is painted with 1 then with 2, voxel 4 is painted then erased
+    runs = encode_run_lengths(np.array([3, 4, 3, 4]), np.array([0, 0, 1, 1]), np.array([1, 1, 2, 0]))
+
+    flat_indices, old_values, new_values = decode_run_lengths(runs)
+
+    assert np.array_equal(flat_indices, [3])
+    assert np.array_equal(old_values, [0])
+    assert np.array_equal(new_values, [2])
+
+
+def test_record_undo_redo_round_trip():
+    rng = np.random.default_rng(0)
+    segmentation_arr = np.zeros(SHAPE, dtype=np.uint8)
+    undo_manager = UndoManager(SHAPE)
+
+    states = [segmentation_arr.copy()]
+    for label in range(1, 6):
+        indices = np.unravel_index(rng.choice(segmentation_arr.size, 100, replace=False), SHAPE)
+        paint(undo_manager, segmentation_arr, indices, label, True)
+        states.append(segmentation_arr.copy())
+
+    for state in states[-2::-1]:
+        indices, old_values, new_values = undo_manager.undo(segmentation_arr)
+        assert np.array_equal(segmentation_arr, state)
+        assert np.array_equal(segmentation_arr[indices], new_values)
+    assert undo_manager.undo(segmentation_arr) is None
+
+    for state in states[1:]:
+        undo_manager.redo(segmentation_arr)
+        assert np.array_equal(segmentation_arr, state)
+    assert undo_manager.redo(segmentation_arr) is None
+
+
+def test_new_edit_clears_redo_history():
+    segmentation_arr = np.zeros(SHAPE, dtype=np.uint8)
+    undo_manager = UndoManager(SHAPE)
+
+    paint(undo_manager, segmentation_arr, (np.array([0]), np.array([0]), np.array([0])), 1, True)
+    undo_manager.undo(segmentation_arr)
+    assert undo_manager.can_redo
+
+    paint(undo_manager, segmentation_arr, (np.array([1]), np.array([1]), np.array([1])), 2, True)
+    assert not undo_manager.can_redo
+
+
+def test_edits_are_grouped_by_operation():
+    segmentation_arr = np.zeros(SHAPE, dtype=np.uint8)
+    undo_manager = UndoManager(SHAPE)
+
+    # first operation: a brush stroke made of three dabs
+    for x in range(3):
+        paint(undo_manager, segmentation_arr, (np.array([0]), np.array([0]), np.array([x])), 1, x == 0)
+    stroke_state = segmentation_arr.copy()
+
+    # second operation
+    paint(undo_manager, segmentation_arr, (np.array([1]), np.array([1]), np.array([1])), 2, True)
+
+    undo_manager.undo(segmentation_arr)
+    assert np.array_equal(segmentation_arr, stroke_state)
+
+    undo_manager.undo(segmentation_arr)
+    assert not segmentation_arr.any()
+    assert not undo_manager.can_undo
+
+
+def test_oldest_operations_are_evicted():
+    assert DEFAULT_MEMORY_BUDGET == 256 * 2**20
+
+    segmentation_arr = np.zeros(SHAPE, dtype=np.uint8)
+    undo_manager = UndoManager(SHAPE, memory_budget=1000)
+
+    # isolated voxels: one run per voxel, the history quickly exceeds the budget
+    for label in range(1, 21):
+        indices = np.unravel_index(np.arange(0, 64, 2) + 64 * label, SHAPE)
+        paint(undo_manager, segmentation_arr, indices, label, True)
+    undo_manager.record((), [], [], True) # end of the last operation
+
+    assert undo_manager.nbytes <= 1000
+
+    nbr_undone = 0
+    while undo_manager.undo(segmentation_arr) is not None:
+        nbr_undone += 1
+    assert 0 < nbr_undone < 20
+    # the oldest operations cannot be undone anymore
+    assert segmentation_arr[np.unravel_index(64, SHAPE)] == 1
+
+
+def test_last_operation_is_kept_over_budget():
+    segmentation_arr = np.zeros(SHAPE, dtype=np.uint8)
+    undo_manager = UndoManager(SHAPE, memory_budget=10)
+
+    paint(undo_manager, segmentation_arr, np.unravel_index(np.arange(0, 200, 2), SHAPE), 1, True)
+
+    assert undo_manager.undo(segmentation_arr) is not None
+    assert not segmentation_arr.any()
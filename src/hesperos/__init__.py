@@ -1,4 +1,16 @@
 __version__ = "0.2.1"
 
-from ._manual_widget import ManualSegmentationWidget
-from ._oneshot_widget import OneShotWidget
\ No newline at end of file
+# the widgets (and napari, Qt and the image libraries they import) are only imported when they are used
+__all__ = ["ManualSegmentationWidget", "OneShotWidget"]
+
+
+def __getattr__(name):
+    if name == "ManualSegmentationWidget":
+        from ._manual_widget import ManualSegmentationWidget
+        return ManualSegmentationWidget
+
+    if name == "OneShotWidget":
+        from ._oneshot_widget import OneShotWidget
+        return OneShotWidget
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -12,7 +12,8 @@ from hesperos.layout.gui_elements import (
     display_warning_box,
     display_save_message_box,
     display_ok_cancel_question_box,
-    display_yes_no_question_box
+    display_yes_no_question_box,
+    display_item_choice_box
 )
 from hesperos.layout.napari_elements import (
     disable_napari_buttons,
@@ -22,16 +23,39 @@ from hesperos.layout.napari_elements import (
     label_colors,
     disable_napari_change_dim_button)
 from hesperos.annotation.structuresubpanel import StructureSubPanel
+from hesperos.annotation.protocols import create_protocol_registry
 from hesperos.resources._icons import get_icon_path, get_relative_icon_path
+from hesperos.image_io.geometry import ImageGeometry, get_array_view
+from hesperos.image_io.readers import read_dicom_series_lazy, read_nifti_lazy, read_tiff_lazy, read_tiff_slices
+from hesperos.image_io.dicom_index import find_dicom_series, get_dicom_series_name
+from hesperos.image_io.contrast import estimate_contrast_limits, get_source_key
+from hesperos.image_io.export import export_binary_labels, is_supported_extension, write_image
+from hesperos.label_tools.edit_hook import connect_labels_edit_callback, get_edited_slice_indexes
+from hesperos.label_tools.autosave import SegmentationAutosave
+from hesperos.label_tools.journal import EditJournal, archive_journal, find_matching_journal, read_journal, replay_journal
+from hesperos.label_tools.undo import UndoManager
+from hesperos.label_tools.label_volume import as_label_volume, create_label_volume
+from hesperos.label_tools.label_statistics import LabelStatistics, compute_label_statistics
+from hesperos.label_tools.propagation import propagate_labels
+from hesperos.label_tools.interpolation import interpolate_labels
+from hesperos.label_tools.selected_slices import (
+    SelectedSliceRegistry,
+    format_selected_slice,
+    parse_selected_slice,
+    parse_selected_slices_metadata,
+)
+from hesperos.landmarks.orientation import (
+    are_inside_volume,
+    create_orientation_vectors,
+    diva_to_volume_positions,
+    find_removed_index,
+    get_axis_orientation,
+    quaternions_to_orientations,
+    volume_to_diva_positions,
+)
+from hesperos.landmarks.landmark_io import read_oriented_landmarks, write_oriented_landmarks
+from hesperos.landmarks.landmark_index import LandmarkIndex
 
-import hesperos.annotation.feta as feta_data
-import hesperos.annotation.larva as larva_data
-import hesperos.annotation.fetus as fetus_data
-import hesperos.annotation.shoulder as shoulder_data
-import hesperos.annotation.mouse_embryon as mouse_embryon_data
-import hesperos.annotation.shoulder_bones as shoulder_bones_data
-import hesperos.annotation.shoulder_deltoid as shoulder_deltoid_data
-import hesperos.annotation.shoulder_bone_border as shoulder_bone_border_data
 
 
 # ============ Import python packages ============
@@ -39,10 +63,8 @@ import json
 import napari
 import functools
 import numpy as np
-import pandas as pd
-import tifffile as tif
-import SimpleITK as sitk
 from pathlib import Path
+from napari.qt.threading import create_worker
 
 from qtpy import QtCore
 from qtpy.QtGui import QIcon
@@ -86,10 +108,29 @@ class ManualSegmentationWidget(QWidget):
 
         disable_napari_buttons(self.viewer)
 
+        self.segmentation_autosave = None
+        self.segmentation_journal = None
+        self.segmentation_undo_manager = None
+        self.segmentation_statistics = None
+        self.statistics_volume_unit = None # length unit of the image spacing, None if unknown
+        self.statistics_worker = None
+        self.isStatisticsOutdated = False # annotations edited while the statistics are computed
+        self.label_tool_worker = None
+        self.segmentation_file_path = None
+        self.oriented_landmarks_index = LandmarkIndex()
+        self.selected_slices = SelectedSliceRegistry()
+
+        # protocols shipped with hesperos and protocols of the user folder (~/.hesperos/protocols)
+        self.protocol_registry, protocol_errors = create_protocol_registry()
+
         self.generate_main_layout()
 
+        if len(protocol_errors) != 0:
+            display_warning_box(self, "Error", "Some annotation protocols cannot be loaded:\n\n" + "\n".join(protocol_errors))
+
         self.viewer.dims.events.current_step.connect(self.update_go_to_selected_slice_push_button_check_status)
         self.viewer.dims.events.current_step.connect(self.update_go_to_selected_oriented_landmark_push_button_check_status)
+        self.viewer.dims.events.current_step.connect(self.update_landmarks_display)
         self.viewer.dims.events.order.connect(self.update_slice_positon_after_dims_roll)
         self.viewer.dims.events.ndisplay.connect(self.set_button_interactivity)
 
@@ -133,7 +174,7 @@ class ManualSegmentationWidget(QWidget):
 
     def add_sub_annotation_panel(self, row):
         """
-        Create annotation sub panel with the list of all struture to annotate
+        Prepare the annotation sub panels: the sub panel of a structure is only created when the structure is chosen
 
         Parameters
         ----------
@@ -141,69 +182,38 @@ class ManualSegmentationWidget(QWidget):
             row position of the sub panel in the main QGridLayout
 
         """
-        self.feta = StructureSubPanel(
-            parent=self,
-            row=row,
-            column=0,
-            list_structures=feta_data.LIST_STRUCTURES,
-            dict_substructures=feta_data.DICT_SUB_STRUCTURES,
-            dict_sub_substructures=[])
-
-        self.fetus = StructureSubPanel(
-            parent=self,
-            row=row,
-            column=0,
-            list_structures=fetus_data.LIST_STRUCTURES,
-            dict_substructures=fetus_data.DICT_SUB_STRUCTURES,
-            dict_sub_substructures=[])
+        self.sub_annotation_panel_row = row
+        self.structure_sub_panels = {}
 
-        self.shoulder = StructureSubPanel(
-            parent=self,
-            row=row,
-            column=0,
-            list_structures=shoulder_data.LIST_STRUCTURES,
-            dict_substructures=shoulder_data.DICT_SUB_STRUCTURES,
-            dict_sub_substructures=shoulder_data.DICT_SUB_SUB_STRUCTURES)
+    def get_structure_sub_panel(self, structure_name):
+        """
+        Get the sub panel of a structure to annotate, create it at the first call
 
-        self.shoulder_bones = StructureSubPanel(
-            parent=self,
-            row=row,
-            column=0,
-            list_structures=shoulder_bones_data.LIST_STRUCTURES,
-            dict_substructures=shoulder_bones_data.DICT_SUB_STRUCTURES,
-            dict_sub_substructures=[])
+        Parameters
+        ----------
+        structure_name : str
+            name of the protocol in the protocol registry
 
-        self.shoulder_bone_borders = StructureSubPanel(
-            parent=self,
-            row=row,
-            column=0,
-            list_structures=shoulder_bone_border_data.LIST_STRUCTURES,
-            dict_substructures=shoulder_bone_border_data.DICT_SUB_STRUCTURES,
-            dict_sub_substructures=[])
+        Returns
+        ----------
+        sub_panel : StructureSubPanel
+            None if the structure is not in the protocol registry
 
-        self.shoulder_deltoid = StructureSubPanel(
-            parent=self,
-            row=row,
-            column=0,
-            list_structures=shoulder_deltoid_data.LIST_STRUCTURES,
-            dict_substructures=shoulder_deltoid_data.DICT_SUB_STRUCTURES,
-            dict_sub_substructures=[])
+        """
+        protocol = self.protocol_registry.get(structure_name)
+        if protocol is None:
+            return None
 
-        self.larva = StructureSubPanel(
-            parent=self,
-            row=row,
-            column=0,
-            list_structures=larva_data.LIST_STRUCTURES,
-            dict_substructures=larva_data.DICT_SUB_STRUCTURES,
-            dict_sub_substructures=[])
+        if structure_name not in self.structure_sub_panels:
+            self.structure_sub_panels[structure_name] = StructureSubPanel(
+                parent=self,
+                row=self.sub_annotation_panel_row,
+                column=0,
+                list_structures=protocol.list_structures,
+                dict_substructures=protocol.dict_sub_structures,
+                dict_sub_substructures=protocol.dict_sub_sub_structures)
 
-        self.mouse_embryon = StructureSubPanel(
-            parent=self,
-            row=row,
-            column=0,
-            list_structures=mouse_embryon_data.LIST_STRUCTURES,
-            dict_substructures=mouse_embryon_data.DICT_SUB_STRUCTURES,
-            dict_sub_substructures=[])
+        return self.structure_sub_panels[structure_name]
 
     def add_import_panel(self, row, column=0):
         """
@@ -296,6 +306,8 @@ class ManualSegmentationWidget(QWidget):
         )
         self.custom_contrast_limits = None
         self.hu_limits = []
+        self.image_geometry = None
+        self.image_source_key = None # files of the image, key of the contrast estimation cache
 
         self.import_custom_contrast_push_button = add_icon_push_button(
             icon=QIcon(get_icon_path('import')),
@@ -411,11 +423,21 @@ class ManualSegmentationWidget(QWidget):
         )
         self.go_to_selected_oriented_landmark_push_button.setCheckable(True)
 
+        self.go_to_nearest_oriented_landmark_push_button = add_icon_push_button(
+            icon=QIcon(get_icon_path('target')),
+            layout=self.tool_oriented_landmarks_layout,
+            callback_function=self.go_to_nearest_oriented_landmark,
+            row=0,
+            column=3,
+            tooltip_text="Select the landmark nearest to the mouse cursor and go to its position.",
+            isHBoxLayout=True,
+        )
+
         self.landmark_ID_text = add_label(
             text='Landmark ID: ',
             layout=self.tool_oriented_landmarks_layout,
             row=0,
-            column=3,
+            column=4,
             isHBoxLayout=True,
             isResizingWithTextSize=True,
         )
@@ -431,12 +453,31 @@ class ManualSegmentationWidget(QWidget):
             minimum_width=COLUMN_WIDTH,
             tooltip_text="Select a landmark index from the list to visualize it more easily.",
         )
+
+        self.landmarks_display_range_text = add_label(
+            text='Display range (slices):',
+            layout=self.manage_oriented_landmarks_layout,
+            row=2,
+            column=0,
+            minimum_width=COLUMN_WIDTH,
+        )
+
+        self.landmarks_display_range_spin_box = add_spin_box(
+            layout=self.manage_oriented_landmarks_layout,
+            row=2,
+            column=1,
+            minimum_width=COLUMN_WIDTH,
+            tooltip_text="Only display the landmarks at most this number of slices away from the current slice (0: display all the landmarks).",
+        )
+        self.landmarks_display_range_spin_box.setMinimum(0)
+        self.landmarks_display_range_spin_box.setValue(0)
+        self.landmarks_display_range_spin_box.valueChanged.connect(self.update_landmarks_display)
         
         self.export_oriented_landmarks_push_button = add_push_button(
             name="Export landmarks file",
             layout=self.manage_oriented_landmarks_layout,
             callback_function=self.export_oriented_landmarks,
-            row=2,
+            row=3,
             column=0,
             minimum_width=COLUMN_WIDTH,
             tooltip_text="Export the oriented landmarks to be opened in the DIVA sofware.",
@@ -446,7 +487,7 @@ class ManualSegmentationWidget(QWidget):
             name="Delete landmarks",
             layout=self.manage_oriented_landmarks_layout,
             callback_function=self.reset_oriented_landmark,
-            row=2,
+            row=3,
             column=1,
             minimum_width=COLUMN_WIDTH,
             tooltip_text="Delete all landmarks.",
@@ -500,7 +541,17 @@ class ManualSegmentationWidget(QWidget):
             callback_function=self.undo_segmentation,
             row=0,
             column=0,
-            tooltip_text="Undo the last painting action.",
+            tooltip_text="Undo the last painting action (Ctrl+Z).",
+            isHBoxLayout=True,
+        )
+
+        self.redo_push_button = add_icon_push_button(
+            icon=QIcon(get_icon_path('redo')),
+            layout=self.tool_annotation_layout,
+            callback_function=self.redo_segmentation,
+            row=0,
+            column=1,
+            tooltip_text="Redo the last undone painting action (Ctrl+Shift+Z).",
             isHBoxLayout=True,
         )
 
@@ -509,7 +560,7 @@ class ManualSegmentationWidget(QWidget):
             layout=self.tool_annotation_layout,
             callback_function=self.lock_slide,
             row=0,
-            column=1,
+            column=2,
             tooltip_text="Lock a slice of work. Click on the checked button to go to the locked slice.",
             isHBoxLayout=True,
         )
@@ -518,7 +569,7 @@ class ManualSegmentationWidget(QWidget):
         self.annotation_layout.addLayout(self.tool_annotation_layout, 1, 0)
 
         self.annotation_combo_box = add_combo_box(
-            list_items=["Choose a structure", "Feta Challenge", "Fetus", "Larva", "Mouse Embryon", "Shoulder", "Shoulder Bones", "Shoulder Bone Borders", "Shoulder Deltoid"],
+            list_items=["Choose a structure"] + self.protocol_registry.get_names(),
             layout=self.annotation_layout,
             callback_function=self.toggle_annotation_sub_panel,
             row=1,
@@ -527,6 +578,61 @@ class ManualSegmentationWidget(QWidget):
             tooltip_text="Select the pre-defined structure to annotate.",
         )
 
+        # Propagation tools are created in another layout
+        self.propagation_text = add_label(
+            text='Propagate labels: ',
+            layout=self.annotation_layout,
+            row=2,
+            column=0,
+            isResizingWithTextSize=True,
+        )
+
+        self.tool_propagation_layout = QHBoxLayout()
+
+        self.propagate_backward_push_button = add_icon_push_button(
+            icon=QIcon(get_icon_path('back')),
+            layout=self.tool_propagation_layout,
+            callback_function=functools.partial(self.propagate_annotations, False),
+            row=0,
+            column=0,
+            tooltip_text="Propagate the labels of the current slice to the previous slices of the displayed axis (only unlabelled pixels are annotated).",
+            isHBoxLayout=True,
+        )
+
+        self.propagation_range_spin_box = add_spin_box(
+            layout=self.tool_propagation_layout,
+            row=0,
+            column=1,
+            minimum_width=COLUMN_WIDTH,
+            tooltip_text="Define the number of slices annotated by the propagation.",
+            isHBoxLayout=True,
+        )
+        self.propagation_range_spin_box.setMaximum(100)
+        self.propagation_range_spin_box.setValue(5)
+
+        self.propagate_forward_push_button = add_icon_push_button(
+            icon=QIcon(get_icon_path('next')),
+            layout=self.tool_propagation_layout,
+            callback_function=functools.partial(self.propagate_annotations, True),
+            row=0,
+            column=2,
+            tooltip_text="Propagate the labels of the current slice to the next slices of the displayed axis (only unlabelled pixels are annotated).",
+            isHBoxLayout=True,
+        )
+
+        self.annotation_layout.addLayout(self.tool_propagation_layout, 2, 1)
+
+        self.interpolate_push_button = add_push_button(
+            name="Fill between annotated slices",
+            layout=self.annotation_layout,
+            callback_function=self.interpolate_annotations,
+            row=3,
+            column=0,
+            column_span=2,
+            minimum_width=COLUMN_WIDTH,
+            tooltip_text="Interpolate each label between the slices where it is annotated, along the displayed axis (only unlabelled voxels are annotated).",
+        )
+
         self.annotation_panel.setLayout(self.annotation_layout)
 
         # === Add panel to the main layout ===
@@ -581,10 +687,36 @@ class ManualSegmentationWidget(QWidget):
             column=0,
             column_span=2,
             minimum_width=COLUMN_WIDTH,
-            tooltip_text="Activate the automatic backup of the segmentation data when the slice inex is changed.",
+            tooltip_text="Activate the automatic backup of the segmentation data (only the modified slices are saved, in background).",
         )
         self.backup_check_box.setChecked(False)
 
+        self.statistics_check_box = add_check_box(
+            text="Show label statistics",
+            layout=self.reset_export_layout,
+            callback_function=self.toggle_label_statistics,
+            row=2,
+            column=0,
+            column_span=2,
+            minimum_width=COLUMN_WIDTH,
+            tooltip_text="Display the voxel count, the volume and the bounding box of each label (updated after each edit).",
+        )
+        self.statistics_check_box.setChecked(False)
+
+        self.statistics_label = add_label(
+            text="",
+            layout=self.reset_export_layout,
+            row=3,
+            column=0,
+            column_span=2,
+        )
+
+        # the statistics table is refreshed once the annotation pauses
+        self.statistics_timer = QtCore.QTimer(self)
+        self.statistics_timer.setSingleShot(True)
+        self.statistics_timer.setInterval(300)
+        self.statistics_timer.timeout.connect(self.update_label_statistics)
+
         self.reset_export_panel.setLayout(self.reset_export_layout)
 
         # === Add panel to the main layout ===
@@ -648,11 +780,31 @@ class ManualSegmentationWidget(QWidget):
         )
         self.go_to_selected_slice_push_button.setCheckable(True)
 
+        self.go_to_previous_selected_slice_push_button = add_icon_push_button(
+            icon=QIcon(get_icon_path('chevron_left')),
+            layout=self.tool_slice_selection_layout,
+            callback_function=functools.partial(self.go_to_adjacent_selected_slice, False),
+            row=0,
+            column=3,
+            tooltip_text="Go to the previous selected slice along the displayed axe.",
+            isHBoxLayout=True,
+        )
+
+        self.go_to_next_selected_slice_push_button = add_icon_push_button(
+            icon=QIcon(get_icon_path('chevron_right')),
+            layout=self.tool_slice_selection_layout,
+            callback_function=functools.partial(self.go_to_adjacent_selected_slice, True),
+            row=0,
+            column=4,
+            tooltip_text="Go to the next selected slice along the displayed axe.",
+            isHBoxLayout=True,
+        )
+
         self.slice_selection_text = add_label(
             text='Slice ID: ',
             layout=self.tool_slice_selection_layout,
             row=0,
-            column=3,
+            column=5,
             isHBoxLayout=True,
             isResizingWithTextSize=True,
             )
@@ -725,110 +877,23 @@ class ManualSegmentationWidget(QWidget):
         """
         structure_name = self.annotation_combo_box.currentText()
 
-        if structure_name == "Fetus":
-            toggle_feta = False
-            toggle_fetus = True
-            toggle_shoulder = False
-            toggle_larva = False
-            toggle_shoulder_bones = False
-            toggle_shoulder_deltoid = False
-            toggle_shoulder_bone_borders = False
-            toggle_mouse_embryon = False
-
-        elif structure_name == "Shoulder":
-            toggle_feta = False
-            toggle_fetus = False
-            toggle_larva = False
-            toggle_shoulder = True
-            toggle_shoulder_bones = False
-            toggle_shoulder_deltoid = False
-            toggle_shoulder_bone_borders = False
-            toggle_mouse_embryon = False
-
-        elif structure_name == "Shoulder Bones":
-            toggle_feta = False
-            toggle_fetus = False
-            toggle_larva = False
-            toggle_shoulder = False
-            toggle_shoulder_bones = True
-            toggle_shoulder_deltoid = False
-            toggle_shoulder_bone_borders = False
-            toggle_mouse_embryon = False
-
-        elif structure_name == "Shoulder Bone Borders":
-            toggle_feta = False
-            toggle_fetus = False
-            toggle_larva = False
-            toggle_shoulder = False
-            toggle_shoulder_bones = False
-            toggle_shoulder_deltoid = False
-            toggle_shoulder_bone_borders = True
-            toggle_mouse_embryon = False
-
-        elif structure_name == "Shoulder Deltoid":
-            toggle_feta = False
-            toggle_fetus = False
-            toggle_larva = False
-            toggle_shoulder = False
-            toggle_shoulder_bones = False
-            toggle_shoulder_deltoid = True
-            toggle_shoulder_bone_borders = False
-            toggle_mouse_embryon = False
-
-        elif structure_name == "Feta Challenge":
-            toggle_feta = True
-            toggle_fetus = False
-            toggle_larva = False
-            toggle_shoulder = False
-            toggle_shoulder_bones = False
-            toggle_shoulder_deltoid = False
-            toggle_shoulder_bone_borders = False
-            toggle_mouse_embryon = False
-
-        elif structure_name == "Larva":
-            toggle_feta = False
-            toggle_fetus = False
-            toggle_larva = True
-            toggle_shoulder = False
-            toggle_shoulder_bones = False
-            toggle_shoulder_deltoid = False
-            toggle_shoulder_bone_borders = False
-            toggle_mouse_embryon = False
-
-        elif structure_name == "Mouse Embryon":
-            toggle_feta = False
-            toggle_fetus = False
-            toggle_larva = False
-            toggle_shoulder = False
-            toggle_shoulder_bones = False
-            toggle_shoulder_deltoid = False
-            toggle_shoulder_bone_borders = False
-            toggle_mouse_embryon = True
-
-        else:
-            toggle_feta = False
-            toggle_fetus = False
-            toggle_larva = False
-            toggle_shoulder = False
-            toggle_shoulder_bones = False
-            toggle_shoulder_deltoid = False
-            toggle_shoulder_bone_borders = False
-            toggle_mouse_embryon = False
-
         # === Toggle sub panels ===
-        self.feta.toggle_sub_panel(toggle_feta)
-        self.larva.toggle_sub_panel(toggle_larva)
-        self.fetus.toggle_sub_panel(toggle_fetus)
-        self.shoulder.toggle_sub_panel(toggle_shoulder)
-        self.mouse_embryon.toggle_sub_panel(toggle_mouse_embryon)
-        self.shoulder_bones.toggle_sub_panel(toggle_shoulder_bones)
-        self.shoulder_deltoid.toggle_sub_panel(toggle_shoulder_deltoid)
-        self.shoulder_bone_borders.toggle_sub_panel(toggle_shoulder_bone_borders)
+        for sub_panel_name, sub_panel in self.structure_sub_panels.items():
+            if sub_panel_name != structure_name:
+                sub_panel.toggle_sub_panel(False)
+
+        sub_panel = self.get_structure_sub_panel(structure_name)
+        if sub_panel is not None:
+            sub_panel.toggle_sub_panel(True)
 
         # === Reset widgets ===
         self.reset_annotation_radio_button_checked_id()
         self.reset_annotation_layer_selected_label()
 
+        # structure names of the statistics table
+        if self.statistics_check_box.isChecked():
+            self.statistics_timer.start()
+
     def toggle_import_panel_widget(self, isVisible, file_type=None):
         """
         Toggle widget or the import panel (default contrast option only for DICOM image (use housfield value))
@@ -880,8 +945,14 @@ class ManualSegmentationWidget(QWidget):
                 self.annotation_panel.setVisible(isVisible)
                 self.import_segmentation_push_button.setVisible(isVisible)
                 self.undo_push_button.setVisible(isVisible)
+                self.redo_push_button.setVisible(isVisible)
                 self.lock_push_button.setVisible(isVisible)
                 self.annotation_combo_box.setVisible(isVisible)
+                self.propagation_text.setVisible(isVisible)
+                self.propagate_backward_push_button.setVisible(isVisible)
+                self.propagation_range_spin_box.setVisible(isVisible)
+                self.propagate_forward_push_button.setVisible(isVisible)
+                self.interpolate_push_button.setVisible(isVisible)
 
             elif panel_name == "manage_oriented_landmarks_panel":
                 self.manage_oriented_landmarks_panel.setVisible(isVisible)
@@ -889,8 +960,11 @@ class ManualSegmentationWidget(QWidget):
                 self.add_oriented_landmark_push_button.setVisible(isVisible)
                 self.remove_oriented_landmark_push_button.setVisible(isVisible)
                 self.go_to_selected_oriented_landmark_push_button.setVisible(isVisible)
+                self.go_to_nearest_oriented_landmark_push_button.setVisible(isVisible)
                 self.landmark_ID_text.setVisible(isVisible)
                 self.selected_oriented_landmark_combo_box.setVisible(isVisible)
+                self.landmarks_display_range_text.setVisible(isVisible)
+                self.landmarks_display_range_spin_box.setVisible(isVisible)
                 self.export_oriented_landmarks_push_button.setVisible(isVisible)
                 self.reset_oriented_landmarks_push_button.setVisible(isVisible)
 
@@ -899,6 +973,8 @@ class ManualSegmentationWidget(QWidget):
                 self.add_selected_slice_push_button.setVisible(isVisible)
                 self.remove_selected_slice_push_button.setVisible(isVisible)
                 self.go_to_selected_slice_push_button.setVisible(isVisible)
+                self.go_to_previous_selected_slice_push_button.setVisible(isVisible)
+                self.go_to_next_selected_slice_push_button.setVisible(isVisible)
                 self.slice_selection_text.setVisible(isVisible)
                 self.selected_slice_combo_box.setVisible(isVisible)
                 self.step_range_text.setVisible(isVisible)
@@ -911,6 +987,8 @@ class ManualSegmentationWidget(QWidget):
                 self.reset_push_button.setVisible(isVisible)
                 self.export_push_button.setVisible(isVisible)
                 self.backup_check_box.setVisible(isVisible)
+                self.statistics_check_box.setVisible(isVisible)
+                self.statistics_label.setVisible(isVisible and self.statistics_check_box.isChecked())
 
     def enable_widgets(self, isEnable):
         """
@@ -926,16 +1004,25 @@ class ManualSegmentationWidget(QWidget):
         self.add_oriented_landmark_push_button.setEnabled(isEnable)
         self.remove_oriented_landmark_push_button.setEnabled(isEnable)
         self.go_to_selected_oriented_landmark_push_button.setEnabled(isEnable)
+        self.go_to_nearest_oriented_landmark_push_button.setEnabled(isEnable)
         self.selected_oriented_landmark_combo_box.setEnabled(isEnable)
+        self.landmarks_display_range_spin_box.setEnabled(isEnable)
 
         self.add_selected_slice_push_button.setEnabled(isEnable)
         self.remove_selected_slice_push_button.setEnabled(isEnable)
         self.go_to_selected_slice_push_button.setEnabled(isEnable)
+        self.go_to_previous_selected_slice_push_button.setEnabled(isEnable)
+        self.go_to_next_selected_slice_push_button.setEnabled(isEnable)
         self.selected_slice_combo_box.setEnabled(isEnable)
         self.go_left_push_button.setEnabled(isEnable)
         self.step_range_spin_box.setEnabled(isEnable)
         self.go_right_push_button.setEnabled(isEnable)
 
+        self.propagate_backward_push_button.setEnabled(isEnable)
+        self.propagation_range_spin_box.setEnabled(isEnable)
+        self.propagate_forward_push_button.setEnabled(isEnable)
+        self.interpolate_push_button.setEnabled(isEnable)
+
 
 # ============ Update widget status or panel title ============
     def update_go_to_selected_slice_push_button_check_status(self, event):
@@ -949,13 +1036,10 @@ class ManualSegmentationWidget(QWidget):
 
         """
         if len(event.value) == 3:
-            axis_order = ['z', 'y', 'x']
-
             if (self.go_to_selected_slice_push_button.isChecked() == True) and (self.selected_slice_combo_box.currentText() != " "):
                 current_axis_index = self.viewer.dims.not_displayed[0]
                 current_slice = self.viewer.dims.current_step[current_axis_index]
-                selected_slice = int(self.selected_slice_combo_box.currentText()[:-1])
-                selected_axis_index = axis_order.index(self.selected_slice_combo_box.currentText()[-1])
+                selected_axis_index, selected_slice = parse_selected_slice(self.selected_slice_combo_box.currentText())
 
                 if (current_slice != selected_slice) or (current_axis_index != selected_axis_index):
                     self.go_to_selected_slice_push_button.setChecked(False)
@@ -963,8 +1047,7 @@ class ManualSegmentationWidget(QWidget):
             elif (self.go_to_selected_slice_push_button.isChecked() == False) and (self.selected_slice_combo_box.currentText() != " "):
                 current_axis_index = self.viewer.dims.not_displayed[0]
                 current_slice = self.viewer.dims.current_step[current_axis_index]
-                selected_slice = int(self.selected_slice_combo_box.currentText()[:-1])
-                selected_axis_index = axis_order.index(self.selected_slice_combo_box.currentText()[-1])
+                selected_axis_index, selected_slice = parse_selected_slice(self.selected_slice_combo_box.currentText())
 
                 if (current_slice == selected_slice) and (current_axis_index == selected_axis_index):
                     self.go_to_selected_slice_push_button.setChecked(True)
@@ -1044,9 +1127,37 @@ class ManualSegmentationWidget(QWidget):
         """
         self.reset_oriented_landmark_combo_box()
 
-        for landmark_index in range(len(self.oriented_landmarks_positions_array)):
-            new_text = str(landmark_index + 1)
-            self.selected_oriented_landmark_combo_box.addItem(new_text)
+        # all the items are added at once (a single update of the combo box for large landmark sets)
+        self.selected_oriented_landmark_combo_box.addItems([str(landmark_index + 1) for landmark_index in range(len(self.oriented_landmarks_positions_array))])
+
+    def update_landmarks_display(self, event=None):
+        """
+        Only display the landmarks close to the current slice (within the range of the landmarks_display_range spin box),
+        the landmarks are found with the landmark index without going through the whole list
+
+        Parameters
+        ----------
+        event : event
+            event of the current slice or of the spin box (not used)
+
+        """
+        if "landmarks" not in self.viewer.layers:
+            return
+
+        landmarks_layer = self.viewer.layers["landmarks"]
+        nbr_slices = self.landmarks_display_range_spin_box.value()
+
+        if (nbr_slices == 0) or (len(self.viewer.dims.not_displayed) != 1) or (len(landmarks_layer.data) != len(self.oriented_landmarks_index)):
+            if not np.all(landmarks_layer.shown):
+                landmarks_layer.shown = np.ones(len(landmarks_layer.data), dtype=bool)
+            return
+
+        current_axis_index = self.viewer.dims.not_displayed[0]
+        current_slice = self.viewer.dims.current_step[current_axis_index]
+
+        shown = np.zeros(len(landmarks_layer.data), dtype=bool)
+        shown[self.oriented_landmarks_index.within_slices(current_axis_index, current_slice, nbr_slices)] = True
+        landmarks_layer.shown = shown
 
     def set_button_interactivity(self, event):
         """
@@ -1073,34 +1184,41 @@ class ManualSegmentationWidget(QWidget):
             3D image as a 3D array. None if importation failed.
 
         """
-        dicom_path = QFileDialog.getExistingDirectory(self, 'Choose a DICOM serie directory')
+        dicom_path = QFileDialog.getExistingDirectory(self, 'Choose a DICOM serie (or study) directory')
 
         if dicom_path == "":
             return None
 
-        if (Path(dicom_path).name == 'Raw') or (Path(dicom_path).name == 'ST0'):
-            self.image_dir = Path(dicom_path).parents[1]
-            file_name = Path(dicom_path).parents[0].name
-        else:
-            self.image_dir = Path(dicom_path).parents[0]
-            file_name = Path(dicom_path).name
-
-        reader = sitk.ImageSeriesReader()
-
-        series_found = reader.GetGDCMSeriesIDs(dicom_path)
-        if len(series_found) > 1:
-            display_warning_box(self, "Error", "More than 1 DICOM serie in the folder. Select a folder containing a single DICOM series.")
+        # header-only index of the folder tree (cached in the folder), the user picks a series if several are found
+        list_series = find_dicom_series(dicom_path)
+        if len(list_series) == 0:
+            display_warning_box(self, "Error", "NO DICOM data in the folder.")
             return None
+        elif len(list_series) == 1:
+            series = list_series[0]
+        else:
+            list_names = [get_dicom_series_name(series, dicom_path) for series in list_series]
+            series_index = display_item_choice_box(self, "Choose a DICOM serie", "Several DICOM series found in the folder:", list_names)
+            if series_index is None:
+                return None
+            series = list_series[series_index]
+
+        series_path = series["folder"]
+        if (Path(series_path).name == 'Raw') or (Path(series_path).name == 'ST0'):
+            self.image_dir = Path(series_path).parents[1]
+            file_name = Path(series_path).parents[0].name
+        else:
+            self.image_dir = Path(series_path).parents[0]
+            file_name = Path(series_path).name
 
-        img_names = reader.GetGDCMSeriesFileNames(dicom_path)
-        reader.SetFileNames(img_names)
         try:
-            self.image_sitk = reader.Execute()
+            # slices are read on demand (and prefetched) instead of decoding the whole series before display
+            image_arr, self.image_geometry = read_dicom_series_lazy(series["file_names"], isSorted=True) # z, y, x (files sorted by the folder index)
+            self.image_source_key = get_source_key(series["file_names"])
         except:
             display_warning_box(self, "Error", "NO DICOM data in the folder.")
             return None
 
-        image_arr = sitk.GetArrayFromImage(self.image_sitk) # z, y, x
         #ITK's Image class does not have a bracket operator. It has a GetPixel which takes an ITK Index object as an argument, which is an array ordered as (x,y,z). This is the convention that SimpleITK's Image class uses for the GetPixel method as well.
         # While in numpy, an array is indexed in the opposite order (z,y,x).
 
@@ -1130,19 +1248,18 @@ class ManualSegmentationWidget(QWidget):
 
         extensions = Path(file_path).suffixes
         self.image_dir = Path(file_path).parents[0]
+        self.image_source_key = get_source_key(file_path)
 
         if (extensions[-1] in [".tif", ".tiff", ".nii"]) or (extensions == [".nii", ".gz"]):
-            try:
-                self.image_sitk = sitk.ReadImage(file_path)
-                image_arr = sitk.GetArrayFromImage(self.image_sitk)
+            # image data are read lazily (memory mapped or slice by slice on demand)
+            if extensions[-1] in [".tif", ".tiff"]:
+                image_arr, self.image_geometry = read_tiff_lazy(file_path)
                 if len(image_arr.shape) == 2:
                     image_arr = np.expand_dims(image_arr, 0)
-            # SimpleITK can not handle images with 64-bits images
-            except:
-                image_arr = tif.imread(file_path)
+            else:
+                image_arr, self.image_geometry = read_nifti_lazy(file_path)
                 if len(image_arr.shape) == 2:
                     image_arr = np.expand_dims(image_arr, 0)
-                self.image_sitk = sitk.Image(image_arr.shape[2], image_arr.shape[1], image_arr.shape[0], sitk.sitkInt16)
 
             if len(extensions) == 2:
                 self.file_name_label.setText(Path(Path(file_path).stem).stem)
@@ -1171,8 +1288,8 @@ class ManualSegmentationWidget(QWidget):
         ----------
         segmentation_arr : ndarray
             segmentation image as a 3D array. None if importation failed.
-        segmentation_sitk : SimpleITK image
-            segmentation image as SimpleITK image
+        segmentation_geometry : ImageGeometry
+            geometry and description of the segmentation file
 
         """
         if default_file_path is None:
@@ -1184,25 +1301,21 @@ class ManualSegmentationWidget(QWidget):
             file_path = str(default_file_path)
 
         extensions = Path(file_path).suffixes
-        if (extensions[-1] in [".tif", ".tiff", ".nii"]) or (extensions == [".nii", ".gz"]):
-            try:
-                segmentation_sitk = sitk.ReadImage(file_path)
-                segmentation_arr = sitk.GetArrayFromImage(segmentation_sitk)
-                segmentation_arr = segmentation_arr.astype(np.uint8)
-                if len(segmentation_arr.shape) == 2:
-                    segmentation_arr = np.expand_dims(segmentation_arr, 0)
-
-            # SimpleITK can not handle images with 64-bits images
-            except:
-                segmentation_arr = tif.imread(file_path)
-                segmentation_arr = segmentation_arr.astype(np.uint8)
-                if len(segmentation_arr.shape) == 2:
-                    segmentation_arr = np.expand_dims(segmentation_arr, 0)
-                segmentation_sitk = sitk.Image(segmentation_arr.shape[2], segmentation_arr.shape[1], segmentation_arr.shape[0], sitk.sitkInt8)
-
-            if any(n < 0 for n in np.unique(segmentation_arr)):
-                display_warning_box(self, "Error", "Incorrect NIFTI format : negative value.")
-                return None, None
+        if extensions[-1] in [".tif", ".tiff"]:
+            # TIFF files (possibly compressed and tiled) are read with tifffile, the description is kept for the selected slices
+            segmentation_arr, description = read_tiff_slices(file_path)
+            if len(segmentation_arr.shape) == 2:
+                segmentation_arr = np.expand_dims(segmentation_arr, 0)
+            segmentation_geometry = ImageGeometry(segmentation_arr.shape[::-1], description=description)
+
+        elif (extensions[-1] == ".nii") or (extensions == [".nii", ".gz"]):
+            import SimpleITK as sitk
+
+            segmentation_sitk = sitk.ReadImage(file_path)
+            segmentation_geometry = ImageGeometry.from_sitk(segmentation_sitk)
+            segmentation_arr = get_array_view(segmentation_sitk)
+            if len(segmentation_arr.shape) == 2:
+                segmentation_arr = np.expand_dims(segmentation_arr, 0)
 
         else:
             return None, None
@@ -1211,10 +1324,20 @@ class ManualSegmentationWidget(QWidget):
             display_warning_box(self, "Error", "Incorrect file size. Need to be a 3D image.")
             return None, None
 
-        if not isinstance(segmentation_arr.flat[0], np.integer):
-            segmentation_arr = segmentation_arr.astype(np.int)
+        # smallest unsigned type able to store the labels (no copy if the file already has it)
+        try:
+            segmentation_arr = as_label_volume(segmentation_arr)
+        except ValueError:
+            display_warning_box(self, "Error", "Incorrect segmentation format : negative value.")
+            return None, None
+
+        # the annotations are edited: a read-only view of the file buffer is copied once
+        if not segmentation_arr.flags.writeable:
+            segmentation_arr = segmentation_arr.copy()
 
-        return segmentation_arr, segmentation_sitk
+        self.segmentation_file_path = file_path
+
+        return segmentation_arr, segmentation_geometry
 
     def has_corresponding_segmentation_file(self):
         """
@@ -1254,48 +1377,37 @@ class ManualSegmentationWidget(QWidget):
         with open(file_path) as f:
             import_contrast = json.load(f)
 
-        if (np.max(import_contrast) <= self.viewer.layers['image'].contrast_limits_range[1]) and (np.min(import_contrast) >= self.viewer.layers['image'].contrast_limits_range[0]):
+        # napari extends the contrast slider if the imported limits are outside of its range
+        if (np.size(import_contrast) == 2) and np.all(np.isfinite(import_contrast)) and (import_contrast[0] < import_contrast[1]):
             self.custom_contrast_limits = import_contrast
         else:
-            display_warning_box(self, "Error", "The imported contrast limits is outside of the image contrast range.")
+            display_warning_box(self, "Error", "The imported contrast limits are not a valid (min, max) pair.")
             return
 
         self.default_contrast_combo_box.setCurrentText("Custom Contrast")
 
-    def import_selected_slice(self, segmentation_sitk=None):
+    def import_selected_slice(self, segmentation_geometry=None):
         """
         Import metadata containing in the 'ImageDescription'/'Hesperos_SelectedSlices' as a list. (works only for tiff file TODO TOIMPROVE)
 
         Parameters
         ----------
-        segmentation_sitk : SimpleITK image
-            segmentation data in sitk format
+        segmentation_geometry : ImageGeometry
+            geometry and description of the segmentation file
 
         """
+        # in new version the index number and the axe are saved as string : ['100x', '102y']
+        # in old version only the index number along z was saved : "[136, 170, 255]"
         try:
-            description = json.loads(segmentation_sitk.GetMetaData('ImageDescription'))
-            loaded_selected_slice_list = description['Hesperos_SelectedSlices']
-            if loaded_selected_slice_list[0] == '[':
-                is_old_version = True
-                loaded_selected_slice_list = json.loads(description['Hesperos_SelectedSlices'])
-            else:
-                is_old_version = False
-        except:
+            description = json.loads(segmentation_geometry.description)
+            loaded_selected_slices = parse_selected_slices_metadata(description['Hesperos_SelectedSlices'])
+        except (AttributeError, TypeError, KeyError, ValueError):
             return
-        if loaded_selected_slice_list != []:
-            if loaded_selected_slice_list != "[]":
-                # in old version : only the index number was saved : ['100x', '102y']
-                if is_old_version :
-                    self.selected_slice_list = [str(index) + 'z' for index in loaded_selected_slice_list]
-                else:
-                    self.selected_slice_list = loaded_selected_slice_list
-                    
-                # in new version the index number and the axe are saved as string  : "[136, 170, 255]"
-                self.selected_slice_list.sort(key=lambda text: int(text[:-1]))
 
-                for slice_index in self.selected_slice_list:
-                    new_text = str(slice_index)
-                    self.selected_slice_combo_box.addItem(new_text)
+        if len(loaded_selected_slices) != 0:
+            # sorted once, and all the items are added to the combo box at once
+            self.selected_slices.load(loaded_selected_slices)
+            self.selected_slice_combo_box.addItems(self.selected_slices.get_texts())
 
 
 # ============ Import data from DIVA ============
@@ -1316,119 +1428,32 @@ class ManualSegmentationWidget(QWidget):
             return False
         
 
-        with open(file_path, 'r') as f:
-            oriented_landmarks_data = json.loads(f.read())
-        oriented_landmarks_positions_df = pd.json_normalize(oriented_landmarks_data['_oriented_landmarks_parameters'], record_path=['_volume_positions'])
-        oriented_landmarks_orientations_df = pd.json_normalize(oriented_landmarks_data['_oriented_landmarks_parameters'], record_path=['_local_rotations'])        
-        
-        nbr_landmarks = len(oriented_landmarks_positions_df)
-        # if nbr_landmarks > 10:
-        #     display_warning_box(self, "Error", "More than 10 oriented landmarks are not allowed. Please remove some landmarks in your file.")
-        #     return False
+        # positions and quaternions are parsed straight into arrays (or read from the binary sidecar of large landmark sets)
+        try:
+            diva_positions, oriented_landmarks_quaternions_array = read_oriented_landmarks(file_path)
+        except ValueError:
+            display_warning_box(self, "Error", "Incorrect orientations format: need to have positions as x, y, z and quaternions as x, y, z and w in the file.")
+            return False
 
         # DIVA volume is ordered as (x, y, z) and z axis is inverted
         # Numpy array is ordered as (z, y, x)
-        shape = self.viewer.layers['image'].data.shape # as (x, y, z)
+        shape = self.viewer.layers['image'].data.shape
 
-        oriented_landmarks_positions_array = [[] * len(shape) for i in range(nbr_landmarks)]
-        oriented_landmarks_orientations_array = [[] * len(shape) for i in range(nbr_landmarks)]
-        oriented_landmarks_quaternions_array = [[] * 4 for i in range(nbr_landmarks)]
-
-        if ("x" and "y" and "z" and "w") in oriented_landmarks_orientations_df.columns.values.tolist():
-            for i in range(nbr_landmarks):
-                diva_x, diva_y, diva_z = round(oriented_landmarks_positions_df['x'][i]), round(oriented_landmarks_positions_df['y'][i]), round(oriented_landmarks_positions_df['z'][i])
-                oriented_landmarks_positions_array[i] = [shape[0] - diva_z, diva_y, diva_x]
-                oriented_landmarks_quaternions_array[i] = [oriented_landmarks_orientations_df['x'][i], oriented_landmarks_orientations_df['y'][i], oriented_landmarks_orientations_df['z'][i], oriented_landmarks_orientations_df['w'][i]]
-                special_variable_list = [[0.0, 1.0, 0.0, 0.0], [0.0, 1.0, 1.0, 0.0], [0.0, 1.0, 0.0, 1.0]]
-                if oriented_landmarks_quaternions_array[i] in special_variable_list:
-                    # landmark in z
-                    if oriented_landmarks_quaternions_array[i] == [0.0, 1.0, 0.0, 0.0]:
-                        oriented_landmarks_orientations_array[i] = [0.0, 0.0, 1.0]
-                    # landmark in y
-                    elif oriented_landmarks_quaternions_array[i] == [0.0, 1.0, 1.0, 0.0]:
-                        oriented_landmarks_orientations_array[i] = [0.0, 1.0, 0.0]
-                    # landmark in x
-                    elif oriented_landmarks_quaternions_array[i] == [0.0, 1.0, 0.0, 1.0]:
-                        oriented_landmarks_orientations_array[i] = [1.0, 0.0, 0.0]
-                        
-                else:
-                    forward = np.array([0.0, 0.0, 1.0])
-                    oriented_landmarks_orientations_array[i] = self.quaternion_multiply_old(oriented_landmarks_quaternions_array[i], forward)
-                    oriented_landmarks_orientations_array[i][-1] = - oriented_landmarks_orientations_array[i][-1]
-        else:
-            display_warning_box(self, "Error", "Incorrect orientations format: need to have quaternions as x, y, z and w in the file.")
-            return False
+        oriented_landmarks_positions_array = diva_to_volume_positions(diva_positions, shape)
+        oriented_landmarks_orientations_array = quaternions_to_orientations(oriented_landmarks_quaternions_array)
 
         # Check if landmark position is valid
-        for i in range(nbr_landmarks):
-            if (oriented_landmarks_positions_array[i][0] > shape[0]) or (oriented_landmarks_positions_array[i][1] > shape[1]) or (oriented_landmarks_positions_array[i][2] > shape[2]) or any(x < 0 for x in oriented_landmarks_positions_array[i]):
-                display_warning_box(self, "Error", "Incorrect landmark positions: outside of the image size.")
-                return False
+        if not np.all(are_inside_volume(oriented_landmarks_positions_array, shape)):
+            display_warning_box(self, "Error", "Incorrect landmark positions: outside of the image size.")
+            return False
             
-        self.oriented_landmarks_positions_array = np.array(oriented_landmarks_positions_array)
-        self.oriented_landmarks_orientations_array = np.array(oriented_landmarks_orientations_array)
-        self.oriented_landmarks_quaternions_array = np.array(oriented_landmarks_quaternions_array)
+        self.oriented_landmarks_positions_array = oriented_landmarks_positions_array
+        self.oriented_landmarks_orientations_array = oriented_landmarks_orientations_array
+        self.oriented_landmarks_quaternions_array = oriented_landmarks_quaternions_array
+        self.oriented_landmarks_index.set_positions(oriented_landmarks_positions_array)
 
         return True
     
-    def quaternion_multiply(self, quaternion, vector3):
-        """
-        Rotate a vector by a quaternion : same as (quaternion * Vector3.forward) in Unity 
-        (inspired from https://answers.unity.com/questions/372371/multiply-quaternion-by-vector3-how-is-done.html)
-        
-        Parameters
-        ----------
-        quaternion : float[4]
-            array of (x, y, z, w) coordinates represented a Quaternion
-        vector3 : float[3]
-            array of (x, y, z)
-            
-        Returns
-        ----------
-        output : float[3]
-            array of (x, y, z)
-                    
-        """
-        q0 = quaternion[0]
-        q1 = quaternion[1]
-        q2 = quaternion[2]
-        q3 = quaternion[3]
-        m00 = 1.0 - 2.0 * q1 * q1 - 2.0 * q2 * q2
-        m01 = 2.0 * q0 * q1 - 2.0 * q2 * q3
-        m02 = 2.0 * q0 * q2 + 2.0 * q1 * q3
-        m10 = 2.0 * q0 * q1 + 2.0 * q2 * q3
-        m11 = 1.0 - 2.0 * q0 * q0 - 2.0 * q2 * q2
-        m12 = 2.0 * q1 * q2 - 2.0 * q0 * q3
-        m20 = 2.0 * q0 * q2 - 2.0 * q1 * q3
-        m21 = 2.0 * q1 * q2 + 2.0 * q0 * q3
-        m22 = 1.0 - 2.0 * q0 * q0 - 2.0 * q1 * q1
-        
-        x = m00 * vector3[0] + m01 * vector3[1] + m02 * vector3[2]
-        y = m10 * vector3[0] + m11 * vector3[1] + m12 * vector3[2]
-        z = m20 * vector3[0] + m21 * vector3[1] + m22 * vector3[2]
-        
-        return [x, y, z]
-    
-    def quaternion_multiply_old(self, quaternion, vector3):
-        
-        num = quaternion[0] * 2.0
-        num2 = quaternion[1] * 2.0
-        num3 = quaternion[2] * 2.0
-        num4 = quaternion[0] * num
-        num5 = quaternion[1] * num2
-        num6 = quaternion[2] * num3
-        num7 = quaternion[0] * num2
-        num8 = quaternion[0] * num3
-        num9 = quaternion[1] * num3
-        num10 = quaternion[3] * num
-        num11 = quaternion[3] * num2
-        num12 = quaternion[3] * num3
-        x = (1.0 - (num5 + num6)) * vector3[0] + (num7 - num12) * vector3[1] + (num8 + num11) * vector3[2]
-        y = (num7 + num12) * vector3[0] + (1.0 - (num4 + num6)) * vector3[1] + (num9 - num10) * vector3[2]
-        z = (num8 - num11) * vector3[0]+ (num9 + num10) * vector3[1] + (1.0 - (num4 + num5)) * vector3[2]
-        
-        return [x, y, z]
-
     def local_to_volume_position(self, local_position):
         """
         Convert local position to volume position according to the volume open in the "image" layer.
@@ -1483,17 +1508,6 @@ class ManualSegmentationWidget(QWidget):
 
 
 # ============ Export data ============
-    def export_backup_segmentation(self):
-        """
-            Export a backup of the 3D segmentation data as a .tif file.
-
-        """
-        if hasattr(self.viewer, 'layers'):
-            if "annotations" in self.viewer.layers:
-                segmentation_arr = self.viewer.layers['annotations'].data
-                temp_segmentation_data_file_path = Path(self.image_dir).joinpath("TEMP_" + self.file_name_label.text() + "_segmentation.tif")
-                tif.imsave(str(temp_segmentation_data_file_path), segmentation_arr)
-
     def export_custom_contrast(self):
         """
         Export custom contrast limits as a .json file that can be re-open in the plugin
@@ -1540,89 +1554,97 @@ class ManualSegmentationWidget(QWidget):
                     """How do you want to export the segmentation data ? \n\n _Unique_ : as a unique 3D image with corresponding label ids (can be re-open for correction in the application). \n\n _Several_ : as several binary 3D images (0 or 255), one for each label id.""",
                 )
 
-                segmentation_arr = self.viewer.layers['annotations'].data
+                if not is_supported_extension(file_path):
+                    display_warning_box(self, "Error", "Incorrect file extension. Use .tif, .tiff, .nii or .nii.gz.")
+                    self.status_label.setText("Ready")
+                    return
+
+                # copy: annotation can continue while the file is written in background
+                segmentation_arr = np.copy(self.viewer.layers['annotations'].data)
 
                 extensions = Path(file_path).suffixes
 
                 if saving_mode: # "Unique" choice
+                    # once written, the exported file becomes the reference of the journal (see on_export_segmentation_done)
+                    nbr_saved_records = self.segmentation_journal.nbr_records if self.segmentation_journal is not None else 0
+                    on_export_done = functools.partial(self.on_export_segmentation_done, file_path, self.segmentation_journal, nbr_saved_records)
+
                     if extensions[-1] in [".tif", ".tiff"]:
-                        description = {"Hesperos_SelectedSlices" : self.selected_slice_list}
-                        # tif.imsave(file_path, segmentation_arr, description=json.dumps(self.selected_slice_list))
-                        tif.imsave(file_path, segmentation_arr, description=json.dumps(description))
-                        # tif.imsave(file_path, segmentation_arr, description=description)
-
-                    elif (extensions[-1] == ".nii") or (extensions == [".nii", ".gz"]):
-                        result_image_sitk = sitk.GetImageFromArray(segmentation_arr.astype(np.uint8))
-                        result_image_sitk.CopyInformation(self.image_sitk)
-                        sitk.WriteImage(result_image_sitk, file_path)
-
-                        # ====== Test Metadata writing with SimpleITK ======
-                        # result_image_sitk.SetMetaData(key="Hesperos_SelectedSlices", value=str(self.selected_slice_list))
-                        # result_image_sitk.GetMetaData("Hesperos_SelectedSlices")
-                        # for k in result_image_sitk.GetMetaDataKeys():
-                        #     v = result_image_sitk.GetMetaData(k)
-                        #     print("({0}) = = \"{1}\"".format(k,v))
-
-                        # writer = sitk.ImageFileWriter()
-                        # writer.KeepOriginalImageUIDOn()
-                        # writer.SetFileName(file_path)
-                        # writer.Execute(result_image_sitk)
-                        # ==================================================================
+                        description = {"Hesperos_SelectedSlices" : self.selected_slices.get_texts()}
+                        export_worker = create_worker(write_image, file_path, segmentation_arr, description=description)
 
-                else: # "Several" choice
-                    structure_name = self.annotation_combo_box.currentText()
-                    if structure_name == "Fetus":
-                        structure_list = self.fetus.list_structure_name
-                    elif structure_name == "Shoulder":
-                        structure_list = self.shoulder.list_structure_name
-                    elif structure_name == "Shoulder Bones":
-                        structure_list = self.shoulder_bones.list_structure_name
-                    elif structure_name == "Shoulder Bone Borders":
-                        structure_list = self.shoulder_bone_borders.list_structure_name
-                    elif structure_name == "Shoulder Deltoid":
-                        structure_list = self.shoulder_deltoid.list_structure_name
-                    elif structure_name == "Feta Challenge":
-                        structure_list = self.feta.list_structure_name
-                    elif structure_name == "Larva":
-                        structure_list = self.larva.list_structure_name
-                    elif structure_name == "Mouse Embryon":
-                        structure_list = self.mouse_embryon.list_structure_name
                     else:
-                        structure_list=[]
-
-                    for idx, struc in enumerate(structure_list):
-                        label_struc = np.zeros(segmentation_arr.shape, dtype=np.uint8)
-                        label_struc[segmentation_arr == (idx + 1)] = 255
-
-                        #export only if the labelled data is not empty
-                        if np.any(label_struc):
-                            if extensions[-1] in [".tif", ".tiff"]:
-                                file_name = Path(file_path).stem
-                                new_file_name = file_name + '_' + struc + extensions[0]
-                                new_file_path = Path(Path(file_path).parent).joinpath(new_file_name)
-                                tif.imsave(str(new_file_path), label_struc)
-
-                            elif (extensions[-1] == ".nii") or (extensions == [".nii", ".gz"]):
-                                file_name = Path(Path(file_path).stem).stem
-                                try:
-                                    new_file_name = file_name + '_' + struc + extensions[0] + extensions[1]
-                                except:
-                                    new_file_name = file_name + '_' + struc + extensions[0]
-                                new_file_path = Path(Path(file_path).parent).joinpath(new_file_name)
-                                result_image_sitk = sitk.GetImageFromArray(label_struc)
-                                result_image_sitk.CopyInformation(self.image_sitk)
-                                sitk.WriteImage(result_image_sitk, str(new_file_path))
-
-                            else:
-                                return
-
-                self.remove_backup_segmentation_file()
-                self.status_label.setText("Ready")
+                        export_worker = create_worker(write_image, file_path, segmentation_arr, image_geometry=self.image_geometry)
+
+                else: # "Several" choice
+                    protocol = self.protocol_registry.get(self.annotation_combo_box.currentText())
+                    structure_list = protocol.list_structure_name if protocol is not None else []
+
+                    isCropped = display_yes_no_question_box(
+                        "Cropped Export",
+                        "Do you want to crop each binary 3D image to the bounding box of its label ? \n\n The position of the crop is kept in the file (origin for NIfTI, offset in the description for TIFF).",
+                    )
+
+                    export_worker = create_worker(export_binary_labels, segmentation_arr, file_path, structure_list, self.image_geometry, isCropped)
+                    export_worker.yielded.connect(self.update_export_progress)
+                    on_export_done = functools.partial(self.on_export_segmentation_done, None, None, 0)
+
+                export_worker.returned.connect(on_export_done)
+                export_worker.errored.connect(self.on_export_segmentation_error)
+                export_worker.start()
 
             else:
                 display_warning_box(self, "Error", "No segmentation data find.")
                 return
 
+    def update_export_progress(self, progress):
+        """
+        Display the progress of the export in the status label
+
+        Parameters
+        ----------
+        progress : tuple(int, int)
+            number of files written and total number of files to write
+
+        """
+        nbr_written, nbr_files = progress
+        self.status_label.setText(f"Saving... ({nbr_written}/{nbr_files} files)")
+
+    def on_export_segmentation_done(self, file_path, journal, nbr_saved_records, *args):
+        """
+        Remove the backup file once the segmentation is exported.
+        For a unique file, the written file becomes the reference of the journal: only the edits done after the copy of
+        the exported data are kept in the journal.
+
+        Parameters
+        ----------
+        file_path : str
+            path of the exported segmentation (None for an export as several files)
+        journal : EditJournal
+            journal recording the edits when the export started
+        nbr_saved_records : int
+            number of records of the journal included in the exported data
+
+        """
+        if (file_path is not None) and (journal is not None) and (journal is self.segmentation_journal):
+            self.restart_segmentation_journal(file_path, nbr_saved_records)
+
+        self.remove_backup_segmentation_file()
+        self.status_label.setText("Ready")
+
+    def on_export_segmentation_error(self, error):
+        """
+        Display the error raised during the export
+
+        Parameters
+        ----------
+        error : Exception
+            error raised while writing the files
+
+        """
+        display_warning_box(self, "Error", f"Export failed: {error}")
+        self.status_label.setText("Ready")
+
     def export_oriented_landmarks(self):
         """
         Export oriented landmark parameters as a .json file for reopening in DIVA software.
@@ -1636,28 +1658,14 @@ class ManualSegmentationWidget(QWidget):
         if file_path == "":
             return
 
-        oriented_landmarks = {}
-        oriented_landmarks_parameters = {}
-        
         shape = self.viewer.layers['image'].data.shape # as (x, y, z)
         
         if len(shape) != 3:
             display_warning_box(self, "Error", "Incorrect image size. Need to be a 3D image to use oriented landmarks.")
             return
         
-        volume_positions = pd.DataFrame(self.oriented_landmarks_positions_array, columns = ["z","y","x"])
-        volume_positions = volume_positions[["x","y","z"]]
-        volume_positions["z"] = shape[0] - volume_positions["z"]
-        
-        local_rotations = pd.DataFrame(self.oriented_landmarks_quaternions_array, columns = ["x","y","z","w"])
-
-        oriented_landmarks["_volume_positions"] = volume_positions.to_dict('records')
-        oriented_landmarks["_local_rotations"] = local_rotations.to_dict('records')
-        
-        oriented_landmarks_parameters["_oriented_landmarks_parameters"] = oriented_landmarks
-            
-        with open(file_path, 'w') as f:
-            json.dump(oriented_landmarks_parameters, f, separators=(',', ':'))
+        diva_positions = volume_to_diva_positions(self.oriented_landmarks_positions_array, shape)
+        write_oriented_landmarks(file_path, diva_positions, self.oriented_landmarks_quaternions_array)
     
 
 # ============ Set data ============
@@ -1717,7 +1725,7 @@ class ManualSegmentationWidget(QWidget):
                 if choice: #Yes
                     self.set_segmentation_with_path(segmentation_file_path)
                 else:
-                    segmentation_arr = np.zeros(image_arr.shape, dtype=np.int8)
+                    segmentation_arr = create_label_volume(image_arr.shape)
                     self.set_segmentation_layer(segmentation_arr)
                     self.reset_lock_push_button()
                     self.go_to_selected_slice_push_button.setChecked(False)
@@ -1726,7 +1734,7 @@ class ManualSegmentationWidget(QWidget):
                     self.reset_oriented_landmark()
 
             else:
-                segmentation_arr = np.zeros(image_arr.shape, dtype=np.int8)
+                segmentation_arr = create_label_volume(image_arr.shape)
                 self.set_segmentation_layer(segmentation_arr)
                 self.reset_lock_push_button()
                 self.go_to_selected_slice_push_button.setChecked(False)
@@ -1752,71 +1760,47 @@ class ManualSegmentationWidget(QWidget):
             if len(shape) != 3:
                 return
             current_points_layer_data = self.viewer.layers["landmarks"].data
-
             new_nbr_landmarks = len(current_points_layer_data)
-            oriented_landmarks_positions_array = [[] * len(shape) for i in range(new_nbr_landmarks)]
-            oriented_landmarks_orientations_array = [[0.0] * len(shape) for i in range(new_nbr_landmarks)]
-            oriented_landmarks_quaternions_array = [[0.0] * 4 for i in range(new_nbr_landmarks)]
 
             # == When a point was added (always at the last position in the list) ===
             if new_nbr_landmarks > len(self.oriented_landmarks_positions_array):
-                # # Check if landmark position is valid
+                # Check if landmark position is valid
                 new_point_position_array = current_points_layer_data[-1].astype(np.int16)
-                if (new_point_position_array[0] > shape[0]) or (new_point_position_array[1] > shape[1]) or (new_point_position_array[2] > shape[2]) or any(x < 0 for x in new_point_position_array):
+                if not are_inside_volume(new_point_position_array, shape)[0]:
                     display_warning_box(self, "Error", "Incorrect landmark positions: outside of the image size.")
                     self.remove_oriented_landmark(isRemoveLast = True)
                     self.add_oriented_landmark_push_button.setChecked(False)
                     return 
                                 
                 is_added = True
-                for i in range(new_nbr_landmarks):
-                    oriented_landmarks_positions_array[i] = current_points_layer_data[i].astype(np.int16)
-                    # for the last point (the new one) define orientations as the current axes
-                    if i == new_nbr_landmarks - 1:
-                        # test if new point in image size 
-                        # 2D view
-                        if len(self.viewer.dims.displayed) == 2:
-                            current_axis_index = self.viewer.dims.not_displayed[0]
-                            # Order of rotation Rx, Ry, Rz different of the axis order z y x
-                            if len(shape) == 3:
-                                rotation_order = [2, 1, 0]
-                            else : 
-                                rotation_order = [1, 0]
-                            
-                            oriented_landmarks_orientations_array[i][rotation_order[current_axis_index]] = 1.0
-                            
-                            # for landmark added in z as current axis => q = 0 1 0 0
-                            if rotation_order[current_axis_index] == 2:
-                                oriented_landmarks_quaternions_array[i][1] = 1.0
-                            # for landmark added in y as current axis => q = 0 1 1 0
-                            elif rotation_order[current_axis_index] == 1:
-                                oriented_landmarks_quaternions_array[i][1] = 1.0
-                                oriented_landmarks_quaternions_array[i][2] = 1.0
-                            # for landmark added in x as current axis => q = 0 1 0 1
-                            elif rotation_order[current_axis_index] == 0:
-                                oriented_landmarks_quaternions_array[i][1] = 1.0
-                                oriented_landmarks_quaternions_array[i][3] = 1.0
-                        # 3D view (keep orientation to 0)
-                    else:
-                        oriented_landmarks_orientations_array[i] = self.oriented_landmarks_orientations_array[i]
-                        oriented_landmarks_quaternions_array[i] = self.oriented_landmarks_quaternions_array[i]
-
-            # == When a point was deleted (always at the last position in the list) ===
+                # for the new point define orientations as the current axis (2D view), keep orientation to 0 in 3D view
+                new_orientation, new_quaternion = np.zeros(3), np.zeros(4)
+                if len(self.viewer.dims.displayed) == 2:
+                    new_orientation, new_quaternion = get_axis_orientation(self.viewer.dims.not_displayed[0])
+
+                self.oriented_landmarks_positions_array = current_points_layer_data.astype(np.int16)
+                self.oriented_landmarks_orientations_array = np.vstack([self.oriented_landmarks_orientations_array, new_orientation])
+                self.oriented_landmarks_quaternions_array = np.vstack([self.oriented_landmarks_quaternions_array, new_quaternion])
+                self.oriented_landmarks_index.add(new_point_position_array)
+                self.selected_oriented_landmark_combo_box.addItem(str(new_nbr_landmarks))
+
+            # == When a point was deleted ===
             elif new_nbr_landmarks < len(self.oriented_landmarks_positions_array):
                 is_added = False
-                oriented_landmarks_positions_array = current_points_layer_data.astype(np.int16)
-                oriented_landmarks_orientations_array = self.oriented_landmarks_orientations_array[:-1]
-                oriented_landmarks_quaternions_array = self.oriented_landmarks_quaternions_array[:-1]
+                removed_index = find_removed_index(self.oriented_landmarks_positions_array, current_points_layer_data.astype(np.int16))
+
+                self.oriented_landmarks_positions_array = current_points_layer_data.astype(np.int16)
+                self.oriented_landmarks_orientations_array = np.delete(self.oriented_landmarks_orientations_array, removed_index, axis=0)
+                self.oriented_landmarks_quaternions_array = np.delete(self.oriented_landmarks_quaternions_array, removed_index, axis=0)
+                self.oriented_landmarks_index.remove(removed_index)
+                self.selected_oriented_landmark_combo_box.removeItem(self.selected_oriented_landmark_combo_box.count() - 1)
 
             else:
                 return
 
-            self.oriented_landmarks_positions_array = np.array(oriented_landmarks_positions_array)
-            self.oriented_landmarks_orientations_array = np.array(oriented_landmarks_orientations_array)
-            self.oriented_landmarks_quaternions_array = np.array(oriented_landmarks_quaternions_array)
-
-            self.set_oriented_landmark_layers()
-            self.update_selected_oriented_landmark_combo_box()
+            # only the vectors layer is updated (the points layer already contains the edit)
+            self.update_orientations_layer()
+            self.update_landmarks_display()
 
             # == When a point was added ===
             if is_added:
@@ -1871,7 +1855,7 @@ class ManualSegmentationWidget(QWidget):
         if canRemove:
             self.status_label.setText("Loading...")
 
-            segmentation_arr, segmentation_sitk = self.import_segmentation_file(segmentation_path)
+            segmentation_arr, segmentation_geometry = self.import_segmentation_file(segmentation_path)
 
             if segmentation_arr is None:
                 self.status_label.setText("Ready")
@@ -1881,9 +1865,10 @@ class ManualSegmentationWidget(QWidget):
                 image_arr = self.viewer.layers['image'].data
 
                 if segmentation_arr.shape != image_arr.shape:
-                    image_arr_viewer = np.transpose(image_arr, self.viewer.dims.order)
+                    # only the shape is needed (transposing the image would read it entirely)
+                    image_shape_viewer = tuple(image_arr.shape[axis] for axis in self.viewer.dims.order)
 
-                    if segmentation_arr.shape == image_arr_viewer.shape:
+                    if segmentation_arr.shape == image_shape_viewer:
                         if self.viewer.dims.order == (2, 0, 1):
                             segmentation_arr = np.transpose(segmentation_arr, (1, 2, 0))
                         elif self.viewer.dims.order == (1, 2, 0):
@@ -1894,12 +1879,12 @@ class ManualSegmentationWidget(QWidget):
                         self.status_label.setText("Ready")
                         return
 
-                self.set_segmentation_layer(segmentation_arr)
+                self.set_segmentation_layer(segmentation_arr, base_file_path=self.segmentation_file_path)
                 self.update_napari_layers_order()
                 self.reset_lock_push_button()
                 self.go_to_selected_slice_push_button.setChecked(False)
                 self.reset_selected_slice_combo_box()
-                self.import_selected_slice(segmentation_sitk)
+                self.import_selected_slice(segmentation_geometry)
                 # self.go_to_selected_oriented_landmark_push_button.setChecked(False)
                 # self.reset_oriented_landmark_data()
                 # self.reset_oriented_landmark_combo_box()
@@ -1918,12 +1903,13 @@ class ManualSegmentationWidget(QWidget):
 
         """
         self.remove_image_layer()
-        # self.viewer.add_image(array, name='image', contrast_limits=(np.min(array), np.max(array)))
         if array.shape[0] == 1:
-            self.viewer.add_image(array[0, :, :], name='image')
-        else:
-            self.viewer.add_image(array, name='image')
-        self.viewer.layers['image'].contrast_limits = (np.min(array), np.max(array))
+            array = array[0, :, :]
+
+        # contrast and slider range estimated from a sample of the voxels (napari and np.min/np.max would read the whole volume)
+        contrast_limits, contrast_limits_range = estimate_contrast_limits(array, cache_key=self.image_source_key)
+        self.viewer.add_image(array, name='image', contrast_limits=contrast_limits_range)
+        self.viewer.layers['image'].contrast_limits = contrast_limits
 
         # === Enable axes view ===
         self.viewer.dims.axis_labels = ('z', 'y', 'x') # same than ('0', '1', '2')
@@ -1945,7 +1931,7 @@ class ManualSegmentationWidget(QWidget):
         # self.viewer.window._qt_viewer.viewerButtons.transposeDimsButton.clicked.connect(self.overwrite_transpose_dim)
         # self.rotation_applied = 0
 
-    def set_segmentation_layer(self, array):
+    def set_segmentation_layer(self, array, base_file_path=None):
         """
         Remove the segmentation layer from Napari and add a new segmentation layer (faster than changing the data of an existing layer)
         New layer can be empty for initialisation.
@@ -1954,16 +1940,120 @@ class ManualSegmentationWidget(QWidget):
         ----------
         array : ndarray
             3D segmentation data with the same size than the raw image (display in the 'image' layer)
+        base_file_path : str
+            path of the segmentation file the data comes from (None for a new segmentation), used by the edit journal
 
         """
+        self.stop_segmentation_journal(isDeleted=True)
         self.remove_segmentation_layer()
         self.viewer.add_labels(array, name='annotations', color=label_colors)
         self.reset_annotation_layer_selected_label()
         disable_layer_widgets(self.viewer, layer_name='annotations', layer_type='label')
         self.remove_backup_segmentation_file()
 
+        # the edits are stored as sparse differences by the undo manager instead of the napari history
+        self.segmentation_undo_manager = UndoManager(array.shape)
+        connect_labels_edit_callback(self.viewer.layers['annotations'], self.on_segmentation_edited, isHistoryKept=False)
         self.viewer.layers['annotations'].mouse_double_click_callbacks.append(self.automatic_fill)
         self.viewer.layers['annotations'].bind_key('O', self.enable_opacity_annotation_layer)
+        self.viewer.layers['annotations'].bind_key('Control-Z', lambda layer: self.undo_segmentation(), overwrite=True)
+        self.viewer.layers['annotations'].bind_key('Control-Shift-Z', lambda layer: self.redo_segmentation(), overwrite=True)
+
+        # computed from the whole volume when first displayed, then updated from each edit
+        voxel_volume = self.image_geometry.voxel_volume if self.image_geometry is not None else 1.0
+        self.segmentation_statistics = LabelStatistics(voxel_volume)
+        # the volume column is hidden when the spacing of the image is unknown (it would only repeat the voxel count)
+        self.statistics_volume_unit = self.image_geometry.unit if self.image_geometry is not None else None
+
+        self.start_segmentation_journal(base_file_path)
+
+        if self.statistics_check_box.isChecked():
+            self.statistics_timer.start()
+
+    def start_segmentation_journal(self, base_file_path=None):
+        """
+        Start recording the edits of the annotations in a journal (for crash recovery).
+        If a journal of a previous session exists for the same segmentation, propose to replay it.
+
+        Parameters
+        ----------
+        base_file_path : str
+            path of the segmentation file the annotations come from (None for a new segmentation)
+
+        """
+        segmentation_layer = self.viewer.layers['annotations']
+        journal_file_path = self.get_journal_file_path()
+
+        header = {"shape": list(segmentation_layer.data.shape), "base_file": None}
+        if base_file_path is not None:
+            header["base_file"] = str(Path(base_file_path).resolve())
+
+        # the journal can only be replayed on the segmentation it was started from (current or archived journal)
+        records = None
+        old_journal_path, old_records = find_matching_journal(journal_file_path, header)
+        if old_journal_path is not None:
+            choice = display_yes_no_question_box(
+                "Warning",
+                f"Unsaved annotations from a previous session have been found ({len(old_records)} operations). Do you want to recover them ?",
+            )
+            if choice: #Yes
+                replay_journal(old_records, segmentation_layer.data)
+                segmentation_layer.refresh()
+                records = old_records
+            else:
+                isDeleted = display_yes_no_question_box(
+                    "Warning",
+                    f"Do you want to delete these unsaved annotations ? \n\n If not, they are kept in {old_journal_path.name} and proposed again when this segmentation is opened.",
+                )
+                if isDeleted:
+                    old_journal_path.unlink()
+
+        # a previous journal which is not replayed is kept under another name (e.g. its segmentation is not opened yet)
+        if journal_file_path.exists() and not ((records is not None) and (old_journal_path == journal_file_path)):
+            _, leftover_records = read_journal(journal_file_path)
+            if len(leftover_records) > 0:
+                archive_journal(journal_file_path)
+
+        self.segmentation_journal = EditJournal(journal_file_path, header, records)
+
+        # the replayed records are now in the new journal
+        if (records is not None) and (old_journal_path != journal_file_path):
+            old_journal_path.unlink()
+
+    def restart_segmentation_journal(self, base_file_path, nbr_saved_records):
+        """
+        Restart the journal from a saved segmentation: the edits already included in the saved file are removed, the
+        next ones are kept
+
+        Parameters
+        ----------
+        base_file_path : str
+            path of the saved segmentation
+        nbr_saved_records : int
+            number of records of the current journal included in the saved file
+
+        """
+        journal_file_path = Path(self.segmentation_journal.file_path)
+        header = dict(self.segmentation_journal.header, base_file=str(Path(base_file_path).resolve()))
+        header.pop("version", None)
+
+        self.stop_segmentation_journal()
+        _, records = read_journal(journal_file_path)
+        self.segmentation_journal = EditJournal(journal_file_path, header, records[nbr_saved_records:])
+
+    def stop_segmentation_journal(self, isDeleted=False):
+        """
+        Stop recording the edits of the annotations
+
+        Parameters
+        ----------
+        isDeleted : bool
+            if True, the journal file is deleted (e.g. the annotations are saved or replaced)
+
+        """
+        if self.segmentation_journal is not None:
+            self.segmentation_journal.close(isDeleted)
+            self.segmentation_journal = None
 
     def set_oriented_landmark_layers(self):
         """
@@ -1993,18 +2083,7 @@ class ManualSegmentationWidget(QWidget):
         # self.viewer.layers['landmarks'].events.mode.connect(self.update_add_oriented_landmark_push_button_check_status)
 
         # === Add orientations of the oriented landmarks as vectors in a vector layer ===
-        nbr_vectors = len(self.oriented_landmarks_orientations_array)
-        vectors = np.zeros((nbr_vectors, 2, 3), dtype=np.float32)
-        for i in range(nbr_vectors) :
-            # assign x-y-z projection
-            vectors[i, 1, 0] = self.oriented_landmarks_orientations_array[i][2]
-            vectors[i, 1, 1] = self.oriented_landmarks_orientations_array[i][1]
-            vectors[i, 1, 2] = self.oriented_landmarks_orientations_array[i][0]
-
-            # assign x-y-z position
-            vectors[i, 0, 0] = self.oriented_landmarks_positions_array[i][0]
-            vectors[i, 0, 1] = self.oriented_landmarks_positions_array[i][1]
-            vectors[i, 0, 2] = self.oriented_landmarks_positions_array[i][2]
+        vectors = create_orientation_vectors(self.oriented_landmarks_positions_array, self.oriented_landmarks_orientations_array)
 
         self.viewer.add_vectors(
             vectors,
@@ -2018,6 +2097,16 @@ class ManualSegmentationWidget(QWidget):
             ndim=3)
         disable_layer_widgets(self.viewer, layer_name='orientations', layer_type='vectors')
 
+        self.update_landmarks_display()
+
+    def update_orientations_layer(self):
+        """
+        Update the data of the vectors layer from the oriented landmarks arrays (the layers are not re-created)
+
+        """
+        if "orientations" in self.viewer.layers:
+            self.viewer.layers['orientations'].data = create_orientation_vectors(self.oriented_landmarks_positions_array, self.oriented_landmarks_orientations_array)
+
     def update_napari_layers_order(self):
         """
         Change the order of the napari layers 
@@ -2031,20 +2120,161 @@ class ManualSegmentationWidget(QWidget):
 # ============ Napari events callbacks ============
     def activate_backup_segmentation(self):
         """
-            Activate backup of the segmentation data when the image slice is changed.
+            Activate backup of the segmentation data: the slices modified since the last save are written in background,
+            once the annotation pauses (the complete volume is only written at activation).
 
         """
         if self.backup_check_box.isChecked() == True:
-            choice = display_ok_cancel_question_box(
-                "Warning",
-                "Automatically saving the segmentation data when the image slice is changed can slow down the display. Do you want to continue ?",
-            )
-            if choice: #Ok
-                self.viewer.dims.events.emitters['current_step'].connect(self.export_backup_segmentation)
-            else: #Cancel
+            if "annotations" in self.viewer.layers:
+                self.segmentation_autosave = SegmentationAutosave(
+                    segmentation_arr=self.viewer.layers['annotations'].data,
+                    file_path=self.get_backup_segmentation_file_path(),
+                )
+                self.segmentation_autosave.start()
+            else:
                 self.backup_check_box.setChecked(False)
         else:
-            self.viewer.dims.events.emitters['current_step'].disconnect(self.export_backup_segmentation)
+            if self.segmentation_autosave is not None:
+                self.segmentation_autosave.stop()
+                self.segmentation_autosave = None
+
+    def toggle_label_statistics(self):
+        """
+            Show or hide the label statistics table according to the checked status of the statistics_check_box
+
+        """
+        isChecked = self.statistics_check_box.isChecked()
+        self.statistics_label.setVisible(isChecked)
+
+        if isChecked:
+            self.update_label_statistics()
+        else:
+            self.statistics_timer.stop()
+
+    def update_label_statistics(self):
+        """
+            Display the voxel count, the volume and the bounding box of each label of the annotations.
+            The statistics are computed from the whole volume only once (in a worker), then updated from the edits (save_segmentation_edit).
+
+        """
+        if ("annotations" not in self.viewer.layers) or (self.segmentation_statistics is None):
+            self.statistics_label.setText("")
+            return
+
+        if not self.segmentation_statistics.isComputed:
+            if self.statistics_worker is None:
+                self.statistics_label.setText("Computing the label statistics...")
+                self.isStatisticsOutdated = False
+                self.statistics_worker = create_worker(compute_label_statistics, self.viewer.layers['annotations'].data, self.segmentation_statistics.voxel_volume)
+                self.statistics_worker.returned.connect(functools.partial(self.on_label_statistics_computed, self.segmentation_statistics))
+                self.statistics_worker.errored.connect(self.on_label_statistics_error)
+                self.statistics_worker.start()
+            return
+
+        statistics = self.segmentation_statistics.get_statistics(self.viewer.layers['annotations'].data)
+        if len(statistics) == 0:
+            self.statistics_label.setText("No annotation")
+            return
+
+        protocol = self.protocol_registry.get(self.annotation_combo_box.currentText())
+        volume_header = f"<th>Volume ({self.statistics_volume_unit}³)</th>" if self.statistics_volume_unit is not None else ""
+        rows = [f"<tr><th>Label</th><th>Structure</th><th>Voxels</th>{volume_header}<th>Bounding box (z, y, x)</th></tr>"]
+        for label_statistics in statistics:
+            label = label_statistics["label"]
+            structure_name = protocol.get_structure_name(label) if protocol is not None else None
+            bbox_min, bbox_max = label_statistics["bounding_box"]
+            volume_cell = f"<td>{label_statistics['volume']:.1f}</td>" if self.statistics_volume_unit is not None else ""
+            rows.append(
+                f"<tr><td>{label}</td><td>{structure_name or ''}</td><td>{label_statistics['voxel_count']}</td>"
+                f"{volume_cell}<td>{bbox_min} - {bbox_max}</td></tr>"
+            )
+
+        self.statistics_label.setText("<table cellspacing='4'>" + "".join(rows) + "</table>")
+
+    def on_label_statistics_computed(self, previous_statistics, statistics):
+        """
+            Display the statistics computed from the whole volume. They are computed again if the annotations were edited
+            or replaced during the computation (the edits are not counted by statistics which are not computed yet).
+
+        Parameters
+        ----------
+        previous_statistics : LabelStatistics
+            statistics of the annotations when the computation started
+        statistics : LabelStatistics
+            computed statistics
+
+        """
+        self.statistics_worker = None
+
+        if (previous_statistics is self.segmentation_statistics) and (not self.isStatisticsOutdated):
+            self.segmentation_statistics = statistics
+
+        if self.statistics_check_box.isChecked() and (self.segmentation_statistics is not None):
+            if self.segmentation_statistics.isComputed:
+                self.update_label_statistics()
+            else:
+                self.statistics_timer.start()
+
+    def on_label_statistics_error(self, error):
+        """
+            Display the error raised while computing the label statistics
+
+        Parameters
+        ----------
+        error : Exception
+            error raised during the computation
+
+        """
+        self.statistics_worker = None
+        self.statistics_label.setText(f"Label statistics could not be computed: {error}")
+
+    def on_segmentation_edited(self, indices, old_values, new_values, isNewOperation):
+        """
+            Called each time the annotations are edited (paint, fill, erase, undo, redo)
+
+        Parameters
+        ----------
+        indices : tuple of arrays
+            multi-index of the edited voxels
+        old_values : ndarray
+            values before the edit
+        new_values : int or ndarray
+            values after the edit
+        isNewOperation : bool
+            True for the first edit of an operation (e.g. the first dab of a brush stroke)
+
+        """
+        if self.segmentation_undo_manager is not None:
+            self.segmentation_undo_manager.record(indices, old_values, new_values, isNewOperation)
+
+        self.save_segmentation_edit(indices, old_values, new_values)
+
+    def save_segmentation_edit(self, indices, old_values, new_values):
+        """
+            Record an edit of the annotations in the journal, mark the edited slices for the backup and update the label statistics
+
+        Parameters
+        ----------
+        indices : tuple of arrays
+            multi-index of the edited voxels
+        old_values : ndarray
+            values before the edit
+        new_values : int or ndarray
+            values after the edit
+
+        """
+        if self.segmentation_journal is not None:
+            self.segmentation_journal.record(indices, old_values, new_values)
+
+        if self.segmentation_autosave is not None:
+            self.segmentation_autosave.mark_dirty(get_edited_slice_indexes(indices))
+
+        if self.segmentation_statistics is not None:
+            if not self.segmentation_statistics.isComputed:
+                self.isStatisticsOutdated = True
+            self.segmentation_statistics.update(indices, old_values, new_values)
+            if self.statistics_check_box.isChecked():
+                self.statistics_timer.start()
 
     def automatic_fill(self, layer, event):
         """
@@ -2126,23 +2356,46 @@ class ManualSegmentationWidget(QWidget):
         """
         current_axis_index = self.viewer.dims.not_displayed[0]
         selected_slice = self.viewer.dims.current_step[current_axis_index]
-        axis_order = ['z', 'y', 'x']
 
-        # if len(self.selected_slice_list) >= 30:
+        # if len(self.selected_slices) >= 30:
         #     display_warning_box(self, "Error", "More than 30 selected slices are not allowed. Please remove some selected slices to add new ones.")
         #     return
-        selected_info = str(str(selected_slice) + axis_order[current_axis_index] )
-        if selected_info in self.selected_slice_list:
+        list_index = self.selected_slices.add(current_axis_index, selected_slice)
+        if list_index is None:
             return
 
         else:
-            self.selected_slice_list.append(selected_info)
-            self.selected_slice_list.sort(key=lambda text: int(text[:-1]))
-
-            list_index = self.selected_slice_list.index(selected_info)
+            selected_info = format_selected_slice(current_axis_index, selected_slice)
             self.selected_slice_combo_box.insertItem(list_index + 1, selected_info)
             self.selected_slice_combo_box.setCurrentText(selected_info)
 
+    def go_to_adjacent_selected_slice(self, isNext):
+        """
+        Go to the next (or previous) selected slice along the displayed axe, and select it in the selected_slice_combo_box
+
+        Parameters
+        ----------
+        isNext : bool
+            if True go to the next selected slice, if False go to the previous one
+
+        """
+        if len(self.viewer.dims.not_displayed) == 0:
+            return
+
+        current_axis_index = self.viewer.dims.not_displayed[0]
+        current_slice = self.viewer.dims.current_step[current_axis_index]
+
+        if isNext:
+            selected_slice = self.selected_slices.get_next_slice(current_axis_index, current_slice)
+        else:
+            selected_slice = self.selected_slices.get_previous_slice(current_axis_index, current_slice)
+
+        if selected_slice is None:
+            return
+
+        self.go_to_selected_slice_push_button.setChecked(True)
+        self.selected_slice_combo_box.setCurrentText(format_selected_slice(current_axis_index, selected_slice))
+
     def go_left_step_slices(self):
         """
         Change the currently displayed slice according to the slice index selected in the step_range_spin_box
@@ -2184,13 +2437,10 @@ class ManualSegmentationWidget(QWidget):
         Change the currently displayed slice according to the slice index selected in the selected_slice_combo_box
 
         """
-        axis_order = ['z', 'y', 'x']
-
         if self.go_to_selected_slice_push_button.isChecked() == True:
             if self.selected_slice_combo_box.currentText() != " ":
                 current_axis_index = self.viewer.dims.not_displayed[0]
-                selected_slice = int(self.selected_slice_combo_box.currentText()[:-1])
-                selected_axis_index =  axis_order.index(self.selected_slice_combo_box.currentText()[-1])
+                selected_axis_index, selected_slice = parse_selected_slice(self.selected_slice_combo_box.currentText())
                 if current_axis_index == selected_axis_index:
                     new_current_step_list = list(self.viewer.dims.current_step)
                     new_current_step_list[selected_axis_index] = selected_slice
@@ -2203,8 +2453,7 @@ class ManualSegmentationWidget(QWidget):
         else:
             if self.selected_slice_combo_box.currentText() != " ":
                 current_axis_index = self.viewer.dims.not_displayed[0]
-                selected_slice = int(self.selected_slice_combo_box.currentText()[:-1])
-                selected_axis_index = axis_order.index(self.selected_slice_combo_box.currentText()[-1])
+                selected_axis_index, selected_slice = parse_selected_slice(self.selected_slice_combo_box.currentText())
                 current_slice = self.viewer.dims.current_step[current_axis_index]
                 if current_slice != selected_slice and current_axis_index == selected_axis_index:
                     new_current_step_list = list(self.viewer.dims.current_step)
@@ -2246,6 +2495,24 @@ class ManualSegmentationWidget(QWidget):
                 else:
                     self.go_to_selected_oriented_landmark_push_button.setChecked(True)
 
+    def go_to_nearest_oriented_landmark(self):
+        """
+        Select the landmark nearest to the mouse cursor in the selected_oriented_landmark_combo_box and go to its position
+
+        """
+        if len(self.oriented_landmarks_index) == 0:
+            return
+
+        cursor_position = np.asarray(self.viewer.cursor.position)[-3:]
+        nearest_index = self.oriented_landmarks_index.nearest(cursor_position)
+
+        self.go_to_selected_oriented_landmark_push_button.setChecked(True)
+        new_text = str(nearest_index + 1)
+        if self.selected_oriented_landmark_combo_box.currentText() != new_text:
+            self.selected_oriented_landmark_combo_box.setCurrentText(new_text)
+        else:
+            self.go_to_oriented_landmark()
+
     def lock_slide(self):
         """
         Lock a slice of work. Clicking on the checked QPushButton put the viewer to the locked slice location.
@@ -2274,20 +2541,17 @@ class ManualSegmentationWidget(QWidget):
         Remove the current slice index displayed in the selected_slice_combo_box and set the combo box to the default value " "
 
         """
-        if len(self.selected_slice_list) == 0:
+        if len(self.selected_slices) == 0:
             return
 
-        axis_order = ['z', 'y', 'x']
         current_axis_index = self.viewer.dims.not_displayed[0]
-
         current_slice = self.viewer.dims.current_step[current_axis_index]
-        current_info = str(str(current_slice) + axis_order[current_axis_index] )
 
-        if current_info in self.selected_slice_list:
-            list_index = self.selected_slice_list.index(current_info)
+        list_index = self.selected_slices.find(current_axis_index, current_slice)
+        if list_index is not None:
             self.selected_slice_combo_box.setCurrentText(" ")
             self.selected_slice_combo_box.removeItem(list_index + 1)
-            self.selected_slice_list.remove(current_info)
+            self.selected_slices.remove(current_axis_index, current_slice)
 
     def remove_oriented_landmark(self, isRemoveLast=False):
         """
@@ -2329,7 +2593,7 @@ class ManualSegmentationWidget(QWidget):
         if canRemoveSegmentation:
             if "image" in self.viewer.layers:
                 image_arr = self.viewer.layers['image'].data
-                segmentation_arr = np.zeros(image_arr.shape, dtype=np.int8)
+                segmentation_arr = create_label_volume(image_arr.shape)
                 self.set_segmentation_layer(segmentation_arr)
                 self.update_napari_layers_order()
         else:
@@ -2379,9 +2643,169 @@ class ManualSegmentationWidget(QWidget):
 
         """
         if hasattr(self.viewer, 'layers'):
-            if 'annotations' in self.viewer.layers:
+            if ('annotations' in self.viewer.layers) and (self.segmentation_undo_manager is not None):
+                segmentation_layer = self.viewer.layers['annotations']
+                edit = self.segmentation_undo_manager.undo(segmentation_layer.data)
+                if edit is not None:
+                    segmentation_layer.refresh()
+                    self.save_segmentation_edit(*edit)
+
+    def redo_segmentation(self):
+        """
+            Redo last undone operation of annotation
+
+        """
+        if hasattr(self.viewer, 'layers'):
+            if ('annotations' in self.viewer.layers) and (self.segmentation_undo_manager is not None):
                 segmentation_layer = self.viewer.layers['annotations']
-                segmentation_layer.undo()
+                edit = self.segmentation_undo_manager.redo(segmentation_layer.data)
+                if edit is not None:
+                    segmentation_layer.refresh()
+                    self.save_segmentation_edit(*edit)
+
+    def propagate_annotations(self, isForward):
+        """
+            Propagate the labels of the current slice to the next (or previous) slices of the displayed axis, in background.
+            The number of slices is given by the propagation_range_spin_box.
+
+        Parameters
+        ----------
+        isForward : bool
+            if True, propagate to the next slices, else to the previous slices
+
+        """
+        if ("image" not in self.viewer.layers) or ("annotations" not in self.viewer.layers):
+            return
+
+        if self.label_tool_worker is not None:
+            display_warning_box(self, "Error", "A propagation or an interpolation is already running.")
+            return
+
+        segmentation_arr = self.viewer.layers['annotations'].data
+        if (segmentation_arr.ndim != 3) or (self.viewer.layers['image'].data.ndim != 3):
+            display_warning_box(self, "Error", "Incorrect file size. Need to be a 3D image to propagate the labels.")
+            return
+
+        current_axis_index = self.viewer.dims.not_displayed[0]
+        current_slice = self.viewer.dims.current_step[current_axis_index]
+        step = 1 if isForward else -1
+        slice_indexes = [
+            current_slice + step * i for i in range(1, self.propagation_range_spin_box.value() + 1)
+            if 0 <= current_slice + step * i < segmentation_arr.shape[current_axis_index]
+        ]
+
+        if len(slice_indexes) == 0:
+            return
+
+        self.status_label.setText("Propagating...")
+        self.label_tool_worker = create_worker(
+            propagate_labels,
+            self.viewer.layers['image'].data,
+            segmentation_arr,
+            current_axis_index,
+            current_slice,
+            slice_indexes,
+        )
+        self.label_tool_worker.yielded.connect(self.update_propagation_progress)
+        self.label_tool_worker.returned.connect(functools.partial(self.on_label_tool_done, segmentation_arr))
+        self.label_tool_worker.errored.connect(self.on_label_tool_error)
+        self.label_tool_worker.start()
+
+    def update_propagation_progress(self, progress):
+        """
+        Display the progress of the propagation in the status label
+
+        Parameters
+        ----------
+        progress : tuple(int, int)
+            number of propagated slices and total number of slices
+
+        """
+        nbr_propagated, nbr_slices = progress
+        self.status_label.setText(f"Propagating... ({nbr_propagated}/{nbr_slices} slices)")
+
+    def interpolate_annotations(self):
+        """
+            Interpolate each label between the slices where it is annotated along the displayed axis, in background
+
+        """
+        if "annotations" not in self.viewer.layers:
+            return
+
+        if self.label_tool_worker is not None:
+            display_warning_box(self, "Error", "A propagation or an interpolation is already running.")
+            return
+
+        segmentation_arr = self.viewer.layers['annotations'].data
+        if segmentation_arr.ndim != 3:
+            display_warning_box(self, "Error", "Incorrect file size. Need to be a 3D image to interpolate the labels.")
+            return
+
+        self.status_label.setText("Interpolating...")
+        self.label_tool_worker = create_worker(interpolate_labels, segmentation_arr, self.viewer.dims.not_displayed[0])
+        self.label_tool_worker.yielded.connect(self.update_interpolation_progress)
+        self.label_tool_worker.returned.connect(functools.partial(self.on_label_tool_done, segmentation_arr))
+        self.label_tool_worker.errored.connect(self.on_label_tool_error)
+        self.label_tool_worker.start()
+
+    def update_interpolation_progress(self, progress):
+        """
+        Display the progress of the interpolation in the status label
+
+        Parameters
+        ----------
+        progress : tuple(int, int)
+            number of interpolated labels and total number of labels
+
+        """
+        nbr_interpolated, nbr_labels = progress
+        self.status_label.setText(f"Interpolating... ({nbr_interpolated}/{nbr_labels} labels)")
+
+    def on_label_tool_done(self, segmentation_arr, edit):
+        """
+        Write the labels computed by the propagation or the interpolation in the annotations as a single operation (can be undone).
+        Voxels annotated during the computation are kept.
+
+        Parameters
+        ----------
+        segmentation_arr : ndarray
+            annotations the labels were computed from (ignored if the annotations have been replaced since)
+        edit : tuple
+            (indices, new_values) of the voxels labelled by the tool
+
+        """
+        self.label_tool_worker = None
+        self.status_label.setText("Ready")
+
+        if ("annotations" not in self.viewer.layers) or (self.viewer.layers['annotations'].data is not segmentation_arr):
+            return
+
+        indices, new_values = edit
+        old_values = segmentation_arr[indices]
+        isUnlabelled = old_values == 0
+        indices = tuple(index[isUnlabelled] for index in indices)
+        new_values = new_values[isUnlabelled]
+
+        if len(new_values) == 0:
+            return
+
+        segmentation_arr[indices] = new_values
+        self.viewer.layers['annotations'].refresh()
+        self.on_segmentation_edited(indices, old_values[isUnlabelled], new_values, True)
+
+    def on_label_tool_error(self, error):
+        """
+        Display the error raised during the propagation or the interpolation
+
+        Parameters
+        ----------
+        error : Exception
+            error raised while computing the labels
+
+        """
+        self.label_tool_worker = None
+        display_warning_box(self, "Error", f"Annotation tool failed: {error}")
+        self.status_label.setText("Ready")
 
     def update_landmarks_layer_mode(self):
         """
@@ -2407,9 +2831,7 @@ class ManualSegmentationWidget(QWidget):
                 self.viewer.layers.selection.active = self.viewer.layers["landmarks"]
 
             else:
-                self.oriented_landmarks_positions_array = []
-                self.oriented_landmarks_orientations_array = []
-                self.oriented_landmarks_quaternions_array = []
+                self.reset_oriented_landmark_data()
                 self.set_oriented_landmark_layers()
                 self.update_selected_oriented_landmark_combo_box()
                 self.update_landmarks_layer_mode()
@@ -2428,37 +2850,9 @@ class ManualSegmentationWidget(QWidget):
         Reset selected radio button (i.e. the element to annotate) to the first item of the list.
 
         """
-        structure_name = self.annotation_combo_box.currentText()
-        if structure_name == "Fetus":
-            radio_button_to_check = self.fetus.group_radio_button.button(1)
-            radio_button_to_check.setChecked(True)
-
-        elif structure_name == "Shoulder":
-            radio_button_to_check = self.shoulder.group_radio_button.button(1)
-            radio_button_to_check.setChecked(True)
-
-        elif structure_name == "Shoulder Bones":
-            radio_button_to_check = self.shoulder_bones.group_radio_button.button(1)
-            radio_button_to_check.setChecked(True)
-
-        elif structure_name == "Shoulder Bone Borders":
-            radio_button_to_check = self.shoulder_bone_borders.group_radio_button.button(1)
-            radio_button_to_check.setChecked(True)
-
-        elif structure_name == "Shoulder Deltoid":
-            radio_button_to_check = self.shoulder_deltoid.group_radio_button.button(1)
-            radio_button_to_check.setChecked(True)
-
-        elif structure_name == "Feta Challenge":
-            radio_button_to_check = self.feta.group_radio_button.button(1)
-            radio_button_to_check.setChecked(True)
-
-        elif structure_name == "Larva":
-            radio_button_to_check = self.larva.group_radio_button.button(1)
-            radio_button_to_check.setChecked(True)
-
-        elif structure_name == "Mouse Embryon":
-            radio_button_to_check = self.mouse_embryon.group_radio_button.button(1)
+        sub_panel = self.structure_sub_panels.get(self.annotation_combo_box.currentText())
+        if sub_panel is not None:
+            radio_button_to_check = sub_panel.group_radio_button.button(1)
             radio_button_to_check.setChecked(True)
 
     def reset_annotation_layer_selected_label(self):
@@ -2521,23 +2915,23 @@ class ManualSegmentationWidget(QWidget):
         Reset the oriented landmarks arrays to empty
 
         """
-        self.oriented_landmarks_positions_array = []
-        self.oriented_landmarks_orientations_array = []
-        self.oriented_landmarks_quaternions_array = []
+        self.oriented_landmarks_positions_array = np.zeros((0, 3), dtype=np.int16)
+        self.oriented_landmarks_orientations_array = np.zeros((0, 3))
+        self.oriented_landmarks_quaternions_array = np.zeros((0, 4))
+        self.oriented_landmarks_index = LandmarkIndex()
 
     def reset_selected_slice_combo_box(self):
         """
         Reset the selected slice list to empty, set the combo box to the default value " " and remove all other item of the combo box
 
         """
-        self.selected_slice_list = []
+        self.selected_slices.clear()
 
         if self.selected_slice_combo_box.currentText() != " ":
             self.selected_slice_combo_box.setCurrentText(" ")
 
-        while self.selected_slice_combo_box.count() != 1:
-            index = self.selected_slice_combo_box.count() - 1
-            self.selected_slice_combo_box.removeItem(index)
+        # all the items are removed at once
+        self.selected_slice_combo_box.model().removeRows(1, self.selected_slice_combo_box.count() - 1)
 
     def reset_zoom_slider(self):
         """
@@ -2578,14 +2972,38 @@ class ManualSegmentationWidget(QWidget):
 # ============ Reset data ============
     def remove_backup_segmentation_file(self):
         """
-        Delete the backup segmentation file
+        Stop the automatic backup and delete the backup segmentation file
 
         """
-        temp_segmentation_data_file_path = Path(self.image_dir).joinpath("TEMP_" + self.file_name_label.text() + "_segmentation.tif")
+        self.backup_check_box.setChecked(False)
+
+        temp_segmentation_data_file_path = self.get_backup_segmentation_file_path()
         if temp_segmentation_data_file_path.exists():
             temp_segmentation_data_file_path.unlink()
 
-        self.backup_check_box.setChecked(False)
+    def get_backup_segmentation_file_path(self):
+        """
+        Get the path of the backup segmentation file
+
+        Returns
+        ----------
+        temp_segmentation_data_file_path : Pathlib.Path
+            path of the backup file, in the image folder
+
+        """
+        return Path(self.image_dir).joinpath("TEMP_" + self.file_name_label.text() + "_segmentation.tif")
+
+    def get_journal_file_path(self):
+        """
+        Get the path of the journal of the annotation edits
+
+        Returns
+        ----------
+        journal_file_path : Pathlib.Path
+            path of the journal file, in the image folder
+
+        """
+        return Path(self.image_dir).joinpath("TEMP_" + self.file_name_label.text() + "_segmentation_journal.bin")
 
 
 # ============ Display warning/question message box ============
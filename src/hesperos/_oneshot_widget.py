@@ -12,7 +12,8 @@ from hesperos.layout.gui_elements import (
     display_warning_box,
     display_save_message_box,
     display_ok_cancel_question_box,
-    display_yes_no_question_box
+    display_yes_no_question_box,
+    display_item_choice_box
 )
 from hesperos.layout.napari_elements import disable_napari_buttons, disable_layer_widgets, reset_dock_widget, disable_dock_widget_buttons
 from hesperos.resources._icons import get_icon_path, get_relative_icon_path
@@ -20,9 +21,17 @@ from hesperos.resources._icons import get_icon_path, get_relative_icon_path
 import hesperos.annotation.oneshot as oneshot_data
 from hesperos.annotation.structuresubpanel import StructureSubPanel
 
-# === One Shot learning computation
+from hesperos.image_io.geometry import get_array_view
+from hesperos.image_io.readers import read_dicom_series_lazy, read_nifti_lazy, read_tiff_lazy
+from hesperos.image_io.dicom_index import find_dicom_series, get_dicom_series_name
+from hesperos.image_io.contrast import estimate_contrast_limits, get_source_key
+from hesperos.image_io.export import write_image
+from hesperos.label_tools.edit_hook import connect_labels_edit_callback
+from hesperos.label_tools.undo import UndoManager
+from hesperos.label_tools.label_volume import as_label_volume, create_label_volume
+
+# === One Shot learning computation (the pipeline, which imports scikit-learn, is imported when a segmentation is run)
 from hesperos.one_shot_learning.features3d import Features3D
-from hesperos.one_shot_learning.utilities import run_one_shot_learning
 
 
 # ============ Import python packages ============
@@ -30,9 +39,8 @@ import os
 import json
 import napari
 import numpy as np
-import tifffile as tif
-import SimpleITK as sitk
 from pathlib import Path
+from napari.qt.threading import create_worker
 
 from qtpy import QtCore
 from qtpy.QtGui import QIcon
@@ -79,6 +87,10 @@ class OneShotWidget(QWidget):
 
         napari.features_3d = Features3D()
 
+        self.segmentation_pipeline = None
+        self.segmentation_worker = None
+        self.segmentation_undo_manager = None
+
         self.generate_main_layout()
 
         napari.DOCK_WIDGETS.append(self)
@@ -227,6 +239,8 @@ class OneShotWidget(QWidget):
         )        
         self.custom_contrast_limits = None
         self.hu_limits = []
+        self.image_geometry = None
+        self.image_source_key = None # files of the image, key of the contrast estimation cache
 
         self.import_custom_contrast_push_button = add_icon_push_button(
             icon=QIcon(get_icon_path('import')),
@@ -309,19 +323,29 @@ class OneShotWidget(QWidget):
         )
 
         # Annotations tools are created in another layout 
-        # self.tool_annotation_layout = QHBoxLayout()
+        self.tool_annotation_layout = QHBoxLayout()
 
         self.undo_push_button = add_icon_push_button(
             icon=QIcon(get_icon_path('undo')),
-            layout=self.annotation_layout,
+            layout=self.tool_annotation_layout,
             callback_function=self.undo_segmentation,
             row=0,
             column=0,
-            minimum_width=COLUMN_WIDTH,
-            tooltip_text="Undo the last painting action",
+            tooltip_text="Undo the last painting action (Ctrl+Z)",
+            isHBoxLayout=True,
+        )
+
+        self.redo_push_button = add_icon_push_button(
+            icon=QIcon(get_icon_path('redo')),
+            layout=self.tool_annotation_layout,
+            callback_function=self.redo_segmentation,
+            row=0,
+            column=1,
+            tooltip_text="Redo the last undone painting action (Ctrl+Shift+Z)",
+            isHBoxLayout=True,
         )
 
-        # self.annotation_layout.addLayout(self.tool_annotation_layout, 2, 0, 1, 2)
+        self.annotation_layout.addLayout(self.tool_annotation_layout, 0, 0)
         self.annotation_panel.setLayout(self.annotation_layout)
 
         # === Add panel to the main layout ===
@@ -359,7 +383,7 @@ class OneShotWidget(QWidget):
             column=0,
             column_span=2,
             minimum_width=COLUMN_WIDTH,
-            tooltip_text="Launch the training and inference of a classifier",
+            tooltip_text="Launch the training and inference of a classifier (click again to cancel)",
         )
 
         self.threshold_label = add_label(
@@ -462,6 +486,7 @@ class OneShotWidget(QWidget):
                 self.annotation_panel.setVisible(isVisible)
                 self.import_segmentation_push_button.setVisible(isVisible)
                 self.undo_push_button.setVisible(isVisible)
+                self.redo_push_button.setVisible(isVisible)
             
             elif panel_name == "segmentation_panel":
                 self.segmentation_panel.setVisible(isVisible)
@@ -531,34 +556,41 @@ class OneShotWidget(QWidget):
             3D image as a 3D array. None if importation failed.
 
         """
-        dicom_path = QFileDialog.getExistingDirectory(self, 'Choose a DICOM serie directory')
+        dicom_path = QFileDialog.getExistingDirectory(self, 'Choose a DICOM serie (or study) directory')
 
         if dicom_path == "":
             return None
 
-        if (Path(dicom_path).name == 'Raw') or (Path(dicom_path).name == 'ST0'):
-            self.image_dir = Path(dicom_path).parents[1]
-            file_name = Path(dicom_path).parents[0].name
+        # header-only index of the folder tree (cached in the folder), the user picks a series if several are found
+        list_series = find_dicom_series(dicom_path)
+        if len(list_series) == 0:
+            display_warning_box(self, "Error", "NO DICOM data in the folder.")
+            return None
+        elif len(list_series) == 1:
+            series = list_series[0]
         else:
-            self.image_dir = Path(dicom_path).parents[0]
-            file_name = Path(dicom_path).name
-
-        reader = sitk.ImageSeriesReader()
+            list_names = [get_dicom_series_name(series, dicom_path) for series in list_series]
+            series_index = display_item_choice_box(self, "Choose a DICOM serie", "Several DICOM series found in the folder:", list_names)
+            if series_index is None:
+                return None
+            series = list_series[series_index]
 
-        series_found = reader.GetGDCMSeriesIDs(dicom_path)
-        if len(series_found) > 1:
-            display_warning_box(self, "Error", "More than one DICOM serie in the folder. Select a folder containing a single DICOM serie.")
-            return None
+        series_path = series["folder"]
+        if (Path(series_path).name == 'Raw') or (Path(series_path).name == 'ST0'):
+            self.image_dir = Path(series_path).parents[1]
+            file_name = Path(series_path).parents[0].name
+        else:
+            self.image_dir = Path(series_path).parents[0]
+            file_name = Path(series_path).name
 
-        img_names = reader.GetGDCMSeriesFileNames(dicom_path)
-        reader.SetFileNames(img_names)
         try:
-            self.image_sitk = reader.Execute()
+            # slices are read on demand (and prefetched) instead of decoding the whole series before display
+            image_arr, self.image_geometry = read_dicom_series_lazy(series["file_names"], isSorted=True) # z, y, x (files sorted by the folder index)
+            self.image_source_key = get_source_key(series["file_names"])
         except:
             display_warning_box(self, "Error", "NO DICOM data in the folder.")
             return None
 
-        image_arr = sitk.GetArrayFromImage(self.image_sitk) # z, y, x
         #ITK's Image class does not have a bracket operator. It has a GetPixel which takes an ITK Index object as an argument, which is an array ordered as (x,y,z). This is the convention that SimpleITK's Image class uses for the GetPixel method as well.
         # While in numpy, an array is indexed in the opposite order (z,y,x).
 
@@ -588,22 +620,22 @@ class OneShotWidget(QWidget):
 
         extensions = Path(file_path).suffixes
         self.image_dir = Path(file_path).parents[0]
+        self.image_source_key = get_source_key(file_path)
 
+        # image data are read lazily (memory mapped or slice by slice on demand)
         if (extensions[-1] == ".tif") or (extensions[-1] == ".tiff"):
-            image_arr = tif.imread(file_path)
-            self.image_sitk = sitk.Image(image_arr.shape[2], image_arr.shape[1], image_arr.shape[0], sitk.sitkInt16)
+            image_arr, image_geometry = read_tiff_lazy(file_path)
+            self.image_geometry = image_geometry if len(image_arr.shape) == 3 else None
             self.file_name_label.setText(Path(file_path).stem)
 
         elif extensions[-1] == ".nii":
-            self.image_sitk = sitk.ReadImage(file_path)
-            image_arr = sitk.GetArrayFromImage(self.image_sitk)
+            image_arr, self.image_geometry = read_nifti_lazy(file_path)
             self.file_name_label.setText(Path(file_path).stem)
 
         elif extensions[-1] == ".gz":
             if len(extensions) >= 2:
                 if extensions[-2] == ".nii":               
-                    self.image_sitk = sitk.ReadImage(file_path)
-                    image_arr = sitk.GetArrayFromImage(self.image_sitk)
+                    image_arr, self.image_geometry = read_nifti_lazy(file_path)
                     self.file_name_label.setText(Path(Path(file_path).stem).stem)
                 else:
                     return None
@@ -645,27 +677,21 @@ class OneShotWidget(QWidget):
         extensions = Path(file_path).suffixes
 
         if (extensions[-1] == ".tif") or (extensions[-1] == ".tiff"):
+            import tifffile as tif
+
             segmentation_arr = tif.imread(file_path)
 
         elif extensions[-1] == ".nii" :
-            segmentation_sitk = sitk.ReadImage(file_path)
-            segmentation_arr = sitk.GetArrayFromImage(segmentation_sitk)
-            segmentation_arr = segmentation_arr.astype(np.uint8)
+            import SimpleITK as sitk
 
-            if any(n < 0 for n in np.unique(segmentation_arr)):
-                display_warning_box(self, "Error", "Incorrect NIFTI format : negative value")
-                return
+            segmentation_arr = get_array_view(sitk.ReadImage(file_path))
 
         elif extensions[-1] == ".gz":
             if len(extensions) >= 2:
-                if extensions[-2] == ".nii":                
-                    segmentation_sitk = sitk.ReadImage(file_path)
-                    segmentation_arr = sitk.GetArrayFromImage(segmentation_sitk)
-                    segmentation_arr = segmentation_arr.astype(np.uint8)
-
-                    if any(n < 0 for n in np.unique(segmentation_arr)):
-                        display_warning_box(self, "Error", "Incorrect NIFTI format : negative value")
-                        return
+                if extensions[-2] == ".nii":
+                    import SimpleITK as sitk
+
+                    segmentation_arr = get_array_view(sitk.ReadImage(file_path))
                 else:
                     return None
 
@@ -675,6 +701,17 @@ class OneShotWidget(QWidget):
         if len(segmentation_arr.shape) != 3:
             display_warning_box(self, "Error", "Incorrect file size. Need to be a 3D image")
             return None
+
+        # smallest unsigned type able to store the labels (no copy if the file already has it)
+        try:
+            segmentation_arr = as_label_volume(segmentation_arr)
+        except ValueError:
+            display_warning_box(self, "Error", "Incorrect segmentation format : negative value")
+            return None
+
+        # the annotations are edited: a read-only view of the file buffer is copied once
+        if not segmentation_arr.flags.writeable:
+            segmentation_arr = segmentation_arr.copy()
         
         return segmentation_arr
 
@@ -694,10 +731,11 @@ class OneShotWidget(QWidget):
         with open(file_path) as f:
             self.import_contrast = json.load(f)
         
-        if (np.max(self.import_contrast) <= self.viewer.layers['image'].contrast_limits_range[1]) and (np.min(self.import_contrast) >= self.viewer.layers['image'].contrast_limits_range[0]):
+        # napari extends the contrast slider if the imported limits are outside of its range
+        if (np.size(self.import_contrast) == 2) and np.all(np.isfinite(self.import_contrast)) and (self.import_contrast[0] < self.import_contrast[1]):
             self.custom_contrast_limits = self.import_contrast
-        else: 
-            display_warning_box(self, "Error", "The imported contrast limit is outside of the image contrast range.")
+        else:
+            display_warning_box(self, "Error", "The imported contrast limits are not a valid (min, max) pair.")
             return
 
         self.default_contrast_combo_box.setCurrentText("Custom Contrast")
@@ -738,9 +776,10 @@ class OneShotWidget(QWidget):
             self.toggle_import_panel_widget(True, file_type)
             self.toggle_panels(["annotation_panel", "segmentation_panel", "reset_export_panel"], True)
 
-            segmentation_arr = np.zeros(image_arr.shape, dtype=np.int8)
+            segmentation_arr = create_label_volume(image_arr.shape)
             self.set_segmentation_layer(segmentation_arr)
 
+            self.cancel_segmentation()
             self.remove_probabilities_layer()
             self.remove_segmented_probabilities_layer()
 
@@ -810,21 +849,18 @@ class OneShotWidget(QWidget):
             if "segmented probabilities" in self.viewer.layers:
                 self.status_label.setText("Saving...")
 
-                segmentation_arr = self.viewer.layers['segmented probabilities'].data
+                # the thresholded volume is only materialised for the export (display uses the contrast limits)
+                segmentation_arr = self.get_segmented_probabilities()
 
                 extensions = Path(file_path).suffixes
                 if len(extensions) == 1:
                     if (extensions[0] == ".tif") or (extensions[0] == ".tiff"): 
-                        tif.imsave(file_path, segmentation_arr)
+                        write_image(file_path, segmentation_arr)
                     elif extensions[0] == ".nii":
-                        result_image_sitk = sitk.GetImageFromArray(segmentation_arr.astype(np.uint16))
-                        result_image_sitk.CopyInformation(self.image_sitk)
-                        sitk.WriteImage(result_image_sitk, file_path)
+                        write_image(file_path, segmentation_arr, self.image_geometry)
                 elif len(extensions) == 2:
                     if (extensions[0] == ".nii") and (extensions[1] == ".gz"):
-                        result_image_sitk = sitk.GetImageFromArray(segmentation_arr.astype(np.uint16))
-                        result_image_sitk.CopyInformation(self.image_sitk)
-                        sitk.WriteImage(result_image_sitk, file_path)
+                        write_image(file_path, segmentation_arr, self.image_geometry)
 
                 self.status_label.setText("Ready")
 
@@ -856,19 +892,17 @@ class OneShotWidget(QWidget):
                 extensions = Path(file_path).suffixes
 
                 if (extensions[-1] == ".tif") or (extensions[-1] == ".tiff"): 
+                    import tifffile as tif
+
                     tif.imsave(file_path, proba_arr)
 
                 elif extensions[-1] == ".nii": 
-                    result_image_sitk = sitk.GetImageFromArray(proba_arr.astype(np.uint8))
-                    result_image_sitk.CopyInformation(self.image_sitk)
-                    sitk.WriteImage(result_image_sitk, file_path)
+                    write_image(file_path, proba_arr, self.image_geometry)
 
                 elif extensions[-1] == ".gz":
                     if len(extensions) >= 2:
                         if extensions[-2] == ".nii": 
-                            result_image_sitk = sitk.GetImageFromArray(proba_arr.astype(np.uint8))
-                            result_image_sitk.CopyInformation(self.image_sitk)
-                            sitk.WriteImage(result_image_sitk, file_path)
+                            write_image(file_path, proba_arr, self.image_geometry)
                 
                 self.status_label.setText("Ready")
 
@@ -902,9 +936,15 @@ class OneShotWidget(QWidget):
 # ============ Run One Shot Learning ============
     def run_segmentation(self):
         """
-            Run One shot learning : training and inference steps
+            Run One shot learning : training and inference steps.
+            Inference runs in a background thread and the probabilities are displayed slice chunk by slice chunk,
+            starting from the slice currently displayed. Clicking again during the run cancels it.
 
         """
+        if self.segmentation_worker is not None:
+            self.cancel_segmentation()
+            return
+
         self.status_label.setText("Computing...")
 
         if hasattr(self.viewer, 'layers'):
@@ -935,14 +975,90 @@ class OneShotWidget(QWidget):
         default_filepath = Path(self.image_dir).joinpath(self.file_name_label.text() + "_model_rfc.pckl")
         output_classifier_path, _ = QFileDialog.getSaveFileName(self, "Export Model File", str(default_filepath), files_types)
 
-        output_proba = run_one_shot_learning(image_arr, segmentation_arr, str(output_classifier_path))
+        if output_classifier_path == "":
+            self.status_label.setText("Ready")
+            return
 
+        # === Preallocated arrays, filled (and displayed) chunk by chunk ===
+        output_proba = np.zeros(image_arr.shape, dtype=np.uint8)
         self.set_probabilities_layer(output_proba)
 
         self.reset_threshold_slider()
-        output_threshold = np.where(output_proba > self.threshold_slider.value(), 255, 0)
-        self.set_segmented_probabilities_layer(output_threshold)
+        self.set_segmented_probabilities_layer(output_proba)
+
+        from hesperos.one_shot_learning.pipeline import OneShotPipeline
+        from hesperos.one_shot_learning.utilities import get_slice_order_from_center
+
+        # === Start from the slice on screen so the annotator can judge the result early ===
+        slice_order = get_slice_order_from_center(image_arr.shape[0], self.viewer.dims.current_step[0])
+
+        # annotations are copied: the annotator can keep editing during the run
+        self.segmentation_pipeline = OneShotPipeline(
+            source_img=image_arr,
+            label=np.copy(segmentation_arr),
+            features_3d=napari.features_3d,
+            output_classifier_path=str(output_classifier_path),
+            output_proba=output_proba,
+            slice_order=slice_order,
+        )
+        self.nbr_predicted_slices = 0
+
+        self.segmentation_worker = create_worker(self.segmentation_pipeline.run)
+        self.segmentation_worker.yielded.connect(self.update_probabilities_chunk)
+        self.segmentation_worker.errored.connect(self.on_segmentation_error)
+        self.segmentation_worker.finished.connect(self.on_segmentation_finished)
+
+        self.run_segmentation_push_button.setText("Cancel segmentation")
+        self.segmentation_worker.start()
+
+    def cancel_segmentation(self):
+        """
+            Cancel the running segmentation (slices already predicted are kept)
+
+        """
+        if self.segmentation_worker is not None:
+            self.status_label.setText("Cancelling...")
+            self.segmentation_pipeline.cancel()
+            self.segmentation_worker.quit()
+
+    def update_probabilities_chunk(self, slice_indexes):
+        """
+            Refresh the probabilities layers once the probabilities of a chunk of slices are written
+
+        Parameters
+        ----------
+        slice_indexes : list[int]
+            indexes of the slices just predicted
+
+        """
+        self.nbr_predicted_slices += len(slice_indexes)
+        self.status_label.setText(f"Computing... ({self.nbr_predicted_slices}/{self.segmentation_pipeline.output_proba.shape[0]} slices)")
+
+        # both layers share the probabilities array written by the pipeline
+        for layer_name in ['probabilities', 'segmented probabilities']:
+            if layer_name in self.viewer.layers:
+                self.viewer.layers[layer_name].refresh()
 
+    def on_segmentation_error(self, error):
+        """
+            Display the error raised during the segmentation
+
+        Parameters
+        ----------
+        error : Exception
+            error raised by the pipeline
+
+        """
+        display_warning_box(self, "Error", f"Segmentation failed: {error}")
+
+    def on_segmentation_finished(self):
+        """
+            Reset the segmentation state once the worker stops (finished, cancelled or failed)
+
+        """
+        self.segmentation_pipeline = None
+        self.segmentation_worker = None
+        self.run_segmentation_push_button.setText("Run segmentation")
         self.status_label.setText("Ready")
 
 
@@ -958,8 +1074,11 @@ class OneShotWidget(QWidget):
 
         """
         self.remove_image_layer()
-        self.viewer.add_image(array, name='image')
-        self.viewer.layers['image'].contrast_limits = (np.min(array), np.max(array))
+
+        # contrast and slider range estimated from a sample of the voxels (napari and np.min/np.max would read the whole volume)
+        contrast_limits, contrast_limits_range = estimate_contrast_limits(array, cache_key=self.image_source_key)
+        self.viewer.add_image(array, name='image', contrast_limits=contrast_limits_range)
+        self.viewer.layers['image'].contrast_limits = contrast_limits
         disable_layer_widgets(self.viewer, layer_name='image', layer_type='image')
         self.viewer.layers['image'].events.contrast_limits.connect(self.reset_default_contrast_combo_box)
 
@@ -978,6 +1097,12 @@ class OneShotWidget(QWidget):
         self.viewer.add_labels(array, name='annotations')
         self.reset_annotation_layer_selected_label()
         disable_layer_widgets(self.viewer, layer_name='annotations', layer_type='label')
+
+        # the edits are stored as sparse differences by the undo manager instead of the napari history
+        self.segmentation_undo_manager = UndoManager(array.shape)
+        connect_labels_edit_callback(self.viewer.layers['annotations'], self.segmentation_undo_manager.record, isHistoryKept=False)
+        self.viewer.layers['annotations'].bind_key('Control-Z', lambda layer: self.undo_segmentation(), overwrite=True)
+        self.viewer.layers['annotations'].bind_key('Control-Shift-Z', lambda layer: self.redo_segmentation(), overwrite=True)
     
     def set_probabilities_layer(self, array):
         """
@@ -998,11 +1123,12 @@ class OneShotWidget(QWidget):
     def set_segmented_probabilities_layer(self, array):
         """
         Remove the segmented probabilities layer from Napari and add a new segmented probabilities layer (faster than changing the data of an existing layer)
+        The layer displays the probabilities array itself: the threshold is applied at display time through the contrast limits.
 
         Parameters
         ----------
         array : ndarray
-            probabilities data (0-1)
+            probabilities data (uint8, 0-255), shared with the probabilities layer
 
         """
         if "segmented probabilities" in self.viewer.layers:
@@ -1011,6 +1137,28 @@ class OneShotWidget(QWidget):
             self.viewer.add_image(array, name='segmented probabilities', colormap="red", opacity=0.5)
             disable_layer_widgets(self.viewer, layer_name='segmented probabilities', layer_type='image')
 
+        self.set_probabilities_threshold()
+
+    def get_segmented_probabilities(self):
+        """
+        Materialise the thresholded probabilities (255 above the threshold, 0 elsewhere)
+
+        Returns
+        ----------
+        threshold_arr : ndarray
+            3D binary volume (uint8). None if there is no probabilities data.
+
+        """
+        if "segmented probabilities" not in self.viewer.layers:
+            return None
+
+        output_proba = self.viewer.layers["segmented probabilities"].data
+        # the boolean mask is reinterpreted as uint8 (0 or 1) instead of being copied
+        threshold_arr = np.greater(output_proba, self.threshold_slider.value()).view(np.uint8)
+        threshold_arr *= 255
+
+        return threshold_arr
+
 
 # ============ Apply widget value ============
     def set_custom_contrast(self):
@@ -1054,15 +1202,15 @@ class OneShotWidget(QWidget):
     def set_probabilities_threshold(self):
         """
         Update threshold value use to create the segmented probabilities.
+        The threshold is a display-time operation: with contrast limits (value, value + 1), probabilities <= value
+        are displayed as 0 and probabilities > value with the full colormap intensity. No volume is recomputed.
         
         """
         value = self.threshold_slider.value()
 
         if hasattr(self.viewer, 'layers'):
-            if 'probabilities' in self.viewer.layers:
-                output_proba = self.viewer.layers["probabilities"].data
-                threshold_arr = np.where(output_proba > value, 255, 0)
-                self.set_segmented_probabilities_layer(threshold_arr)
+            if 'segmented probabilities' in self.viewer.layers:
+                self.viewer.layers["segmented probabilities"].contrast_limits = (value, value + 1)
     
     def undo_segmentation(self):
         """
@@ -1070,9 +1218,21 @@ class OneShotWidget(QWidget):
 
         """
         if hasattr(self.viewer, 'layers'):
-            if 'annotations' in self.viewer.layers:
+            if ('annotations' in self.viewer.layers) and (self.segmentation_undo_manager is not None):
+                segmentation_layer = self.viewer.layers['annotations']
+                if self.segmentation_undo_manager.undo(segmentation_layer.data) is not None:
+                    segmentation_layer.refresh()
+
+    def redo_segmentation(self):
+        """
+            Redo last undone operation of annotation
+
+        """
+        if hasattr(self.viewer, 'layers'):
+            if ('annotations' in self.viewer.layers) and (self.segmentation_undo_manager is not None):
                 segmentation_layer = self.viewer.layers['annotations']
-                segmentation_layer.undo()
+                if self.segmentation_undo_manager.redo(segmentation_layer.data) is not None:
+                    segmentation_layer.refresh()
 
     def zoom(self):
         """
@@ -1169,7 +1329,7 @@ class OneShotWidget(QWidget):
         if canRemoveSegmentation:
             if "image" in self.viewer.layers:
                 image_arr = self.viewer.layers['image'].data 
-                segmentation_arr = np.zeros(image_arr.shape, dtype=np.int8)
+                segmentation_arr = create_label_volume(image_arr.shape)
                 self.set_segmentation_layer(segmentation_arr)
         else:
             return
@@ -0,0 +1,296 @@
+# ============ Import python packages ============
+import json
+import importlib
+from pathlib import Path
+
+
+# ============ Constants ============
+# protocols shipped with hesperos: name displayed in the widget and module of hesperos.annotation describing the structures
+BUILTIN_PROTOCOLS = [
+    ("Feta Challenge", "hesperos.annotation.feta"),
+    ("Fetus", "hesperos.annotation.fetus"),
+    ("Larva", "hesperos.annotation.larva"),
+    ("Mouse Embryon", "hesperos.annotation.mouse_embryon"),
+    ("Shoulder", "hesperos.annotation.shoulder"),
+    ("Shoulder Bones", "hesperos.annotation.shoulder_bones"),
+    ("Shoulder Bone Borders", "hesperos.annotation.shoulder_bone_border"),
+    ("Shoulder Deltoid", "hesperos.annotation.shoulder_deltoid"),
+]
+
+# folder of the protocols added by the user (one .json, .yaml or .yml file per protocol)
+USER_PROTOCOLS_DIR = Path.home().joinpath(".hesperos", "protocols")
+
+
+# ============ Define annotation protocol class ============
+class AnnotationProtocol:
+    """
+    A class used to describe the structures to annotate in a protocol: main groups, their structures and the
+    sub-structures of some structures (same format as the modules of hesperos.annotation).
+    Label ids follow the order of the radio buttons of the StructureSubPanel (first structure is 1).
+
+    """
+    def __init__(self, name, list_structures, dict_sub_structures, dict_sub_sub_structures=None):
+        """
+        Initilialisation
+
+        Parameters
+        ----------
+        name : str
+            name of the protocol displayed in the widget
+        list_structures : list[str]
+            list of the main groups of structures
+        dict_sub_structures : dict[str, list[str]]
+            structures of each main group
+        dict_sub_sub_structures : dict[str, list[str]]
+            sub-structures of some structures
+
+        """
+        self.name = name
+        self.list_structures = list(list_structures)
+        self.dict_sub_structures = dict(dict_sub_structures)
+        self.dict_sub_sub_structures = dict(dict_sub_sub_structures or {})
+
+        # label id -> structure name, computed once
+        self.structure_names = {}
+        for group in self.list_structures:
+            for structure in self.dict_sub_structures.get(group, []):
+                for structure_name in self.dict_sub_sub_structures.get(structure, [structure]):
+                    self.structure_names[len(self.structure_names) + 1] = structure_name
+
+    @property
+    def list_structure_name(self):
+        """
+        Names of the structures, the label id of list_structure_name[i] is i + 1
+
+        """
+        return list(self.structure_names.values())
+
+    def get_structure_name(self, label_id):
+        """
+        Name of the structure annotated with a label id
+
+        Parameters
+        ----------
+        label_id : int
+            label id in the annotations layer
+
+        Returns
+        ----------
+        structure_name : str
+            None if the label id is not used by the protocol
+
+        """
+        return self.structure_names.get(int(label_id))
+
+    @classmethod
+    def from_module(cls, name, module):
+        """
+        Create a protocol from a module of hesperos.annotation (LIST_STRUCTURES, DICT_SUB_STRUCTURES and optional DICT_SUB_SUB_STRUCTURES)
+
+        Parameters
+        ----------
+        name : str
+            name of the protocol
+        module : module or str
+            module (or its import path)
+
+        Returns
+        ----------
+        protocol : AnnotationProtocol
+
+        """
+        if isinstance(module, str):
+            module = importlib.import_module(module)
+
+        return cls(name, module.LIST_STRUCTURES, module.DICT_SUB_STRUCTURES, getattr(module, "DICT_SUB_SUB_STRUCTURES", None))
+
+    @classmethod
+    def from_dict(cls, data, default_name=""):
+        """
+        Create a protocol from a dictionary, e.g. {"name": "Knee", "structures": ["BONES"], "sub_structures": {"BONES": ["Femur", "Tibia"]}}
+
+        Parameters
+        ----------
+        data : dict
+            content of a protocol file ("sub_sub_structures" and "name" are optional)
+        default_name : str
+            name used if data has no "name"
+
+        Returns
+        ----------
+        protocol : AnnotationProtocol
+
+        Raises
+        ----------
+        ValueError
+            if the content does not describe a protocol
+
+        """
+        try:
+            name = str(data.get("name", default_name))
+            list_structures = data["structures"]
+            dict_sub_structures = data["sub_structures"]
+            dict_sub_sub_structures = data.get("sub_sub_structures", {})
+        except (AttributeError, KeyError) as error:
+            raise ValueError(f"Incorrect protocol format: {error}")
+
+        if not (isinstance(list_structures, list) and isinstance(dict_sub_structures, dict) and isinstance(dict_sub_sub_structures, dict)):
+            raise ValueError("Incorrect protocol format: need a list of structures and dictionaries of sub structures")
+
+        protocol = cls(name, list_structures, dict_sub_structures, dict_sub_sub_structures)
+        if (protocol.name == "") or (len(protocol.structure_names) == 0):
+            raise ValueError("Incorrect protocol format: need a name and at least one structure")
+
+        return protocol
+
+    @classmethod
+    def from_file(cls, file_path):
+        """
+        Read a protocol from a .json file (or a .yaml/.yml file if PyYAML is installed)
+
+        Parameters
+        ----------
+        file_path : str
+            path of the protocol file, its name is used if the file has no "name"
+
+        Returns
+        ----------
+        protocol : AnnotationProtocol
+
+        Raises
+        ----------
+        ValueError
+            if the file cannot be read or does not describe a protocol
+
+        """
+        file_path = Path(file_path)
+
+        try:
+            with open(file_path, 'r') as f:
+                if file_path.suffix == ".json":
+                    data = json.load(f)
+                else:
+                    import yaml
+                    data = yaml.safe_load(f)
+        except ImportError:
+            raise ValueError("PyYAML is needed to read YAML protocols")
+        except Exception as error:
+            raise ValueError(f"Cannot read the protocol: {error}")
+
+        return cls.from_dict(data, default_name=file_path.stem)
+
+
+# ============ Define protocol registry class ============
+class ProtocolRegistry:
+    """
+    A class used to list the annotation protocols by name (in the order of registration)
+
+    """
+    def __init__(self):
+        """
+        Initilialisation
+
+        """
+        self.protocols = {}
+
+    def __len__(self):
+        return len(self.protocols)
+
+    def __contains__(self, name):
+        return name in self.protocols
+
+    def get_names(self):
+        """
+        Names of the registered protocols
+
+        Returns
+        ----------
+        names : list[str]
+
+        """
+        return list(self.protocols.keys())
+
+    def get(self, name):
+        """
+        Protocol registered with a name
+
+        Parameters
+        ----------
+        name : str
+
+        Returns
+        ----------
+        protocol : AnnotationProtocol
+            None if no protocol has this name
+
+        """
+        return self.protocols.get(name)
+
+    def register(self, protocol):
+        """
+        Register a protocol (a protocol with the same name is replaced)
+
+        Parameters
+        ----------
+        protocol : AnnotationProtocol
+
+        """
+        self.protocols[protocol.name] = protocol
+
+    def load_user_protocols(self, folder=USER_PROTOCOLS_DIR):
+        """
+        Register the protocols of a folder (.json, .yaml and .yml files, in alphabetical order)
+
+        Parameters
+        ----------
+        folder : str
+            folder of the protocol files
+
+        Returns
+        ----------
+        errors : list[str]
+            message of each file which cannot be loaded
+
+        """
+        folder = Path(folder)
+        if not folder.is_dir():
+            return []
+
+        errors = []
+        for file_path in sorted(folder.iterdir()):
+            if file_path.suffix not in [".json", ".yaml", ".yml"]:
+                continue
+
+            try:
+                self.register(AnnotationProtocol.from_file(file_path))
+            except ValueError as error:
+                errors.append(f"{file_path.name}: {error}")
+
+        return errors
+
+
+def create_protocol_registry(user_folder=USER_PROTOCOLS_DIR):
+    """
+    Create the registry of the protocols shipped with hesperos and of the protocols added by the user
+
+    Parameters
+    ----------
+    user_folder : str
+        folder of the user protocol files (None to only register the protocols shipped with hesperos)
+
+    Returns
+    ----------
+    registry : ProtocolRegistry
+    errors : list[str]
+        message of each user protocol file which cannot be loaded
+
+    """
+    registry = ProtocolRegistry()
+    for name, module_name in BUILTIN_PROTOCOLS:
+        registry.register(AnnotationProtocol.from_module(name, module_name))
+
+    errors = []
+    if user_folder is not None:
+        errors = registry.load_user_protocols(user_folder)
+
+    return registry, errors
@@ -0,0 +1 @@
+# file used to export the folder in the python package and napari plugin "hesperos"
\ No newline at end of file
@@ -0,0 +1,188 @@
+# ============ Import python files ============
+from hesperos.image_io.lazy_volume import LazyVolume
+
+# ============ Import python packages ============
+import os
+import numpy as np
+from collections import OrderedDict
+
+
+# ============ Constants ============
+DEFAULT_PERCENTILES = (0.5, 99.5) # clipped percentiles of the initial contrast limits
+MAX_NBR_SLICES = 16 # slices read along the first axis
+MAX_NBR_SAMPLES = 2 ** 20 # voxels kept after the strided sampling of the slices
+CACHE_SIZE = 16 # number of images whose estimation is kept
+RANGE_MARGIN = 0.5 # widening of the sampled range (fraction of this range) for the contrast slider
+
+_contrast_cache = OrderedDict()
+
+
+# ============ Sampling ============
+def sample_volume(array, max_nbr_slices=MAX_NBR_SLICES, max_nbr_samples=MAX_NBR_SAMPLES):
+    """
+    Sample the voxels of an image without reading it completely: evenly spaced slices along the first axis, strided in
+    the other axes (a lazily read volume only reads the sampled slices)
+
+    Parameters
+    ----------
+    array : ndarray or LazyVolume
+        2D (y, x) or 3D (z, y, x) image
+    max_nbr_slices : int
+        maximum number of slices read along the first axis
+    max_nbr_samples : int
+        maximum number of sampled voxels
+
+    Returns
+    ----------
+    samples : ndarray
+        1D array of the sampled finite values
+
+    """
+    if len(array.shape) == 2:
+        slice_indexes = [None]
+        slice_shape = array.shape
+    else:
+        slice_indexes = np.unique(np.linspace(0, array.shape[0] - 1, min(array.shape[0], max_nbr_slices)).round().astype(int))
+        slice_shape = array.shape[1:]
+
+    # same stride along each axis of the slices
+    nbr_voxels = len(slice_indexes) * int(np.prod(slice_shape))
+    stride = max(int(np.ceil((nbr_voxels / max_nbr_samples) ** (1 / len(slice_shape)))), 1)
+    strides = (slice(None, None, stride),) * len(slice_shape)
+
+    samples = []
+    for ind_z in slice_indexes:
+        if ind_z is None:
+            slice_arr = np.asarray(array)
+        elif isinstance(array, LazyVolume):
+            # no prefetching of the neighbouring slices
+            slice_arr = array.get_slice(int(ind_z), prefetch=False)
+        else:
+            slice_arr = array[int(ind_z)]
+        samples.append(np.asarray(slice_arr[strides]).ravel())
+
+    samples = np.concatenate(samples)
+    if not np.issubdtype(samples.dtype, np.integer):
+        samples = samples[np.isfinite(samples)]
+
+    return samples
+
+
+# ============ Contrast estimation ============
+def get_contrast_limits_range(array, samples, margin=RANGE_MARGIN):
+    """
+    Range of the contrast slider from the sampled values, widened by a margin (the extreme voxels of the image are
+    probably not sampled) and clamped to the limits of the data type for integer images. Only the samples are used:
+    no pass over the whole image (which would read a lazily read or memory mapped volume completely).
+    The contrast limits set outside of this range (e.g. imported) extend it.
+
+    Parameters
+    ----------
+    array : ndarray or LazyVolume
+        2D (y, x) or 3D (z, y, x) image
+    samples : ndarray
+        1D array of the sampled finite values
+    margin : float
+        added on each side of the sampled range, as a fraction of this range
+
+    Returns
+    ----------
+    contrast_limits_range : tuple(float, float)
+        range of the contrast slider
+
+    """
+    if len(samples) == 0:
+        return 0.0, 1.0
+
+    sample_min, sample_max = float(samples.min()), float(samples.max())
+    range_margin = margin * max(sample_max - sample_min, 1.0)
+    range_min, range_max = sample_min - range_margin, sample_max + range_margin
+
+    if np.issubdtype(array.dtype, np.integer):
+        dtype_info = np.iinfo(array.dtype)
+        range_min = max(np.floor(range_min), float(dtype_info.min))
+        range_max = min(np.ceil(range_max), float(dtype_info.max))
+
+    return float(range_min), float(range_max)
+
+
+def get_source_key(file_paths):
+    """
+    Identify the files an image is read from (path, modification time and size), used as key of the contrast cache
+
+    Parameters
+    ----------
+    file_paths : str or list[str]
+        image file or DICOM files of a series
+
+    Returns
+    ----------
+    key : tuple
+        None if a file cannot be found
+
+    """
+    if isinstance(file_paths, (str, os.PathLike)):
+        file_paths = [file_paths]
+
+    key = []
+    for file_path in file_paths:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        key.append((str(file_path), stat.st_mtime_ns, stat.st_size))
+
+    return tuple(key)
+
+
+def estimate_contrast_limits(array, percentiles=DEFAULT_PERCENTILES, cache_key=None, max_nbr_slices=MAX_NBR_SLICES, max_nbr_samples=MAX_NBR_SAMPLES):
+    """
+    Estimate the initial contrast limits of an image from a sample of its voxels (percentile clipping), instead of
+    the min and max of the whole volume. The range of the contrast slider is the sampled range widened by a margin
+    (see get_contrast_limits_range).
+
+    Parameters
+    ----------
+    array : ndarray or LazyVolume
+        2D (y, x) or 3D (z, y, x) image
+    percentiles : tuple(float, float)
+        percentiles of the sampled values used as contrast limits
+    cache_key : tuple
+        identification of the image (see get_source_key). If given, the estimation is kept in memory and re-used when
+        the same image is loaded again.
+    max_nbr_slices : int
+        maximum number of slices read along the first axis
+    max_nbr_samples : int
+        maximum number of sampled voxels
+
+    Returns
+    ----------
+    contrast_limits : tuple(float, float)
+        clipped contrast limits
+    contrast_limits_range : tuple(float, float)
+        range of the contrast slider
+
+    """
+    if (cache_key is not None) and (cache_key in _contrast_cache):
+        _contrast_cache.move_to_end(cache_key)
+        return _contrast_cache[cache_key]
+
+    samples = sample_volume(array, max_nbr_slices, max_nbr_samples)
+
+    contrast_limits_range = get_contrast_limits_range(array, samples)
+    if contrast_limits_range[0] == contrast_limits_range[1]:
+        contrast_limits_range = (contrast_limits_range[0], contrast_limits_range[0] + 1.0)
+
+    if len(samples) == 0:
+        contrast_limits = contrast_limits_range
+    else:
+        contrast_limits = tuple(float(value) for value in np.percentile(samples, percentiles))
+        if contrast_limits[0] >= contrast_limits[1]:
+            contrast_limits = (float(samples.min()), max(float(samples.max()), float(samples.min()) + 1.0))
+
+    if cache_key is not None:
+        _contrast_cache[cache_key] = (contrast_limits, contrast_limits_range)
+        while len(_contrast_cache) > CACHE_SIZE:
+            _contrast_cache.popitem(last=False)
+
+    return contrast_limits, contrast_limits_range
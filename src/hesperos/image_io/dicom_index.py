@@ -0,0 +1,233 @@
+# ============ Import python packages ============
+import os
+import json
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ============ Constants ============
+INDEX_FILE_NAME = ".hesperos_dicom_index.json"
+INDEX_VERSION = 2 # version 2: slice orientation ("direction") added to the entries
+
+# DICOM tags read from the headers
+TAG_SERIES_UID = "0020|000e"
+TAG_SERIES_DESCRIPTION = "0008|103e"
+TAG_MODALITY = "0008|0060"
+
+
+# ============ Header reading ============
+def read_dicom_file_entry(file_path):
+    """
+    Read only the header tags needed to index a DICOM file (series UID, description, modality, position, orientation,
+    dimensions)
+
+    Parameters
+    ----------
+    file_path : str
+        path of the file
+
+    Returns
+    ----------
+    entry : dict
+        indexed information of the file. "series_uid" is None if the file is not a readable DICOM image.
+
+    """
+    import SimpleITK as sitk
+
+    stat = os.stat(file_path)
+    entry = {"mtime": stat.st_mtime, "size": stat.st_size, "series_uid": None}
+
+    file_reader = sitk.ImageFileReader()
+    file_reader.SetImageIO("GDCMImageIO")
+    file_reader.SetFileName(file_path)
+    try:
+        file_reader.ReadImageInformation()
+    except RuntimeError:
+        return entry
+
+    def get_tag(key):
+        return file_reader.GetMetaData(key).strip() if file_reader.HasMetaDataKey(key) else ""
+
+    entry["series_uid"] = get_tag(TAG_SERIES_UID)
+    entry["description"] = get_tag(TAG_SERIES_DESCRIPTION)
+    entry["modality"] = get_tag(TAG_MODALITY)
+    entry["position"] = list(file_reader.GetOrigin())
+    entry["direction"] = list(file_reader.GetDirection())
+    entry["dimensions"] = list(file_reader.GetSize()[:2])
+
+    return entry
+
+
+# ============ Index ============
+def load_dicom_index(root_dir):
+    """
+    Load the cached index of a folder
+
+    Parameters
+    ----------
+    root_dir : str
+        indexed folder
+
+    Returns
+    ----------
+    files_index : dict
+        indexed files (relative path as key). Empty if there is no valid cached index.
+
+    """
+    index_path = Path(root_dir).joinpath(INDEX_FILE_NAME)
+    try:
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if index.get("version") != INDEX_VERSION:
+        return {}
+
+    return index.get("files", {})
+
+
+def save_dicom_index(root_dir, files_index):
+    """
+    Save the index of a folder in the folder (ignored if the folder is read-only)
+
+    Parameters
+    ----------
+    root_dir : str
+        indexed folder
+    files_index : dict
+        indexed files (relative path as key)
+
+    """
+    index_path = Path(root_dir).joinpath(INDEX_FILE_NAME)
+    try:
+        with open(index_path, 'w') as f:
+            json.dump({"version": INDEX_VERSION, "files": files_index}, f)
+    except OSError:
+        pass
+
+
+def index_dicom_folder(root_dir, nbr_workers=None):
+    """
+    Index all the DICOM files of a folder tree. Only the headers of new or modified files (compared to the cached
+    index) are read, in parallel. The updated index is cached in the folder.
+
+    Parameters
+    ----------
+    root_dir : str
+        folder to index (e.g. a study folder containing several series)
+    nbr_workers : int
+        number of threads reading the headers. If None, uses the ThreadPoolExecutor default.
+
+    Returns
+    ----------
+    files_index : dict
+        indexed files (path relative to root_dir as key)
+
+    """
+    cached_index = load_dicom_index(root_dir)
+
+    relative_paths = []
+    for dir_path, _, file_names in os.walk(root_dir):
+        for file_name in file_names:
+            if file_name == INDEX_FILE_NAME:
+                continue
+            relative_paths.append(os.path.relpath(os.path.join(dir_path, file_name), root_dir))
+
+    files_index = {}
+    paths_to_read = []
+    for relative_path in relative_paths:
+        entry = cached_index.get(relative_path)
+        if entry is not None:
+            try:
+                stat = os.stat(os.path.join(root_dir, relative_path))
+            except OSError:
+                continue
+            if (entry["mtime"] == stat.st_mtime) and (entry["size"] == stat.st_size):
+                files_index[relative_path] = entry
+                continue
+        paths_to_read.append(relative_path)
+
+    with ThreadPoolExecutor(max_workers=nbr_workers) as executor:
+        entries = executor.map(read_dicom_file_entry, [os.path.join(root_dir, p) for p in paths_to_read])
+        for relative_path, entry in zip(paths_to_read, entries):
+            files_index[relative_path] = entry
+
+    if (len(paths_to_read) > 0) or (len(files_index) != len(cached_index)):
+        save_dicom_index(root_dir, files_index)
+
+    return files_index
+
+
+def find_dicom_series(root_dir, nbr_workers=None):
+    """
+    List the DICOM series of a folder tree (using the cached index)
+
+    Parameters
+    ----------
+    root_dir : str
+        folder to search (e.g. a study folder containing several series)
+    nbr_workers : int
+        number of threads reading the headers. If None, uses the ThreadPoolExecutor default.
+
+    Returns
+    ----------
+    list_series : list[dict]
+        series found, with keys "series_uid", "description", "modality", "dimensions", "folder" (folder of the first file)
+        and "file_names" (absolute paths sorted by position along the slice normal)
+
+    """
+    files_index = index_dicom_folder(root_dir, nbr_workers)
+
+    dict_series = {}
+    for relative_path, entry in files_index.items():
+        if entry["series_uid"] is None:
+            continue
+        # a series UID with different slice dimensions can not be loaded as a single volume
+        key = (entry["series_uid"], tuple(entry["dimensions"]))
+        dict_series.setdefault(key, []).append((relative_path, entry))
+
+    list_series = []
+    for (series_uid, dimensions), files in dict_series.items():
+        # same order as the reader: ImagePositionPatient projected on the normal of the slices (third column of the
+        # direction matrix), so that sagittal or coronal series are not sorted along z
+        direction = files[0][1]["direction"]
+        normal = (direction[2], direction[5], direction[8]) if len(direction) == 9 else (0, 0, 1)
+        files.sort(key=lambda item: (sum(p * n for p, n in zip(item[1]["position"], normal)), item[0]))
+        file_names = [os.path.join(root_dir, relative_path) for relative_path, _ in files]
+        list_series.append({
+            "series_uid": series_uid,
+            "description": files[0][1]["description"],
+            "modality": files[0][1]["modality"],
+            "dimensions": list(dimensions),
+            "folder": os.path.dirname(file_names[0]),
+            "file_names": file_names,
+        })
+
+    list_series.sort(key=lambda series: (series["folder"], series["description"]))
+
+    return list_series
+
+
+def get_dicom_series_name(series, root_dir):
+    """
+    Create a short text describing a series (to be displayed in a list)
+
+    Parameters
+    ----------
+    series : dict
+        series as returned by find_dicom_series
+    root_dir : str
+        searched folder
+
+    Returns
+    ----------
+    name : str
+        description of the series
+
+    """
+    description = series["description"] if series["description"] != "" else "No description"
+    relative_folder = os.path.relpath(series["folder"], root_dir)
+    size_x, size_y = series["dimensions"]
+
+    return f"{description} ({series['modality']}, {len(series['file_names'])} images of {size_x}x{size_y}) - {relative_folder}"
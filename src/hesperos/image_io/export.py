@@ -0,0 +1,197 @@
+# ============ Import python packages ============
+import json
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+# ============ File paths ============
+def is_supported_extension(file_path):
+    """
+    Check if a file path has an extension handled by the export functions (.tif, .tiff, .nii or .nii.gz)
+
+    Parameters
+    ----------
+    file_path : str
+        path of the file
+
+    Returns
+    ----------
+    isSupported : bool
+        True if the extension is supported
+
+    """
+    extensions = Path(file_path).suffixes
+    if len(extensions) == 0:
+        return False
+
+    return (extensions[-1] in [".tif", ".tiff", ".nii"]) or (extensions[-2:] == [".nii", ".gz"])
+
+
+def get_label_file_path(file_path, structure_name):
+    """
+    Create the file path of a label exported in its own file : the structure name is added to the file name
+
+    Parameters
+    ----------
+    file_path : str
+        path chosen for the export
+    structure_name : str
+        name of the structure
+
+    Returns
+    ----------
+    new_file_path : Path
+        path of the file of the structure
+
+    """
+    extensions = Path(file_path).suffixes
+
+    if extensions[-1] in [".tif", ".tiff"]:
+        file_name = Path(file_path).stem
+        new_file_name = file_name + '_' + structure_name + extensions[0]
+    else:
+        file_name = Path(Path(file_path).stem).stem
+        try:
+            new_file_name = file_name + '_' + structure_name + extensions[0] + extensions[1]
+        except IndexError:
+            new_file_name = file_name + '_' + structure_name + extensions[0]
+
+    return Path(Path(file_path).parent).joinpath(new_file_name)
+
+
+# ============ Constants ============
+# segmentations are mostly zeros: TIFF files are written with deflate compressed tiles (each slice is a page, so a slice
+# range can be read without decompressing the whole volume)
+TIFF_COMPRESSION = 'zlib'
+TIFF_TILE_SIZE = (256, 256)
+
+
+# ============ Writing ============
+def write_image(file_path, image_arr, image_geometry=None, description=None, offset=None):
+    """
+    Write a 3D array as a TIFF (compressed and tiled) or NIfTI file.
+    A cropped array (sub-volume of the image) is written with its offset: adjusted origin for NIfTI, "Hesperos_Offset" in the TIFF description.
+
+    Parameters
+    ----------
+    file_path : str
+        path of the file (.tif, .tiff, .nii or .nii.gz)
+    image_arr : ndarray
+        3D array to write
+    image_geometry : ImageGeometry
+        geometry (spacing, origin, direction) written in NIfTI files
+    description : dict
+        metadata written as JSON in the TIFF description
+    offset : tuple(int)
+        index (z, y, x) of the first voxel of image_arr in the full image. None if image_arr is the full image.
+
+    """
+    extensions = Path(file_path).suffixes
+
+    if extensions[-1] in [".tif", ".tiff"]:
+        if offset is not None:
+            description = dict(description or {})
+            description["Hesperos_Offset"] = [int(o) for o in offset]
+
+        if description is not None:
+            description = json.dumps(description)
+
+        import tifffile as tif
+
+        tif.imwrite(str(file_path), image_arr, description=description, compression=TIFF_COMPRESSION, tile=TIFF_TILE_SIZE)
+
+    else:
+        import SimpleITK as sitk
+
+        # the only copy of the export: SimpleITK images own their buffer
+        result_image_sitk = sitk.GetImageFromArray(image_arr)
+        if image_geometry is not None:
+            image_geometry.apply_to(result_image_sitk, offset)
+        sitk.WriteImage(result_image_sitk, str(file_path))
+
+
+# ============ Multi-label split ============
+def get_label_bounding_boxes(segmentation_arr):
+    """
+    Compute the bounding box of every label in a single pass over the volume
+
+    Parameters
+    ----------
+    segmentation_arr : ndarray
+        3D labelled data (0 is the background)
+
+    Returns
+    ----------
+    bounding_boxes : dict
+        tuple of slices of the bounding box for each label id present in the volume
+
+    """
+    from scipy import ndimage
+
+    if segmentation_arr.dtype.kind not in "ui":
+        segmentation_arr = segmentation_arr.astype(np.int64)
+
+    bounding_boxes = {}
+    for index, bounding_box in enumerate(ndimage.find_objects(segmentation_arr)):
+        if bounding_box is not None:
+            bounding_boxes[index + 1] = bounding_box
+
+    return bounding_boxes
+
+
+def export_binary_labels(segmentation_arr, file_path, structure_list, image_geometry=None, isCropped=False, nbr_workers=4):
+    """
+    Export each label as a binary 3D image (0 or 255), one file per structure. Labels are found in a single pass
+    (bounding boxes), each binary volume is filled only inside its bounding box and files are written in parallel.
+    If isCropped, each file only contains the bounding box of its label (see write_image for the offset metadata).
+    Generator yielding the progress, to be run in a napari worker.
+
+    Parameters
+    ----------
+    segmentation_arr : ndarray
+        3D labelled data, the label id of structure_list[i] is i + 1
+    file_path : str
+        path chosen for the export (the structure name is added to the file name)
+    structure_list : list[str]
+        names of the structures
+    image_geometry : ImageGeometry
+        geometry written in NIfTI files
+    isCropped : bool
+        if True, write only the bounding box of each label instead of a full size volume
+    nbr_workers : int
+        number of files written at the same time (each one holds a full size volume)
+
+    Yields
+    ----------
+    progress : tuple(int, int)
+        number of files written and total number of files to write
+
+    """
+    bounding_boxes = get_label_bounding_boxes(segmentation_arr)
+
+    # export only if the labelled data is not empty
+    labels_to_export = [(idx + 1, struc) for idx, struc in enumerate(structure_list) if (idx + 1) in bounding_boxes]
+
+    def write_label(label_id, structure_name):
+        bounding_box = bounding_boxes[label_id]
+        new_file_path = get_label_file_path(file_path, structure_name)
+
+        if isCropped:
+            label_struc = (segmentation_arr[bounding_box] == label_id).astype(np.uint8) * 255
+            offset = [s.start for s in bounding_box]
+            write_image(new_file_path, label_struc, image_geometry, offset=offset)
+        else:
+            label_struc = np.zeros(segmentation_arr.shape, dtype=np.uint8)
+            label_struc[bounding_box][segmentation_arr[bounding_box] == label_id] = 255
+            write_image(new_file_path, label_struc, image_geometry)
+
+    nbr_written = 0
+    yield nbr_written, len(labels_to_export)
+
+    with ThreadPoolExecutor(max_workers=nbr_workers) as executor:
+        futures = [executor.submit(write_label, label_id, struc) for label_id, struc in labels_to_export]
+        for future in as_completed(futures):
+            future.result()
+            nbr_written += 1
+            yield nbr_written, len(labels_to_export)
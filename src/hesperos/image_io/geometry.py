@@ -0,0 +1,145 @@
+# ============ Import python packages ============
+import numpy as np
+
+
+# ============ Define geometry class ============
+class ImageGeometry:
+    """
+    A class used to keep the geometry of a volume (size, spacing, origin, direction) and its description without
+    keeping the volume itself (e.g. a SimpleITK image) in memory. Uses the SimpleITK (x, y, z) order.
+
+    """
+    def __init__(self, size, spacing=(1.0, 1.0, 1.0), origin=(0.0, 0.0, 0.0), direction=None, description="", unit="mm"):
+        """
+        Initilialisation
+
+        Parameters
+        ----------
+        size : tuple(int)
+            size of the volume as (x, y, z)
+        spacing : tuple(float)
+            spacing as (x, y, z)
+        origin : tuple(float)
+            origin as (x, y, z)
+        direction : tuple(float)
+            flattened 3x3 direction matrix. If None, identity.
+        description : str
+            description of the file (e.g. the ImageDescription of a TIFF file)
+        unit : str
+            length unit of the spacing and the origin (mm for DICOM and NIfTI files). None if unknown (e.g. a TIFF file
+            without resolution tags, the spacing is then 1 voxel).
+
+        """
+        self.size = tuple(int(s) for s in size)
+        self.spacing = tuple(float(s) for s in spacing)
+        self.origin = tuple(float(o) for o in origin)
+        if direction is None:
+            direction = np.eye(len(self.size)).ravel()
+        self.direction = tuple(float(d) for d in direction)
+        self.description = description
+        self.unit = unit
+
+    @classmethod
+    def from_sitk(cls, image_sitk, description=""):
+        """
+        Get the geometry of a SimpleITK image, or of a SimpleITK reader once the image information is read
+
+        Parameters
+        ----------
+        image_sitk : SimpleITK.Image or SimpleITK.ImageFileReader
+            image or reader
+        description : str
+            description of the file
+
+        Returns
+        ----------
+        geometry : ImageGeometry
+            geometry of the image
+
+        """
+        return cls(image_sitk.GetSize(), image_sitk.GetSpacing(), image_sitk.GetOrigin(), image_sitk.GetDirection(), description)
+
+    @property
+    def voxel_volume(self):
+        return float(np.prod(self.spacing))
+
+    def transform_index_to_physical_point(self, index):
+        """
+        Physical position of a voxel (same as SimpleITK.Image.TransformIndexToPhysicalPoint)
+
+        Parameters
+        ----------
+        index : tuple(int)
+            index of the voxel as (x, y, z)
+
+        Returns
+        ----------
+        point : tuple(float)
+            physical position as (x, y, z)
+
+        """
+        dimension = len(self.size)
+        direction = np.array(self.direction).reshape(dimension, dimension)
+        point = np.array(self.origin) + direction @ (np.array(self.spacing) * np.array(index, dtype=float))
+
+        return tuple(float(p) for p in point)
+
+    def apply_to(self, image_sitk, offset=None):
+        """
+        Set the geometry on a SimpleITK image (replaces CopyInformation)
+
+        Parameters
+        ----------
+        image_sitk : SimpleITK.Image
+            image to modify
+        offset : tuple(int)
+            index (z, y, x) of the first voxel of the image if it is a crop of the volume. None for the full volume.
+
+        """
+        image_sitk.SetSpacing(self.spacing)
+        image_sitk.SetDirection(self.direction)
+        if offset is None:
+            image_sitk.SetOrigin(self.origin)
+        else:
+            # the origin of the crop is the physical position of its first voxel in the full volume
+            image_sitk.SetOrigin(self.transform_index_to_physical_point([int(o) for o in offset[::-1]]))
+
+
+# ============ Zero-copy arrays ============
+class _ImageBuffer:
+    """
+    A class used to keep a SimpleITK image alive as long as a numpy view of its buffer is used
+
+    """
+    def __init__(self, image_sitk):
+        """
+        Initilialisation
+
+        Parameters
+        ----------
+        image_sitk : SimpleITK.Image
+            image sharing its buffer
+
+        """
+        import SimpleITK as sitk
+
+        self.image_sitk = image_sitk
+        self.__array_interface__ = sitk.GetArrayViewFromImage(image_sitk).__array_interface__
+
+
+def get_array_view(image_sitk):
+    """
+    Get the voxels of a SimpleITK image as a numpy array without copy (read-only). The image is kept alive by the array.
+
+    Parameters
+    ----------
+    image_sitk : SimpleITK.Image
+        image
+
+    Returns
+    ----------
+    image_arr : ndarray
+        read-only view of the image buffer as (z, y, x)
+
+    """
+    return np.asarray(_ImageBuffer(image_sitk))
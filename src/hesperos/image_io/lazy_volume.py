@@ -0,0 +1,262 @@
+# ============ Import python packages ============
+import threading
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ============ Define lazy volume class ============
+class LazyVolume:
+    """
+    A class used to expose a 3D image as an array whose slices (along the first axis) are read on demand.
+    Read slices are kept in a LRU cache and neighbouring slices are prefetched in background threads.
+    Can be given directly to napari (it only needs shape, dtype, ndim and __getitem__).
+
+    """
+    def __init__(self, read_slice, shape, dtype, cache_size=64, prefetch_radius=4, nbr_prefetch_workers=2, nbr_read_workers=None):
+        """
+        Initilialisation
+
+        Parameters
+        ----------
+        read_slice : function
+            function taking a slice index and returning the 2D array (y, x) of this slice
+        shape : tuple(int)
+            shape of the volume as (z, y, x)
+        dtype : numpy.dtype
+            data type of the volume
+        cache_size : int
+            maximum number of slices kept in memory
+        prefetch_radius : int
+            number of slices prefetched on each side of a requested slice
+        nbr_prefetch_workers : int
+            number of threads reading slices in background
+        nbr_read_workers : int
+            number of threads reading slices when the complete volume is read. If None, uses the ThreadPoolExecutor default.
+
+        """
+        self._read_slice = read_slice
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+
+        self.cache_size = max(cache_size, 2 * prefetch_radius + 1)
+        self.prefetch_radius = prefetch_radius
+        self.nbr_read_workers = nbr_read_workers
+
+        self._cache = OrderedDict()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=nbr_prefetch_workers)
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    @property
+    def nbytes(self):
+        return self.size * self.dtype.itemsize
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __array__(self, dtype=None, copy=None):
+        """
+        Read the complete volume: slices are read in parallel into a preallocated array (without going through the cache)
+
+        Parameters
+        ----------
+        dtype : numpy.dtype
+            data type of the array. If None, the data type of the volume.
+        copy : bool
+            numpy >= 2 protocol: the volume is always read into a new array, copy=False raises a ValueError
+
+        """
+        if copy is False:
+            raise ValueError("A LazyVolume can not be converted to an array without reading it into a new array (copy=False).")
+
+        array = np.empty(self.shape, dtype=self.dtype)
+
+        def fill_slice(ind_z):
+            with self._lock:
+                slice_arr = self._cache.get(ind_z)
+            if slice_arr is None:
+                slice_arr = np.asarray(self._read_slice(ind_z)).reshape(self.shape[1:])
+            array[ind_z] = slice_arr
+
+        with ThreadPoolExecutor(max_workers=self.nbr_read_workers) as executor:
+            list(executor.map(fill_slice, range(self.shape[0])))
+
+        if dtype is not None:
+            array = array.astype(dtype, copy=False)
+
+        return array
+
+    def __getitem__(self, key):
+        """
+        Numpy-like indexing: only the slices selected by the first index are read
+
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        if (len(key) == 0) or any(k is Ellipsis or k is None for k in key):
+            return np.asarray(self)[key]
+
+        key_z, key_yx = key[0], key[1:]
+
+        if isinstance(key_z, (int, np.integer)):
+            return self.get_slice(int(key_z))[key_yx]
+
+        slice_indexes = np.arange(self.shape[0])[key_z]
+        array = np.empty((len(slice_indexes),) + self.shape[1:], dtype=self.dtype)
+        for i, ind_z in enumerate(slice_indexes):
+            array[i] = self.get_slice(int(ind_z), prefetch=False)
+
+        if len(slice_indexes) > 0:
+            self._prefetch(int(slice_indexes[-1]))
+
+        return array[(slice(None),) + key_yx]
+
+    def take(self, indices, axis=0):
+        """
+        Numpy-like take: along the first axis, only the selected slices are read. Along another axis, every slice is read
+        (in parallel, without going through the cache) but only the selected rows or columns are kept in memory.
+
+        Parameters
+        ----------
+        indices : list[int]
+            indexes of the slices along the axis
+        axis : int
+            axis of the slices
+
+        Returns
+        ----------
+        array : ndarray
+            array with len(indices) elements along the axis
+
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        if axis == 0:
+            return self[indices]
+
+        shape = list(self.shape)
+        shape[axis] = len(indices)
+        array = np.empty(shape, dtype=self.dtype)
+
+        def fill_slice(ind_z):
+            with self._lock:
+                slice_arr = self._cache.get(ind_z)
+            if slice_arr is None:
+                slice_arr = np.asarray(self._read_slice(ind_z)).reshape(self.shape[1:])
+            array[ind_z] = np.take(slice_arr, indices, axis=axis - 1)
+
+        with ThreadPoolExecutor(max_workers=self.nbr_read_workers) as executor:
+            list(executor.map(fill_slice, range(self.shape[0])))
+
+        return array
+
+    def get_slice(self, ind_z, prefetch=True):
+        """
+        Get a slice from the cache, or read it
+
+        Parameters
+        ----------
+        ind_z : int
+            index of the slice (negative index allowed)
+        prefetch : bool
+            if True, the neighbouring slices are read in background
+
+        Returns
+        ----------
+        slice_arr : ndarray
+            2D array of the slice (read-only)
+
+        """
+        if ind_z < 0:
+            ind_z += self.shape[0]
+        if not 0 <= ind_z < self.shape[0]:
+            raise IndexError(f"Slice index {ind_z} is out of bounds for a volume of {self.shape[0]} slices")
+
+        slice_arr = self._load_slice(ind_z)
+
+        if prefetch:
+            self._prefetch(ind_z)
+
+        return slice_arr
+
+    def _load_slice(self, ind_z):
+        """
+        Get a slice from the cache, or read it and add it to the cache (least recently used slices are evicted)
+
+        Parameters
+        ----------
+        ind_z : int
+            index of the slice
+
+        Returns
+        ----------
+        slice_arr : ndarray
+            2D array of the slice (read-only)
+
+        """
+        with self._lock:
+            if ind_z in self._cache:
+                self._cache.move_to_end(ind_z)
+                return self._cache[ind_z]
+
+        slice_arr = np.asarray(self._read_slice(ind_z), dtype=self.dtype).reshape(self.shape[1:])
+        slice_arr.flags.writeable = False
+
+        with self._lock:
+            self._cache[ind_z] = slice_arr
+            self._cache.move_to_end(ind_z)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return slice_arr
+
+    def _prefetch(self, ind_z):
+        """
+        Read in background the slices around a slice that are not in the cache yet
+
+        Parameters
+        ----------
+        ind_z : int
+            index of the requested slice
+
+        """
+        neighbour_indexes = []
+        for distance in range(1, self.prefetch_radius + 1):
+            neighbour_indexes += [ind_z + distance, ind_z - distance]
+
+        with self._lock:
+            neighbour_indexes = [
+                z for z in neighbour_indexes
+                if (0 <= z < self.shape[0]) and (z not in self._cache) and (z not in self._pending)
+            ]
+            self._pending.update(neighbour_indexes)
+
+        for z in neighbour_indexes:
+            self._executor.submit(self._prefetch_slice, z)
+
+    def _prefetch_slice(self, ind_z):
+        """
+        Read a slice in background (errors are ignored: the slice will be read again on demand)
+
+        Parameters
+        ----------
+        ind_z : int
+            index of the slice
+
+        """
+        try:
+            self._load_slice(ind_z)
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                self._pending.discard(ind_z)
@@ -0,0 +1,428 @@
+# ============ Import python files ============
+from hesperos.image_io.lazy_volume import LazyVolume
+from hesperos.image_io.geometry import ImageGeometry, get_array_view
+
+
+# ============ Import python packages ============
+import os
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ============ Constants ============
+# DICOM tags which change the decoded pixel type of a file
+TAG_RESCALE_INTERCEPT = "0028|1052"
+TAG_RESCALE_SLOPE = "0028|1053"
+
+
+# ============ TIFF ============
+def read_tiff_geometry(tiff_file, shape):
+    """
+    Read the geometry of a TIFF file from its tags: pixel spacing from the XResolution, YResolution and ResolutionUnit
+    tags (converted to mm for inch and centimeter units), slice spacing and unit from the ImageJ metadata. TIFF files
+    have no origin nor direction.
+
+    Parameters
+    ----------
+    tiff_file : tifffile.TiffFile
+        opened TIFF file
+    shape : tuple(int)
+        shape of the image as (z, y, x) or (y, x)
+
+    Returns
+    ----------
+    image_geometry : ImageGeometry
+        geometry of the volume (a 2D image is a volume of one slice). Its unit is None if the file has no resolution
+        tags or no resolution unit.
+
+    """
+    from tifffile import RESUNIT
+
+    page = tiff_file.pages[0]
+    resolution_unit = page.tags.valueof('ResolutionUnit')
+    unit_scale = {RESUNIT.INCH: 25.4, RESUNIT.CENTIMETER: 10.0}.get(resolution_unit, 1.0)
+    imagej_metadata = tiff_file.imagej_metadata or {}
+
+    spacing = [1.0, 1.0, 1.0]
+    isResolutionFound = False
+    for axis, tag_name in enumerate(['XResolution', 'YResolution']):
+        resolution = page.tags.valueof(tag_name)
+        if (resolution is not None) and (resolution[0] > 0) and (resolution[1] > 0):
+            spacing[axis] = unit_scale * resolution[1] / resolution[0]
+            isResolutionFound = True
+
+    if float(imagej_metadata.get('spacing', 0)) > 0:
+        spacing[2] = float(imagej_metadata['spacing'])
+
+    if not isResolutionFound:
+        unit = None
+    elif resolution_unit in [RESUNIT.INCH, RESUNIT.CENTIMETER]:
+        unit = "mm"
+    else:
+        # ImageJ files have no resolution unit, the unit is in the metadata (ImageJ writes µm as "micron" or as an escaped "\\u00B5m")
+        unit = {"micron": "µm", "\\u00B5m": "µm"}.get(imagej_metadata.get('unit'), imagej_metadata.get('unit')) or None
+
+    size = tuple(shape[::-1]) if len(shape) == 3 else (shape[1], shape[0], 1)
+
+    return ImageGeometry(size, spacing, unit=unit)
+
+
+def read_tiff_lazy(file_path):
+    """
+    Open a TIFF file without reading it: uncompressed contiguous files are memory mapped, other multi-pages files are read page by page on demand.
+
+    Parameters
+    ----------
+    file_path : str
+        path of the TIFF file
+
+    Returns
+    ----------
+    image_arr : ndarray or LazyVolume
+        image (2D or 3D) as (z, y, x)
+    image_geometry : ImageGeometry
+        geometry of the volume (see read_tiff_geometry)
+
+    """
+    import tifffile as tif
+
+    tiff_file = tif.TiffFile(file_path)
+    series = tiff_file.series[0]
+    image_geometry = read_tiff_geometry(tiff_file, series.shape)
+
+    try:
+        image_arr = tif.memmap(file_path, mode='r')
+    except ValueError:
+        pass
+    else:
+        tiff_file.close()
+        return image_arr, image_geometry
+
+    if (len(series.shape) != 3) or (len(series.pages) != series.shape[0]):
+        image_arr = series.asarray()
+        tiff_file.close()
+        return image_arr, image_geometry
+
+    # the file handle is shared by all the pages
+    read_lock = threading.Lock()
+    pages = series.pages
+
+    def read_slice(ind_z):
+        with read_lock:
+            return pages[ind_z].asarray()
+
+    image_arr = LazyVolume(read_slice, series.shape, series.dtype)
+    image_arr.tiff_file = tiff_file
+
+    return image_arr, image_geometry
+
+
+def read_tiff_slices(file_path, slice_range=None):
+    """
+    Read a TIFF file (e.g. a segmentation), or only a range of its slices: only the pages (and their compressed tiles)
+    of the range are read and decompressed
+
+    Parameters
+    ----------
+    file_path : str
+        path of the TIFF file
+    slice_range : tuple(int, int)
+        first (included) and last (excluded) slice indexes to read. If None, the whole image is read.
+
+    Returns
+    ----------
+    image_arr : ndarray
+        image (2D or 3D) as (z, y, x)
+    description : str
+        content of the ImageDescription tag of the first page ("" if none)
+
+    """
+    import tifffile as tif
+
+    with tif.TiffFile(file_path) as tiff_file:
+        description = tiff_file.pages[0].description
+
+        if slice_range is None:
+            image_arr = tiff_file.series[0].asarray()
+        else:
+            image_arr = tiff_file.asarray(key=range(*slice_range))
+            if image_arr.ndim == 2:
+                image_arr = np.expand_dims(image_arr, 0)
+
+    return image_arr, description
+
+
+# ============ NIfTI ============
+def read_nifti_lazy(file_path):
+    """
+    Open a NIfTI file. Uncompressed files (.nii) are read slice by slice on demand, compressed files (.nii.gz) can not be
+    read randomly and are read entirely (the array shares the buffer of the SimpleITK image, without copy).
+
+    Parameters
+    ----------
+    file_path : str
+        path of the NIfTI file
+
+    Returns
+    ----------
+    image_arr : ndarray or LazyVolume
+        image (2D or 3D) as (z, y, x)
+    image_geometry : ImageGeometry
+        geometry of the volume
+
+    """
+    import SimpleITK as sitk
+
+    if file_path.endswith(".gz"):
+        image_sitk = sitk.ReadImage(file_path)
+        return get_array_view(image_sitk), ImageGeometry.from_sitk(image_sitk)
+
+    file_reader = sitk.ImageFileReader()
+    file_reader.SetFileName(file_path)
+    file_reader.ReadImageInformation()
+
+    size = file_reader.GetSize()
+    if (len(size) != 3) or (file_reader.GetNumberOfComponents() != 1):
+        image_sitk = sitk.ReadImage(file_path)
+        return get_array_view(image_sitk), ImageGeometry.from_sitk(image_sitk)
+
+    image_geometry = ImageGeometry.from_sitk(file_reader)
+
+    def read_slice(ind_z):
+        slice_reader = sitk.ImageFileReader()
+        slice_reader.SetFileName(file_path)
+        slice_reader.SetExtractIndex([0, 0, ind_z])
+        slice_reader.SetExtractSize([size[0], size[1], 1])
+        return get_array_view(slice_reader.Execute())[0]
+
+    dtype = read_slice(0).dtype
+    image_arr = LazyVolume(read_slice, (size[2], size[1], size[0]), dtype)
+
+    return image_arr, image_geometry
+
+
+# ============ DICOM ============
+def read_dicom_header(file_name):
+    """
+    Read only the header of a DICOM file (pixel data are not decoded)
+
+    Parameters
+    ----------
+    file_name : str
+        path of the DICOM file
+
+    Returns
+    ----------
+    file_reader : SimpleITK.ImageFileReader
+        reader with the image information (size, spacing, origin i.e. ImagePositionPatient, direction) loaded
+
+    """
+    import SimpleITK as sitk
+
+    file_reader = sitk.ImageFileReader()
+    file_reader.SetFileName(file_name)
+    file_reader.ReadImageInformation()
+
+    return file_reader
+
+
+def sort_dicom_files(file_names, nbr_workers=None):
+    """
+    Sort the files of a DICOM series by position along the slice normal (ImagePositionPatient projected on the
+    normal of ImageOrientationPatient). Headers are read in parallel.
+
+    Parameters
+    ----------
+    file_names : list[str]
+        paths of the DICOM files of the series
+    nbr_workers : int
+        number of threads reading the headers. If None, uses the ThreadPoolExecutor default.
+
+    Returns
+    ----------
+    sorted_file_names : list[str]
+        paths sorted by slice position
+    headers : list[SimpleITK.ImageFileReader]
+        headers of the sorted files
+
+    """
+    with ThreadPoolExecutor(max_workers=nbr_workers) as executor:
+        headers = list(executor.map(read_dicom_header, file_names))
+
+    normal = np.array(headers[0].GetDirection()).reshape(3, 3)[:, 2]
+    positions = [np.dot(header.GetOrigin(), normal) for header in headers]
+    order = np.argsort(positions, kind='stable')
+
+    return [file_names[i] for i in order], [headers[i] for i in order]
+
+
+def get_dicom_series_geometry(headers, nbr_slices=None):
+    """
+    Build the geometry of a DICOM series from the headers of its sorted files (same geometry than sitk.ImageSeriesReader).
+    Only the first and the last headers are used.
+
+    Parameters
+    ----------
+    headers : list[SimpleITK.ImageFileReader]
+        headers of the files sorted by slice position (or only the first and the last ones)
+    nbr_slices : int
+        number of files of the series. If None, the number of headers.
+
+    Returns
+    ----------
+    image_geometry : ImageGeometry
+        geometry of the volume
+
+    """
+    if nbr_slices is None:
+        nbr_slices = len(headers)
+
+    size_x, size_y = headers[0].GetSize()[:2]
+    spacing = list(headers[0].GetSpacing())
+    origin = headers[0].GetOrigin()
+
+    if nbr_slices > 1:
+        # slice spacing from the positions of the first and last slices
+        distance = np.linalg.norm(np.array(headers[-1].GetOrigin()) - np.array(origin))
+        if distance > 0:
+            spacing[2] = distance / (nbr_slices - 1)
+
+    return ImageGeometry((size_x, size_y, nbr_slices), spacing, origin, headers[0].GetDirection())
+
+
+def is_dicom_pixel_type_uniform(headers):
+    """
+    Check that the files of a DICOM series are decoded with the same pixel type. The files are decoded separately: if
+    their pixel type or their rescale (RescaleSlope, RescaleIntercept) differ, some slices are decoded as float and the
+    volume must be promoted to float, instead of truncating them to the type of the first slice.
+
+    Parameters
+    ----------
+    headers : list[SimpleITK.ImageFileReader]
+        headers of the files (all of them, or only the first and the last ones)
+
+    Returns
+    ----------
+    isUniform : bool
+        True if all the headers have the same pixel type and rescale
+
+    """
+    def get_pixel_type(header):
+        rescale = tuple(header.GetMetaData(key).strip() if header.HasMetaDataKey(key) else "" for key in [TAG_RESCALE_SLOPE, TAG_RESCALE_INTERCEPT])
+        return header.GetPixelID(), rescale
+
+    return len(set(get_pixel_type(header) for header in headers)) == 1
+
+
+def read_dicom_series_headers(file_names, nbr_workers=None, isSorted=False):
+    """
+    Read the headers needed to open a DICOM series
+
+    Parameters
+    ----------
+    file_names : list[str]
+        paths of the DICOM files of the series
+    nbr_workers : int
+        number of threads reading the headers. If None, uses the ThreadPoolExecutor default.
+    isSorted : bool
+        True if the files are already sorted by slice position (e.g. by find_dicom_series): only the headers of the
+        first and the last files are read, instead of a header pass over all the files to sort them
+
+    Returns
+    ----------
+    sorted_file_names : list[str]
+        paths sorted by slice position
+    image_geometry : ImageGeometry
+        geometry of the volume
+    headers : list[SimpleITK.ImageFileReader]
+        headers of the sorted files (only the first and the last ones if isSorted)
+
+    """
+    if isSorted:
+        headers = [read_dicom_header(file_names[0]), read_dicom_header(file_names[-1])]
+    else:
+        file_names, headers = sort_dicom_files(file_names, nbr_workers)
+
+    return list(file_names), get_dicom_series_geometry(headers, len(file_names)), headers
+
+
+def read_dicom_series_lazy(file_names, nbr_workers=None, isSorted=False):
+    """
+    Open a DICOM series (one file per slice), files are read on demand.
+    Reading the complete volume (np.asarray) decodes the files in parallel into a preallocated array.
+
+    Parameters
+    ----------
+    file_names : list[str]
+        paths of the DICOM files of the series (sorted by slice position when opened)
+    nbr_workers : int
+        number of threads reading the headers and decoding the slices. If None, uses the ThreadPoolExecutor default.
+    isSorted : bool
+        True if the files are already sorted by slice position (no header pass over all the files)
+
+    Returns
+    ----------
+    image_arr : LazyVolume
+        3D image as (z, y, x)
+    image_geometry : ImageGeometry
+        geometry of the volume (same geometry than sitk.ImageSeriesReader)
+
+    """
+    import SimpleITK as sitk
+
+    file_names, image_geometry, headers = read_dicom_series_headers(file_names, nbr_workers, isSorted)
+    size_x, size_y = headers[0].GetSize()[:2]
+
+    def read_slice(ind_z):
+        return get_array_view(sitk.ReadImage(file_names[ind_z])).reshape(size_y, size_x)
+
+    dtype = read_slice(0).dtype
+    if not is_dicom_pixel_type_uniform(headers):
+        # some slices are decoded as float (e.g. different RescaleSlope): promoted instead of truncated to the first slice type
+        dtype = np.promote_types(dtype, np.float32)
+    image_arr = LazyVolume(read_slice, (len(file_names), size_y, size_x), dtype, nbr_read_workers=nbr_workers)
+
+    return image_arr, image_geometry
+
+
+def read_dicom_series(file_names, nbr_workers=None, isSorted=False):
+    """
+    Read a complete DICOM series, the files are decoded in parallel into a preallocated array.
+    With a single decoding thread, the sorted files are read by sitk.ImageSeriesReader (faster serial decoding).
+
+    Parameters
+    ----------
+    file_names : list[str]
+        paths of the DICOM files of the series
+    nbr_workers : int
+        number of threads reading the headers and decoding the slices. If None, uses the ThreadPoolExecutor default.
+    isSorted : bool
+        True if the files are already sorted by slice position (no header pass over all the files)
+
+    Returns
+    ----------
+    image_arr : ndarray
+        3D image as (z, y, x)
+    image_geometry : ImageGeometry
+        geometry of the volume (same geometry than sitk.ImageSeriesReader)
+
+    """
+    import SimpleITK as sitk
+
+    isSerial = (nbr_workers == 1) or ((nbr_workers is None) and ((os.cpu_count() or 1) == 1))
+    if not isSerial:
+        image_arr, image_geometry = read_dicom_series_lazy(file_names, nbr_workers, isSorted)
+        return np.asarray(image_arr), image_geometry
+
+    file_names, _, headers = read_dicom_series_headers(file_names, nbr_workers, isSorted)
+
+    series_reader = sitk.ImageSeriesReader()
+    series_reader.SetFileNames(file_names)
+    if not is_dicom_pixel_type_uniform(headers):
+        # the series reader would decode all the files with the pixel type of the first one
+        isFloat64 = any(header.GetPixelID() == sitk.sitkFloat64 for header in headers)
+        series_reader.SetOutputPixelType(sitk.sitkFloat64 if isFloat64 else sitk.sitkFloat32)
+    image_sitk = series_reader.Execute()
+
+    return get_array_view(image_sitk), ImageGeometry.from_sitk(image_sitk)
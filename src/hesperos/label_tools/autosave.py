@@ -0,0 +1,123 @@
+# ============ Import python packages ============
+import threading
+import numpy as np
+from pathlib import Path
+
+
+# ============ Define autosave class ============
+class SegmentationAutosave:
+    """
+    A class used to save a segmentation volume in background, slice by slice.
+    Edited slices are marked as dirty; once no edit happened for a short delay (debouncing), only the dirty slices are
+    written in a memory mapped TIFF file (the whole volume is written once, at the first save).
+
+    """
+    def __init__(self, segmentation_arr, file_path, delay=1.0):
+        """
+        Initilialisation
+
+        Parameters
+        ----------
+        segmentation_arr : ndarray
+            3D segmentation array (z, y, x) edited by the user (e.g. the data of the labels layer)
+        file_path : str
+            path of the backup TIFF file
+        delay : float
+            time without edit (in seconds) before the dirty slices are saved
+
+        """
+        self.segmentation_arr = segmentation_arr
+        self.file_path = str(file_path)
+        self.delay = delay
+
+        self._memmap = None
+        self._dirty_slice_indexes = set()
+        self._lock = threading.Lock()
+        self._edit_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Start the background saving thread (the complete volume is saved first)
+
+        """
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._edit_event.set()
+
+    def stop(self):
+        """
+        Save the remaining dirty slices, stop the background thread and close the file
+
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            self._edit_event.set()
+            self._thread.join()
+            self._thread = None
+
+        if self._memmap is not None:
+            self._memmap.flush()
+            del self._memmap
+            self._memmap = None
+
+    def mark_dirty(self, slice_indexes):
+        """
+        Mark slices as modified since the last save
+
+        Parameters
+        ----------
+        slice_indexes : list[int]
+            indexes (first axis) of the edited slices
+
+        """
+        with self._lock:
+            self._dirty_slice_indexes.update(int(z) for z in slice_indexes)
+        self._edit_event.set()
+
+    def _run(self):
+        """
+        Background loop: wait for edits, wait for the end of the edits (no edit during the delay), then save
+
+        """
+        while not self._stop_event.is_set():
+            self._edit_event.wait()
+
+            # debouncing: restart the delay at each new edit
+            while not self._stop_event.is_set():
+                self._edit_event.clear()
+                if not self._edit_event.wait(self.delay):
+                    break
+
+            self._save_dirty_slices()
+
+        self._save_dirty_slices()
+
+    def _save_dirty_slices(self):
+        """
+        Write the dirty slices in the backup file (the whole volume if the file is not created yet)
+
+        """
+        with self._lock:
+            dirty_slice_indexes = sorted(self._dirty_slice_indexes)
+            self._dirty_slice_indexes = set()
+
+        segmentation_arr = self.segmentation_arr
+
+        if self._memmap is None:
+            import tifffile as tif
+
+            Path(self.file_path).parent.mkdir(parents=True, exist_ok=True)
+            self._memmap = tif.memmap(self.file_path, shape=segmentation_arr.shape, dtype=segmentation_arr.dtype)
+            self._memmap[:] = segmentation_arr
+
+        elif len(dirty_slice_indexes) > 0:
+            for ind_z in dirty_slice_indexes:
+                self._memmap[ind_z] = np.asarray(segmentation_arr[ind_z])
+
+        else:
+            return
+
+        self._memmap.flush()
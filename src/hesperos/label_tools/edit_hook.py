@@ -0,0 +1,77 @@
+# ============ Import python packages ============
+import numpy as np
+
+
+# ============ Labels layer edit hook ============
+def connect_labels_edit_callback(layer, callback, isHistoryKept=True):
+    """
+    Call a function each time the data of a labels layer is edited (paint, fill, erase, napari undo/redo).
+    napari < 0.4.15 has no paint event: every edit goes through Labels._save_history (called just before the data
+    is written) and undo/redo through Labels._load_history, so both methods are wrapped on the layer instance.
+
+    The callback receives (indices, old_values, new_values, isNewOperation):
+        - indices : tuple of arrays, multi-index of the edited voxels
+        - old_values : ndarray, values before the edit
+        - new_values : int or ndarray, values after the edit
+        - isNewOperation : bool, True for the first edit of an operation (e.g. the first dab of a brush stroke)
+
+    If the napari history is not kept (the edits are stored by another undo manager), napari only receives an empty
+    history item per operation: the mouse bindings still find the item they pop on release, without any copy of the data.
+
+    Parameters
+    ----------
+    layer : napari.layers.Labels
+        labels layer to watch
+    callback : function
+        function called for each edit
+    isHistoryKept : bool
+        if False, the edits are not saved in the napari undo history
+
+    """
+    save_history = layer._save_history
+    load_history = layer._load_history
+
+    def save_history_with_callback(value):
+        indices, old_values, new_values = value
+        callback(indices, old_values, new_values, not layer._block_saving)
+        if isHistoryKept:
+            save_history(value)
+        elif not layer._block_saving:
+            dummy_indices = (np.zeros(shape=0, dtype=int),) * layer.data.ndim
+            layer._undo_history.append([(dummy_indices, [], [])])
+
+    def load_history_with_callback(before, after, undoing=True):
+        if len(before) == 0:
+            return
+
+        history_item = before[-1]
+        list_indices = [indices for indices, _, _ in reversed(history_item)]
+        list_old_values = [np.array(layer.data[indices], copy=True) for indices in list_indices]
+
+        load_history(before, after, undoing)
+
+        for i, (indices, old_values) in enumerate(zip(list_indices, list_old_values)):
+            callback(indices, old_values, np.array(layer.data[indices], copy=True), i == 0)
+
+    layer._save_history = save_history_with_callback
+    layer._load_history = load_history_with_callback
+
+
+def get_edited_slice_indexes(indices, axis=0):
+    """
+    Get the indexes of the slices (along an axis) touched by an edit
+
+    Parameters
+    ----------
+    indices : tuple of arrays
+        multi-index of the edited voxels
+    axis : int
+        axis of the slices
+
+    Returns
+    ----------
+    slice_indexes : ndarray
+        sorted unique slice indexes
+
+    """
+    return np.unique(np.asarray(indices[axis]))
@@ -0,0 +1,162 @@
+# ============ Import python packages ============
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+# ============ Signed distance ============
+def get_signed_distance(mask):
+    """
+    Signed distance transform of a 2D mask: positive inside, negative outside, the border is between -0.5 and 0.5
+
+    Parameters
+    ----------
+    mask : ndarray
+        2D boolean array
+
+    Returns
+    ----------
+    signed_distance : ndarray
+        2D float array
+
+    """
+    from scipy import ndimage
+
+    if not mask.any():
+        return np.full(mask.shape, -np.inf)
+
+    return ndimage.distance_transform_edt(mask) - ndimage.distance_transform_edt(~mask)
+
+
+# ============ Shape-based interpolation ============
+def interpolate_label(segmentation_arr, label, bounding_box, axis, max_gap=None):
+    """
+    Interpolate a label between the slices where it is annotated (shape-based interpolation): the signed distance
+    transforms of two consecutive annotated slices are linearly interpolated along the axis for the slices between
+    them. Only the bounding box of the label is processed.
+
+    Parameters
+    ----------
+    segmentation_arr : ndarray
+        3D labelled data (0 is the background)
+    label : int
+        label id to interpolate
+    bounding_box : tuple(slice)
+        bounding box of the label in the volume
+    axis : int
+        axis of the slices
+    max_gap : int
+        slices separated by more than max_gap slices are not interpolated (None for no limit)
+
+    Returns
+    ----------
+    indices : tuple of arrays
+        multi-index (in the volume) of the unlabelled voxels inside the interpolated label
+    signed_distances : ndarray
+        interpolated signed distance of these voxels (used to choose between overlapping labels)
+
+    """
+    # one pixel margin in the slices, so that the borders of the label are inside the box
+    bounding_box = tuple(
+        bounding_slice if dim == axis else slice(max(bounding_slice.start - 1, 0), min(bounding_slice.stop + 1, segmentation_arr.shape[dim]))
+        for dim, bounding_slice in enumerate(bounding_box)
+    )
+    label_box = np.moveaxis(np.asarray(segmentation_arr[bounding_box]), axis, 0)
+    isLabel = label_box == label
+
+    annotated_slices = np.flatnonzero(isLabel.reshape(len(isLabel), -1).any(axis=1))
+
+    positions = []
+    signed_distances = []
+    next_distance = None
+    for first, last in zip(annotated_slices[:-1], annotated_slices[1:]):
+        nbr_slices = last - first
+        first_distance = next_distance if next_distance is not None else get_signed_distance(isLabel[first])
+        next_distance = get_signed_distance(isLabel[last])
+
+        if (nbr_slices < 2) or ((max_gap is not None) and (nbr_slices > max_gap)):
+            continue
+
+        # all the slices between first and last at once
+        weights = (np.arange(1, nbr_slices) / nbr_slices)[:, None, None]
+        interpolated_distance = (1 - weights) * first_distance + weights * next_distance
+
+        isInside = (interpolated_distance > 0) & (label_box[first + 1:last] == 0)
+        slice_positions = np.nonzero(isInside)
+        signed_distances.append(interpolated_distance[slice_positions])
+        positions.append(np.stack(slice_positions, axis=1) + [first + 1, 0, 0])
+
+    if len(positions) == 0:
+        return tuple(np.zeros(0, dtype=np.intp) for _ in range(segmentation_arr.ndim)), np.zeros(0)
+
+    # back to the axes and the origin of the volume
+    positions = np.concatenate(positions)
+    positions = positions[:, np.argsort([axis] + [dim for dim in range(segmentation_arr.ndim) if dim != axis])]
+    positions += [bounding_slice.start for bounding_slice in bounding_box]
+
+    return tuple(positions.T), np.concatenate(signed_distances)
+
+
+def interpolate_labels(segmentation_arr, axis, labels=None, max_gap=None, nbr_workers=4):
+    """
+    Interpolate every label between the slices where it is annotated (see interpolate_label), labels are processed in
+    parallel. A voxel claimed by several labels takes the label it is the deepest inside.
+    Generator yielding the progress, to be run in a napari worker.
+
+    Parameters
+    ----------
+    segmentation_arr : ndarray
+        3D labelled data (0 is the background)
+    axis : int
+        axis of the slices
+    labels : list[int]
+        label ids to interpolate (None for all the labels of the volume)
+    max_gap : int
+        slices separated by more than max_gap slices are not interpolated (None for no limit)
+    nbr_workers : int
+        number of labels interpolated at the same time
+
+    Yields
+    ----------
+    progress : tuple(int, int)
+        number of interpolated labels and total number of labels
+
+    Returns
+    ----------
+    edit : tuple
+        (indices, new_values) of the unlabelled voxels filled by the interpolation
+
+    """
+    from hesperos.image_io.export import get_label_bounding_boxes
+
+    bounding_boxes = get_label_bounding_boxes(segmentation_arr)
+    if labels is not None:
+        bounding_boxes = {label: bounding_boxes[label] for label in labels if label in bounding_boxes}
+
+    list_indices, list_distances, list_labels = [], [], []
+    nbr_interpolated = 0
+    yield nbr_interpolated, len(bounding_boxes)
+
+    with ThreadPoolExecutor(max_workers=nbr_workers) as executor:
+        futures = {executor.submit(interpolate_label, segmentation_arr, label, bounding_box, axis, max_gap): label for label, bounding_box in bounding_boxes.items()}
+        for future in as_completed(futures):
+            indices, signed_distances = future.result()
+            list_indices.append(np.ravel_multi_index(indices, segmentation_arr.shape))
+            list_distances.append(signed_distances)
+            list_labels.append(np.full(len(signed_distances), futures[future], dtype=segmentation_arr.dtype))
+            nbr_interpolated += 1
+            yield nbr_interpolated, len(bounding_boxes)
+
+    if len(list_indices) == 0:
+        return tuple(np.zeros(0, dtype=np.intp) for _ in range(segmentation_arr.ndim)), np.zeros(0, dtype=segmentation_arr.dtype)
+
+    flat_indices = np.concatenate(list_indices)
+    signed_distances = np.concatenate(list_distances)
+    new_values = np.concatenate(list_labels)
+
+    # overlapping labels: sorted by voxel then by decreasing signed distance, the first label of each voxel is kept
+    order = np.lexsort((-signed_distances, flat_indices))
+    flat_indices, new_values = flat_indices[order], new_values[order]
+    isFirst = np.ones(len(flat_indices), dtype=bool)
+    isFirst[1:] = flat_indices[1:] != flat_indices[:-1]
+
+    return np.unravel_index(flat_indices[isFirst], segmentation_arr.shape), new_values[isFirst]
@@ -0,0 +1,345 @@
+# ============ Import python packages ============
+import io
+import os
+import json
+import time
+import zlib
+import queue
+import struct
+import threading
+import numpy as np
+from pathlib import Path
+
+
+# ============ Constants ============
+JOURNAL_MAGIC = b"HSPJ"
+JOURNAL_VERSION = 1
+RECORD_HEADER = struct.Struct("<I") # size of the compressed record
+
+
+# ============ Record encoding ============
+def encode_edit(indices, old_values, new_values, shape):
+    """
+    Encode an edit as a compact sparse delta: sorted flat indices (delta encoded), old and new labels, compressed
+
+    Parameters
+    ----------
+    indices : tuple of arrays
+        multi-index of the edited voxels
+    old_values : ndarray
+        values before the edit
+    new_values : int or ndarray
+        values after the edit
+    shape : tuple(int)
+        shape of the segmentation volume
+
+    Returns
+    ----------
+    record : bytes
+        compressed record
+
+    """
+    flat_indices = np.ravel_multi_index(tuple(np.asarray(i) for i in indices), shape)
+    order = np.argsort(flat_indices, kind='stable')
+    flat_indices = flat_indices[order]
+
+    old_values = np.asarray(old_values).ravel()[order]
+    new_values = np.asarray(new_values)
+    if new_values.ndim > 0:
+        new_values = new_values.ravel()[order]
+
+    buffer = io.BytesIO()
+    np.save(buffer, np.diff(flat_indices, prepend=0))
+    np.save(buffer, old_values)
+    np.save(buffer, new_values)
+
+    return zlib.compress(buffer.getvalue())
+
+
+def decode_edit(record):
+    """
+    Decode a record created by encode_edit
+
+    Parameters
+    ----------
+    record : bytes
+        compressed record
+
+    Returns
+    ----------
+    flat_indices : ndarray
+        flat indices of the edited voxels
+    old_values : ndarray
+        values before the edit
+    new_values : ndarray
+        values after the edit (0-d array if the same label was written everywhere)
+
+    """
+    buffer = io.BytesIO(zlib.decompress(record))
+    flat_indices = np.cumsum(np.load(buffer))
+    old_values = np.load(buffer)
+    new_values = np.load(buffer)
+
+    return flat_indices, old_values, new_values
+
+
+# ============ Journal file ============
+def read_journal(file_path):
+    """
+    Read a journal file. A truncated last record (crash during the writing) is ignored.
+
+    Parameters
+    ----------
+    file_path : str
+        path of the journal
+
+    Returns
+    ----------
+    header : dict
+        journal information (shape of the segmentation, base segmentation file). None if the file is not a journal.
+    records : list[bytes]
+        compressed records, in the order of the edits
+
+    """
+    records = []
+    with open(file_path, 'rb') as f:
+        if f.read(len(JOURNAL_MAGIC)) != JOURNAL_MAGIC:
+            return None, records
+
+        header_size = f.read(RECORD_HEADER.size)
+        if len(header_size) != RECORD_HEADER.size:
+            return None, records
+        try:
+            header = json.loads(f.read(RECORD_HEADER.unpack(header_size)[0]).decode())
+        except ValueError:
+            return None, records
+
+        while True:
+            record_size = f.read(RECORD_HEADER.size)
+            if len(record_size) != RECORD_HEADER.size:
+                break
+            record = f.read(RECORD_HEADER.unpack(record_size)[0])
+            if len(record) != RECORD_HEADER.unpack(record_size)[0]:
+                break
+            records.append(record)
+
+    return header, records
+
+
+def is_same_base(old_header, header):
+    """
+    Check if a journal was started from the same segmentation (a journal can only be replayed on it)
+
+    Parameters
+    ----------
+    old_header : dict
+        header of the journal file (None if the file is not a journal)
+    header : dict
+        header of the current segmentation
+
+    Returns
+    ----------
+    isSameBase : bool
+
+    """
+    return (old_header is not None) and all(old_header.get(key) == value for key, value in header.items())
+
+
+def get_archived_journal_paths(file_path):
+    """
+    Journals archived by archive_journal for a journal path, the newest first
+
+    Parameters
+    ----------
+    file_path : str
+        path of the journal
+
+    Returns
+    ----------
+    archived_paths : list[Pathlib.Path]
+
+    """
+    file_path = Path(file_path)
+    return sorted(file_path.parent.glob(file_path.stem + "_*" + file_path.suffix), reverse=True)
+
+
+def archive_journal(file_path):
+    """
+    Keep a journal under a timestamped name, so that a new journal can be started at its path
+
+    Parameters
+    ----------
+    file_path : str
+        path of the journal
+
+    Returns
+    ----------
+    archive_path : Pathlib.Path
+        new path of the journal
+
+    """
+    file_path = Path(file_path)
+    timestamp = time.strftime("%Y%m%d-%H%M%S")
+
+    archive_path = file_path.with_name(f"{file_path.stem}_{timestamp}{file_path.suffix}")
+    index = 1
+    while archive_path.exists():
+        archive_path = file_path.with_name(f"{file_path.stem}_{timestamp}-{index}{file_path.suffix}")
+        index += 1
+
+    os.replace(file_path, archive_path)
+
+    return archive_path
+
+
+def find_matching_journal(file_path, header):
+    """
+    Find a journal with edits which can be replayed on a segmentation: the journal at file_path, then the archived
+    journals (the newest first)
+
+    Parameters
+    ----------
+    file_path : str
+        path of the journal
+    header : dict
+        header of the current segmentation
+
+    Returns
+    ----------
+    journal_path : Pathlib.Path
+        path of the matching journal. None if no journal matches.
+    records : list[bytes]
+        compressed records of the matching journal
+
+    """
+    file_path = Path(file_path)
+    candidate_paths = ([file_path] if file_path.exists() else []) + get_archived_journal_paths(file_path)
+
+    for journal_path in candidate_paths:
+        old_header, records = read_journal(journal_path)
+        if is_same_base(old_header, header) and (len(records) > 0):
+            return journal_path, records
+
+    return None, []
+
+
+def replay_journal(records, segmentation_arr):
+    """
+    Apply the edits of a journal on a segmentation (in place)
+
+    Parameters
+    ----------
+    records : list[bytes]
+        compressed records, in the order of the edits
+    segmentation_arr : ndarray
+        segmentation on which the journal was started (the last saved segmentation)
+
+    Returns
+    ----------
+    nbr_replayed : int
+        number of edits replayed (stops at the first corrupted record)
+
+    """
+    nbr_replayed = 0
+    for record in records:
+        try:
+            flat_indices, _, new_values = decode_edit(record)
+        except (zlib.error, ValueError):
+            break
+        np.put(segmentation_arr, flat_indices, new_values)
+        nbr_replayed += 1
+
+    return nbr_replayed
+
+
+# ============ Define journal class ============
+class EditJournal:
+    """
+    A class used to record the edits of a segmentation in an append-only file, to recover them after a crash.
+    Edits are encoded, compressed and written by a background thread.
+
+    """
+    def __init__(self, file_path, header, records=None):
+        """
+        Initilialisation: create the journal file and start the writing thread
+
+        Parameters
+        ----------
+        file_path : str
+            path of the journal
+        header : dict
+            journal information, must contain the "shape" of the segmentation
+        records : list[bytes]
+            records of a previous journal (replayed edits) written at the beginning of the new journal
+
+        """
+        self.file_path = str(file_path)
+        self.header = dict(header, version=JOURNAL_VERSION)
+        self.shape = tuple(header["shape"])
+        self.nbr_records = len(records or []) # records written or queued
+
+        Path(self.file_path).parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.file_path, 'wb')
+        header_bytes = json.dumps(self.header).encode()
+        self._file.write(JOURNAL_MAGIC + RECORD_HEADER.pack(len(header_bytes)) + header_bytes)
+        for record in (records or []):
+            self._file.write(RECORD_HEADER.pack(len(record)) + record)
+        self._file.flush()
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def record(self, indices, old_values, new_values):
+        """
+        Add an edit to the journal (encoded and written in background)
+
+        Parameters
+        ----------
+        indices : tuple of arrays
+            multi-index of the edited voxels
+        old_values : ndarray
+            values before the edit
+        new_values : int or ndarray
+            values after the edit
+
+        """
+        if len(indices) > 0 and np.size(indices[0]) > 0:
+            self._queue.put((indices, old_values, new_values))
+            self.nbr_records += 1
+
+    def close(self, isDeleted=False):
+        """
+        Write the pending edits and close the journal
+
+        Parameters
+        ----------
+        isDeleted : bool
+            if True, the journal file is deleted (e.g. the segmentation has been saved)
+
+        """
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+
+        if isDeleted and os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def _run(self):
+        """
+        Background loop: encode and append the edits, flush to disk when there is no pending edit
+
+        """
+        while True:
+            edit = self._queue.get()
+            if edit is None:
+                break
+
+            record = encode_edit(*edit, self.shape)
+            self._file.write(RECORD_HEADER.pack(len(record)) + record)
+
+            if self._queue.empty():
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+        self._file.flush()
@@ -0,0 +1,222 @@
+# ============ Import python packages ============
+import numpy as np
+
+
+# ============ Constants ============
+CHUNK_SIZE = 2 ** 24 # number of voxels counted at once by a full computation (limits the temporary int64 copy)
+
+
+# ============ Define label statistics class ============
+class LabelStatistics:
+    """
+    A class used to keep the voxel count and the bounding box of each label of a segmentation.
+    Statistics are computed once from the whole volume (np.bincount pass), then updated from each edit (delta counting):
+    the voxel counts and the growth of the bounding boxes are exact, a bounding box is only recomputed (inside its
+    previous extent) when its label lost voxels.
+
+    """
+    def __init__(self, voxel_volume=1.0):
+        """
+        Initilialisation
+
+        Parameters
+        ----------
+        voxel_volume : float
+            physical volume of a voxel (e.g. in mm³)
+
+        """
+        self.voxel_volume = voxel_volume
+        self.isComputed = False
+
+        self.counts = np.zeros(1, dtype=np.int64)
+        self.bbox_min = np.zeros((1, 3), dtype=np.int64)
+        self.bbox_max = np.zeros((1, 3), dtype=np.int64) # included (z, y, x)
+        self._stale_labels = set()
+
+    def _ensure_size(self, max_label):
+        """
+        Grow the arrays so that max_label can be stored
+
+        Parameters
+        ----------
+        max_label : int
+            highest label id
+
+        """
+        nbr_labels = len(self.counts)
+        if max_label < nbr_labels:
+            return
+
+        new_nbr_labels = max(max_label + 1, 2 * nbr_labels)
+        ndim = self.bbox_min.shape[1]
+        self.counts = np.concatenate([self.counts, np.zeros(new_nbr_labels - nbr_labels, dtype=np.int64)])
+        self.bbox_min = np.concatenate([self.bbox_min, np.zeros((new_nbr_labels - nbr_labels, ndim), dtype=np.int64)])
+        self.bbox_max = np.concatenate([self.bbox_max, np.zeros((new_nbr_labels - nbr_labels, ndim), dtype=np.int64)])
+
+    def compute(self, segmentation_arr):
+        """
+        Compute the statistics from the whole volume: voxel counts in a single np.bincount pass (by chunks of slices),
+        bounding boxes in a single pass (scipy.ndimage.find_objects)
+
+        Parameters
+        ----------
+        segmentation_arr : ndarray
+            3D labelled data (0 is the background)
+
+        """
+        from scipy import ndimage
+
+        counts = np.zeros(1, dtype=np.int64)
+        slice_size = max(int(np.prod(segmentation_arr.shape[1:])), 1)
+        nbr_slices = max(CHUNK_SIZE // slice_size, 1)
+
+        for first_slice in range(0, segmentation_arr.shape[0], nbr_slices):
+            chunk_counts = np.bincount(np.asarray(segmentation_arr[first_slice:first_slice + nbr_slices]).ravel())
+            if len(chunk_counts) > len(counts):
+                counts = np.concatenate([counts, np.zeros(len(chunk_counts) - len(counts), dtype=np.int64)])
+            counts[:len(chunk_counts)] += chunk_counts
+
+        self.counts = counts
+        self.bbox_min = np.zeros((len(counts), segmentation_arr.ndim), dtype=np.int64)
+        self.bbox_max = np.zeros((len(counts), segmentation_arr.ndim), dtype=np.int64)
+        for index, bounding_box in enumerate(ndimage.find_objects(segmentation_arr)):
+            if bounding_box is not None:
+                self.bbox_min[index + 1] = [s.start for s in bounding_box]
+                self.bbox_max[index + 1] = [s.stop - 1 for s in bounding_box]
+
+        self._stale_labels = set()
+        self.isComputed = True
+
+    def update(self, indices, old_values, new_values):
+        """
+        Update the statistics from an edit of the segmentation (ignored until the statistics are computed)
+
+        Parameters
+        ----------
+        indices : tuple of arrays
+            multi-index of the edited voxels
+        old_values : ndarray
+            values before the edit
+        new_values : int or ndarray
+            values after the edit
+
+        """
+        if not self.isComputed:
+            return
+
+        old_values = np.asarray(old_values).ravel()
+        if len(old_values) == 0:
+            return
+
+        positions = np.stack([np.asarray(index).ravel() for index in indices], axis=1)
+        if np.ndim(new_values) == 0:
+            new_values = np.full(len(old_values), new_values, dtype=old_values.dtype)
+        else:
+            new_values = np.asarray(new_values).ravel()
+
+        # only the voxels whose label changes
+        isChanged = old_values != new_values
+        old_values, new_values, positions = old_values[isChanged], new_values[isChanged], positions[isChanged]
+        if len(old_values) == 0:
+            return
+
+        self._ensure_size(int(max(old_values.max(), new_values.max())))
+
+        # === Bounding boxes: grown by the new voxels, recomputed later for the labels which lost voxels ===
+        order = np.argsort(new_values, kind='stable')
+        labels, starts = np.unique(new_values[order], return_index=True)
+        sorted_positions = positions[order]
+        new_min = np.minimum.reduceat(sorted_positions, starts, axis=0)
+        new_max = np.maximum.reduceat(sorted_positions, starts, axis=0)
+
+        for label, label_min, label_max in zip(labels, new_min, new_max):
+            if self.counts[label] == 0:
+                self.bbox_min[label], self.bbox_max[label] = label_min, label_max
+            else:
+                self.bbox_min[label] = np.minimum(self.bbox_min[label], label_min)
+                self.bbox_max[label] = np.maximum(self.bbox_max[label], label_max)
+
+        # === Delta counting ===
+        old_counts = np.bincount(old_values)
+        new_counts = np.bincount(new_values)
+        self.counts[:len(old_counts)] -= old_counts
+        self.counts[:len(new_counts)] += new_counts
+
+        self._stale_labels.update(np.flatnonzero(old_counts).tolist())
+
+    def _update_stale_bounding_boxes(self, segmentation_arr):
+        """
+        Recompute the bounding boxes of the labels which lost voxels, only inside their previous bounding box
+
+        Parameters
+        ----------
+        segmentation_arr : ndarray
+            3D labelled data (0 is the background)
+
+        """
+        for label in self._stale_labels:
+            if (label == 0) or (self.counts[label] == 0):
+                continue
+
+            bounding_box = tuple(slice(start, stop + 1) for start, stop in zip(self.bbox_min[label], self.bbox_max[label]))
+            positions = np.nonzero(np.asarray(segmentation_arr[bounding_box]) == label)
+            self.bbox_max[label] = self.bbox_min[label] + [position.max() for position in positions]
+            self.bbox_min[label] = self.bbox_min[label] + [position.min() for position in positions]
+
+        self._stale_labels = set()
+
+    def get_statistics(self, segmentation_arr):
+        """
+        Statistics of the labels present in the segmentation (computed at the first call)
+
+        Parameters
+        ----------
+        segmentation_arr : ndarray
+            3D labelled data (0 is the background)
+
+        Returns
+        ----------
+        statistics : list[dict]
+            for each label: "label", "voxel_count", "volume" (voxel count * voxel volume) and "bounding_box"
+            (first and last voxel indexes as (z, y, x))
+
+        """
+        if not self.isComputed:
+            self.compute(segmentation_arr)
+        self._update_stale_bounding_boxes(segmentation_arr)
+
+        statistics = []
+        for label in np.flatnonzero(self.counts[1:] > 0) + 1:
+            statistics.append({
+                "label": int(label),
+                "voxel_count": int(self.counts[label]),
+                "volume": float(self.counts[label] * self.voxel_volume),
+                "bounding_box": (tuple(self.bbox_min[label].tolist()), tuple(self.bbox_max[label].tolist())),
+            })
+
+        return statistics
+
+
+# ============ Full computation ============
+def compute_label_statistics(segmentation_arr, voxel_volume=1.0):
+    """
+    Compute the statistics of a segmentation from the whole volume in a new LabelStatistics (to be run in a napari
+    worker, the statistics used by the viewer are not modified while they are computed)
+
+    Parameters
+    ----------
+    segmentation_arr : ndarray
+        3D labelled data (0 is the background)
+    voxel_volume : float
+        physical volume of a voxel (e.g. in mm³)
+
+    Returns
+    ----------
+    statistics : LabelStatistics
+        computed statistics
+
+    """
+    statistics = LabelStatistics(voxel_volume)
+    statistics.compute(segmentation_arr)
+
+    return statistics
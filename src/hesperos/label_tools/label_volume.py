@@ -0,0 +1,91 @@
+# ============ Import python packages ============
+import numpy as np
+
+
+# ============ Constants ============
+LABEL_DTYPES = [np.uint8, np.uint16, np.uint32]
+DEFAULT_MAX_LABEL = 255 # every annotation protocol has less than 255 structures
+
+
+# ============ Label volumes ============
+def get_label_dtype(max_label=DEFAULT_MAX_LABEL):
+    """
+    Get the smallest unsigned integer type able to store the labels
+
+    Parameters
+    ----------
+    max_label : int
+        highest label id
+
+    Returns
+    ----------
+    dtype : numpy.dtype
+        uint8, uint16 or uint32
+
+    """
+    for dtype in LABEL_DTYPES:
+        if max_label <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+
+    raise ValueError(f"Too many labels: {max_label}")
+
+
+def create_label_volume(shape, max_label=DEFAULT_MAX_LABEL):
+    """
+    Create an empty label volume with the smallest type able to store the labels
+
+    Parameters
+    ----------
+    shape : tuple(int)
+        shape of the volume (the shape of the image)
+    max_label : int
+        highest label id
+
+    Returns
+    ----------
+    label_arr : ndarray
+        volume filled with the background label (0)
+
+    """
+    return np.zeros(shape, dtype=get_label_dtype(max_label))
+
+
+def as_label_volume(array, max_label=None):
+    """
+    Convert a volume (e.g. read from a file) to a label volume of the smallest unsigned integer type able to store its
+    labels. The array is returned without copy if it already has this type.
+
+    Parameters
+    ----------
+    array : ndarray
+        labelled volume
+    max_label : int
+        highest label id. If None, the maximum of the array is used.
+
+    Returns
+    ----------
+    label_arr : ndarray
+        label volume
+
+    Raises
+    ----------
+    ValueError
+        if the volume contains negative values
+
+    """
+    array = np.asarray(array)
+    if array.size == 0:
+        return array.astype(get_label_dtype(), copy=False)
+
+    if array.dtype.kind != "u":
+        min_value, max_value = np.min(array), np.max(array)
+        if min_value < 0:
+            raise ValueError("Negative label value")
+    else:
+        max_value = np.max(array)
+
+    if max_label is None:
+        max_label = int(max_value)
+    dtype = get_label_dtype(max(int(max_label), int(max_value)))
+
+    return array.astype(dtype, copy=False)
@@ -0,0 +1,193 @@
+# ============ Import python packages ============
+import numpy as np
+
+
+# ============ Constants ============
+MAX_DISTANCE = 3 # maximum displacement (in pixels) of a label border from one slice to the next
+INTENSITY_TOLERANCE = 2.5 # accepted intensities: mean +/- INTENSITY_TOLERANCE * std of the label on the source slice
+SEED_EROSION_RADIUS = 1 # the borders of the previous slice labels are not used as seeds (they can move)
+
+
+# ============ Slice extraction ============
+def get_axis_slices(array, axis, slice_indexes):
+    """
+    Read slices of a volume along an axis. For a lazily read volume, only the needed slices are read along the first
+    axis; along another axis every slice is read but only the needed rows or columns are kept (LazyVolume.take), so the
+    whole volume is never held in memory.
+
+    Parameters
+    ----------
+    array : ndarray or LazyVolume
+        3D volume (z, y, x)
+    axis : int
+        axis of the slices
+    slice_indexes : list[int]
+        indexes of the slices along the axis
+
+    Returns
+    ----------
+    slices : ndarray
+        3D array, the slices are stacked on the first axis
+
+    """
+    return np.moveaxis(np.asarray(array.take(list(slice_indexes), axis=axis)), axis, 0)
+
+
+# ============ Region growing ============
+def get_label_intensity_model(image_slice, label_slice):
+    """
+    Mean and standard deviation of the image intensities of each label of a slice (single np.bincount pass per moment)
+
+    Parameters
+    ----------
+    image_slice : ndarray
+        2D image
+    label_slice : ndarray
+        2D labels (0 is the background)
+
+    Returns
+    ----------
+    means : ndarray
+        mean intensity of each label id
+    stds : ndarray
+        standard deviation of the intensities of each label id (at least 1% of the intensity range of the slice)
+
+    """
+    labels = label_slice.ravel().astype(np.intp)
+    intensities = image_slice.ravel().astype(np.float64)
+
+    counts = np.maximum(np.bincount(labels), 1)
+    means = np.bincount(labels, weights=intensities) / counts
+    variances = np.bincount(labels, weights=intensities ** 2) / counts - means ** 2
+
+    min_std = max(0.01 * float(intensities.max() - intensities.min()), 1e-6)
+
+    return means, np.maximum(np.sqrt(np.maximum(variances, 0)), min_std)
+
+
+def propagate_slice(previous_labels, image_slice, means, stds, max_distance=MAX_DISTANCE, intensity_tolerance=INTENSITY_TOLERANCE, erosion_radius=SEED_EROSION_RADIUS):
+    """
+    Propagate the labels of a slice to the next one by region growing, all labels at once:
+    - each pixel can only take the label nearest to it on the previous slice, at most max_distance pixels away
+    - its intensity must match the intensity model of this label
+    - the pixel must be connected to a seed: the interior of the label on the previous slice
+
+    Parameters
+    ----------
+    previous_labels : ndarray
+        2D labels of the previous slice
+    image_slice : ndarray
+        2D image of the slice to annotate
+    means : ndarray
+        mean intensity of each label id
+    stds : ndarray
+        standard deviation of the intensities of each label id
+    max_distance : float
+        maximum displacement (in pixels) of a label border
+    intensity_tolerance : float
+        accepted intensities are mean +/- intensity_tolerance * std
+    erosion_radius : int
+        the pixels closer than erosion_radius to another label are not seeds
+
+    Returns
+    ----------
+    labels : ndarray
+        2D labels of the slice
+
+    """
+    from scipy import ndimage
+
+    previous_labels = np.asarray(previous_labels)
+    if not previous_labels.any():
+        return np.zeros_like(previous_labels)
+
+    # === Label allowed for each pixel: nearest label of the previous slice ===
+    distances, nearest_indices = ndimage.distance_transform_edt(previous_labels == 0, return_indices=True)
+    candidates = previous_labels[tuple(nearest_indices)]
+
+    nbr_labels = max(int(previous_labels.max()) + 1, len(means))
+    means = np.pad(means, (0, nbr_labels - len(means)), constant_values=0)
+    stds = np.pad(stds, (0, nbr_labels - len(stds)), constant_values=np.inf) # labels without model accept all intensities
+
+    isAccepted = (distances <= max_distance) & (np.abs(image_slice - means[candidates]) <= intensity_tolerance * stds[candidates])
+
+    # === Seeds: interior of the previous labels (whole label if it is too thin to be eroded) ===
+    footprint = np.ones((2 * erosion_radius + 1,) * previous_labels.ndim, dtype=bool)
+    isSeed = (ndimage.minimum_filter(previous_labels, footprint=footprint) == ndimage.maximum_filter(previous_labels, footprint=footprint)) & (previous_labels > 0)
+    isThin = (np.bincount(previous_labels.ravel(), minlength=nbr_labels) > 0) & (np.bincount(previous_labels[isSeed], minlength=nbr_labels) == 0)
+    isThin[0] = False
+    isSeed |= isThin[previous_labels]
+
+    # === Growing: accepted regions (split by label) which contain a seed ===
+    components, _ = ndimage.label(isAccepted)
+    keys = components.astype(np.int64) * nbr_labels + candidates
+    seed_keys = np.unique(keys[isSeed & isAccepted])
+    isGrown = isAccepted & np.isin(keys, seed_keys)
+
+    labels = np.where(isGrown, candidates, 0).astype(previous_labels.dtype)
+
+    # holes (e.g. noisy pixels) take the label around them
+    isHole = ndimage.binary_fill_holes(labels > 0) & (labels == 0)
+    labels[isHole] = candidates[isHole]
+
+    return labels
+
+
+def propagate_labels(image_arr, segmentation_arr, axis, source_index, slice_indexes, max_distance=MAX_DISTANCE, intensity_tolerance=INTENSITY_TOLERANCE):
+    """
+    Propagate the labels of a slice to the following slices, one slice after the other (run in a napari worker).
+    The labels already present on the following slices are kept, and guide the propagation to the next slices.
+
+    Parameters
+    ----------
+    image_arr : ndarray or LazyVolume
+        3D image (z, y, x)
+    segmentation_arr : ndarray
+        3D labels (z, y, x)
+    axis : int
+        axis of the slices
+    source_index : int
+        index of the annotated slice
+    slice_indexes : list[int]
+        indexes of the slices to annotate, in the order of the propagation
+    max_distance : float
+        maximum displacement (in pixels) of a label border from one slice to the next
+    intensity_tolerance : float
+        accepted intensities are mean +/- intensity_tolerance * std of the label on the source slice
+
+    Yields
+    ----------
+    progress : tuple(int, int)
+        number of propagated slices and total number of slices
+
+    Returns
+    ----------
+    edit : tuple
+        (indices, new_values) of the voxels labelled by the propagation (unlabelled voxels only)
+
+    """
+    all_indexes = [source_index] + list(slice_indexes)
+    image_slices = get_axis_slices(image_arr, axis, all_indexes)
+    label_slices = get_axis_slices(segmentation_arr, axis, all_indexes)
+
+    means, stds = get_label_intensity_model(image_slices[0], label_slices[0])
+
+    propagated = np.zeros_like(label_slices[1:])
+    previous_labels = label_slices[0]
+    for i in range(1, len(all_indexes)):
+        labels = propagate_slice(previous_labels, image_slices[i], means, stds, max_distance, intensity_tolerance)
+        propagated[i - 1] = np.where(label_slices[i] == 0, labels, 0)
+
+        previous_labels = np.where(label_slices[i] == 0, labels, label_slices[i])
+        yield i, len(slice_indexes)
+
+        if not previous_labels.any():
+            break
+
+    # === Voxels to label, as indices of the volume ===
+    positions = list(np.nonzero(propagated))
+    new_values = propagated[tuple(positions)]
+    positions[0] = np.asarray(slice_indexes)[positions[0]]
+    positions.insert(axis, positions.pop(0))
+
+    return tuple(positions), new_values
@@ -0,0 +1,275 @@
+# ============ Import python packages ============
+import json
+import bisect
+
+
+# ============ Constants ============
+AXIS_NAMES = ('z', 'y', 'x') # numpy order of the axes
+
+
+# ============ Selected slice text ============
+def format_selected_slice(axis_index, slice_index):
+    """
+    Text of a selected slice, as displayed in the combo box and saved in the TIFF metadata (e.g. "123z")
+
+    Parameters
+    ----------
+    axis_index : int
+        index of the axis in the numpy order (z, y, x)
+    slice_index : int
+        index of the slice along this axis
+
+    Returns
+    ----------
+    text : str
+
+    """
+    return str(slice_index) + AXIS_NAMES[axis_index]
+
+
+def parse_selected_slice(text):
+    """
+    Axis and slice index of a selected slice text (e.g. "123z")
+
+    Parameters
+    ----------
+    text : str
+
+    Returns
+    ----------
+    axis_index : int
+        index of the axis in the numpy order (z, y, x)
+    slice_index : int
+        index of the slice along this axis
+
+    Raises
+    ----------
+    ValueError
+        if the text is not a selected slice
+
+    """
+    text = str(text).strip()
+    if (len(text) < 2) or (text[-1] not in AXIS_NAMES):
+        raise ValueError(f"Incorrect selected slice: {text}")
+
+    return AXIS_NAMES.index(text[-1]), int(text[:-1])
+
+
+def parse_selected_slices_metadata(value):
+    """
+    Selected slices saved in the 'Hesperos_SelectedSlices' metadata of a TIFF file.
+    New version: list of texts (["136z", "170y"]). Old version: slice indexes along z saved as a JSON string ("[136, 170]").
+
+    Parameters
+    ----------
+    value : list(str) or str
+        value of the metadata
+
+    Returns
+    ----------
+    selected_slices : list(tuple(int, int))
+        list of (axis_index, slice_index)
+
+    Raises
+    ----------
+    ValueError
+        if the value is not a list of selected slices
+
+    """
+    if isinstance(value, str):
+        value = [(0, int(slice_index)) for slice_index in json.loads(value)]
+    elif not isinstance(value, list):
+        raise ValueError(f"Incorrect selected slices: {value}")
+
+    return [item if isinstance(item, tuple) else parse_selected_slice(item) for item in value]
+
+
+# ============ Define selected slice registry class ============
+class SelectedSliceRegistry:
+    """
+    A class used to keep the selected slices of interest sorted, on all the axes at once.
+    Slices are stored as (slice_index, axis_index) keys in a sorted list (order of the combo box), and as sorted slice
+    indexes for each axis (navigation to the next/previous selected slice). Searches are binary searches (bisect,
+    O(log n)); add and remove find the position by bisection but insert into / delete from the Python lists, which is
+    O(n) (a memory move, negligible for the few slices selected by hand; the combo box item is inserted in O(n) anyway).
+
+    """
+    def __init__(self, selected_slices=None):
+        """
+        Initilialisation
+
+        Parameters
+        ----------
+        selected_slices : list(tuple(int, int))
+            list of (axis_index, slice_index)
+
+        """
+        self.clear()
+        if selected_slices is not None:
+            self.load(selected_slices)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, selected_slice):
+        axis_index, slice_index = selected_slice
+        return self.find(axis_index, slice_index) is not None
+
+    def __iter__(self):
+        return ((axis_index, slice_index) for slice_index, axis_index in self._keys)
+
+    def clear(self):
+        """
+        Remove all the selected slices
+
+        """
+        self._keys = []
+        self._axis_slices = [[] for _ in AXIS_NAMES]
+
+    def load(self, selected_slices):
+        """
+        Replace all the selected slices (sorted once, duplicates are ignored)
+
+        Parameters
+        ----------
+        selected_slices : list(tuple(int, int))
+            list of (axis_index, slice_index)
+
+        """
+        self._keys = sorted({(int(slice_index), int(axis_index)) for axis_index, slice_index in selected_slices})
+        self._axis_slices = [[] for _ in AXIS_NAMES]
+        for slice_index, axis_index in self._keys:
+            self._axis_slices[axis_index].append(slice_index)
+
+    def find(self, axis_index, slice_index):
+        """
+        Position of a selected slice in the sorted list
+
+        Parameters
+        ----------
+        axis_index : int
+            index of the axis in the numpy order (z, y, x)
+        slice_index : int
+            index of the slice along this axis
+
+        Returns
+        ----------
+        position : int
+            position in the sorted list. None if the slice is not selected.
+
+        """
+        key = (int(slice_index), int(axis_index))
+        position = bisect.bisect_left(self._keys, key)
+        if (position < len(self._keys)) and (self._keys[position] == key):
+            return position
+
+        return None
+
+    def add(self, axis_index, slice_index):
+        """
+        Add a selected slice (binary search of the position, O(n) list update)
+
+        Parameters
+        ----------
+        axis_index : int
+            index of the axis in the numpy order (z, y, x)
+        slice_index : int
+            index of the slice along this axis
+
+        Returns
+        ----------
+        position : int
+            position of the new slice in the sorted list. None if the slice was already selected.
+
+        """
+        if self.find(axis_index, slice_index) is not None:
+            return None
+
+        key = (int(slice_index), int(axis_index))
+        position = bisect.bisect_left(self._keys, key)
+        self._keys.insert(position, key)
+        bisect.insort(self._axis_slices[axis_index], key[0])
+
+        return position
+
+    def remove(self, axis_index, slice_index):
+        """
+        Remove a selected slice (binary search of the position, O(n) list update)
+
+        Parameters
+        ----------
+        axis_index : int
+            index of the axis in the numpy order (z, y, x)
+        slice_index : int
+            index of the slice along this axis
+
+        Returns
+        ----------
+        position : int
+            position of the removed slice in the sorted list. None if the slice was not selected.
+
+        """
+        position = self.find(axis_index, slice_index)
+        if position is None:
+            return None
+
+        del self._keys[position]
+        axis_slices = self._axis_slices[axis_index]
+        del axis_slices[bisect.bisect_left(axis_slices, int(slice_index))]
+
+        return position
+
+    def get_next_slice(self, axis_index, slice_index):
+        """
+        Next selected slice along an axis
+
+        Parameters
+        ----------
+        axis_index : int
+            index of the axis in the numpy order (z, y, x)
+        slice_index : int
+            index of the current slice
+
+        Returns
+        ----------
+        next_slice_index : int
+            index of the first selected slice after slice_index. None if there is no selected slice after it.
+
+        """
+        axis_slices = self._axis_slices[axis_index]
+        position = bisect.bisect_right(axis_slices, slice_index)
+
+        return axis_slices[position] if position < len(axis_slices) else None
+
+    def get_previous_slice(self, axis_index, slice_index):
+        """
+        Previous selected slice along an axis
+
+        Parameters
+        ----------
+        axis_index : int
+            index of the axis in the numpy order (z, y, x)
+        slice_index : int
+            index of the current slice
+
+        Returns
+        ----------
+        previous_slice_index : int
+            index of the last selected slice before slice_index. None if there is no selected slice before it.
+
+        """
+        axis_slices = self._axis_slices[axis_index]
+        position = bisect.bisect_left(axis_slices, slice_index)
+
+        return axis_slices[position - 1] if position > 0 else None
+
+    def get_texts(self):
+        """
+        Texts of the selected slices in the sorted order (combo box items and TIFF metadata)
+
+        Returns
+        ----------
+        texts : list(str)
+
+        """
+        return [format_selected_slice(axis_index, slice_index) for slice_index, axis_index in self._keys]
@@ -0,0 +1,255 @@
+# ============ Import python packages ============
+import numpy as np
+from collections import deque
+
+
+# ============ Constants ============
+DEFAULT_MEMORY_BUDGET = 256 * 2**20 # bytes kept in the undo/redo history
+
+
+# ============ Run-length encoding ============
+def encode_run_lengths(flat_indices, old_values, new_values):
+    """
+    Encode the edited voxels of an operation as runs of consecutive voxels with the same old and new labels.
+    If a voxel is edited several times, its first old value and its last new value are kept.
+    Voxels which are not modified (old label equal to the new label) are dropped.
+
+    Parameters
+    ----------
+    flat_indices : ndarray
+        flat indices of the edited voxels, in the order of the edits
+    old_values : ndarray
+        values before the edits
+    new_values : int or ndarray
+        values after the edits
+
+    Returns
+    ----------
+    runs : tuple(ndarray)
+        (starts, lengths, old_values, new_values) of the runs, sorted by flat index
+
+    """
+    flat_indices = np.asarray(flat_indices, dtype=np.int64).ravel()
+    old_values = np.asarray(old_values).ravel()
+    new_values = np.broadcast_to(np.asarray(new_values, dtype=old_values.dtype), flat_indices.shape).ravel()
+
+    # first and last edit of each voxel
+    unique_indices, first_positions = np.unique(flat_indices, return_index=True)
+    if len(unique_indices) != len(flat_indices):
+        _, last_positions = np.unique(flat_indices[::-1], return_index=True)
+        last_positions = len(flat_indices) - 1 - last_positions
+    else:
+        last_positions = first_positions
+    old_values = old_values[first_positions]
+    new_values = new_values[last_positions]
+
+    isChanged = old_values != new_values
+    unique_indices = unique_indices[isChanged]
+    old_values = old_values[isChanged]
+    new_values = new_values[isChanged]
+
+    # a new run starts when the voxels are not consecutive or when a label changes
+    isRunStart = np.ones(len(unique_indices), dtype=bool)
+    isRunStart[1:] = (np.diff(unique_indices) != 1) | (old_values[1:] != old_values[:-1]) | (new_values[1:] != new_values[:-1])
+    run_positions = np.flatnonzero(isRunStart)
+    lengths = np.diff(np.append(run_positions, len(unique_indices)))
+
+    return unique_indices[run_positions], lengths, old_values[run_positions], new_values[run_positions]
+
+
+def decode_run_lengths(runs):
+    """
+    Decode runs created by encode_run_lengths
+
+    Parameters
+    ----------
+    runs : tuple(ndarray)
+        (starts, lengths, old_values, new_values) of the runs
+
+    Returns
+    ----------
+    flat_indices : ndarray
+        flat indices of the edited voxels
+    old_values : ndarray
+        values before the edits
+    new_values : ndarray
+        values after the edits
+
+    """
+    starts, lengths, old_values, new_values = runs
+    offsets = np.cumsum(lengths) - lengths
+    flat_indices = np.arange(np.sum(lengths), dtype=np.int64) + np.repeat(starts - offsets, lengths)
+
+    return flat_indices, np.repeat(old_values, lengths), np.repeat(new_values, lengths)
+
+
+def get_runs_nbytes(runs):
+    """
+    Memory used by encoded runs
+
+    Parameters
+    ----------
+    runs : tuple(ndarray)
+        (starts, lengths, old_values, new_values) of the runs
+
+    Returns
+    ----------
+    nbytes : int
+        number of bytes
+
+    """
+    return sum(array.nbytes for array in runs)
+
+
+# ============ Define undo manager class ============
+class UndoManager:
+    """
+    A class used to undo and redo the edits of a segmentation volume.
+    Each operation (e.g. a brush stroke or a fill) is stored as sparse run-length encoded differences on the flat
+    indices of the volume, so the history does not depend on the displayed axis nor on the slice.
+    When the history exceeds its memory budget, the oldest operations are evicted.
+
+    """
+    def __init__(self, shape, memory_budget=DEFAULT_MEMORY_BUDGET):
+        """
+        Initilialisation
+
+        Parameters
+        ----------
+        shape : tuple(int)
+            shape of the segmentation volume
+        memory_budget : int
+            maximum number of bytes used by the history (the last operation is always kept)
+
+        """
+        self.shape = tuple(shape)
+        self.memory_budget = memory_budget
+
+        self._undo_history = deque()
+        self._redo_history = deque()
+        self._current_operation = []
+        self.nbytes = 0
+
+    @property
+    def can_undo(self):
+        return (len(self._undo_history) > 0) or (len(self._current_operation) > 0)
+
+    @property
+    def can_redo(self):
+        return len(self._redo_history) > 0
+
+    def clear(self):
+        """
+        Remove all the operations of the history
+
+        """
+        self._undo_history.clear()
+        self._redo_history.clear()
+        self._current_operation = []
+        self.nbytes = 0
+
+    def record(self, indices, old_values, new_values, isNewOperation):
+        """
+        Add an edit to the history (the redo history is cleared)
+
+        Parameters
+        ----------
+        indices : tuple of arrays
+            multi-index of the edited voxels
+        old_values : ndarray
+            values before the edit
+        new_values : int or ndarray
+            values after the edit
+        isNewOperation : bool
+            True for the first edit of an operation, False to merge the edit with the current operation
+
+        """
+        if isNewOperation:
+            self._end_operation()
+
+        if self.can_redo:
+            self.nbytes -= sum(get_runs_nbytes(runs) for runs in self._redo_history)
+            self._redo_history.clear()
+
+        if len(indices) == 0 or np.size(indices[0]) == 0:
+            return
+
+        flat_indices = np.ravel_multi_index(tuple(np.asarray(i) for i in indices), self.shape)
+        runs = encode_run_lengths(flat_indices, old_values, new_values)
+        self._current_operation.append(runs)
+        self.nbytes += get_runs_nbytes(runs)
+
+    def undo(self, segmentation_arr):
+        """
+        Undo the last operation
+
+        Parameters
+        ----------
+        segmentation_arr : ndarray
+            segmentation volume (modified in place)
+
+        Returns
+        ----------
+        edit : tuple
+            (indices, old_values, new_values) of the voxels modified by the undo. None if there is nothing to undo.
+
+        """
+        self._end_operation()
+        if len(self._undo_history) == 0:
+            return None
+
+        runs = self._undo_history.pop()
+        self._redo_history.append(runs)
+        flat_indices, old_values, new_values = decode_run_lengths(runs)
+        np.put(segmentation_arr, flat_indices, old_values)
+
+        return np.unravel_index(flat_indices, self.shape), new_values, old_values
+
+    def redo(self, segmentation_arr):
+        """
+        Redo the last undone operation
+
+        Parameters
+        ----------
+        segmentation_arr : ndarray
+            segmentation volume (modified in place)
+
+        Returns
+        ----------
+        edit : tuple
+            (indices, old_values, new_values) of the voxels modified by the redo. None if there is nothing to redo.
+
+        """
+        if len(self._redo_history) == 0:
+            return None
+
+        self._end_operation()
+        runs = self._redo_history.pop()
+        self._undo_history.append(runs)
+        flat_indices, old_values, new_values = decode_run_lengths(runs)
+        np.put(segmentation_arr, flat_indices, new_values)
+
+        return np.unravel_index(flat_indices, self.shape), old_values, new_values
+
+    def _end_operation(self):
+        """
+        Merge the edits of the current operation in a single entry of the undo history, then evict the oldest entries if
+        the memory budget is exceeded
+
+        """
+        if len(self._current_operation) == 0:
+            return
+
+        if len(self._current_operation) == 1:
+            runs = self._current_operation[0]
+        else:
+            edits = [decode_run_lengths(runs) for runs in self._current_operation]
+            runs = encode_run_lengths(*(np.concatenate(arrays) for arrays in zip(*edits)))
+        self.nbytes += get_runs_nbytes(runs) - sum(get_runs_nbytes(r) for r in self._current_operation)
+        self._current_operation = []
+
+        if len(runs[0]) > 0:
+            self._undo_history.append(runs)
+
+        while (self.nbytes > self.memory_budget) and (len(self._undo_history) > 1):
+            self.nbytes -= get_runs_nbytes(self._undo_history.popleft())
@@ -0,0 +1,192 @@
+# ============ Import python packages ============
+import numpy as np
+
+
+# ============ Constants ============
+MAX_NBR_PENDING = 256 # added landmarks scanned linearly by the queries before being merged into the sorted axes
+
+
+# ============ Define landmark index class ============
+class LandmarkIndex:
+    """
+    A class used to query landmark positions without scanning the whole list: nearest landmark of a point (KD-tree)
+    and landmarks close to a slice (positions sorted along each axis, binary search).
+    Landmarks are identified by their index in the list of positions. Added landmarks are kept in an unsorted buffer,
+    scanned linearly by the queries, and merged into the sorted axes (and the KD-tree) once MAX_NBR_PENDING landmarks
+    are waiting: adding a landmark does not copy the sorted arrays. Removing a landmark updates the sorted axes
+    (O(n)), the KD-tree is rebuilt at the next nearest query.
+
+    """
+    def __init__(self, positions=None, ndim=3):
+        """
+        Initilialisation
+
+        Parameters
+        ----------
+        positions : ndarray
+            (N, ndim) array of landmark positions (z, y, x)
+        ndim : int
+            number of dimensions of the positions
+
+        """
+        self.ndim = ndim
+        self.set_positions(np.zeros((0, ndim)) if positions is None else positions)
+
+    def __len__(self):
+        return len(self._positions) + len(self._pending_positions)
+
+    @property
+    def positions(self):
+        """(N, ndim) array of all the landmark positions (z, y, x)"""
+        if len(self._pending_positions) == 0:
+            return self._positions
+
+        return np.vstack([self._positions, np.asarray(self._pending_positions)])
+
+    def set_positions(self, positions):
+        """
+        Replace all the landmarks
+
+        Parameters
+        ----------
+        positions : ndarray
+            (N, ndim) array of landmark positions (z, y, x)
+
+        """
+        self._positions = np.asarray(positions, dtype=np.float64).reshape(-1, self.ndim)
+        self._pending_positions = [] # added landmarks, not merged yet (indexes following the merged ones)
+
+        # for each axis: landmark indexes sorted by coordinate, and the sorted coordinates
+        self._sorted_indexes = [np.argsort(self._positions[:, axis], kind='stable') for axis in range(self.ndim)]
+        self._sorted_coordinates = [self._positions[order, axis] for axis, order in enumerate(self._sorted_indexes)]
+        self._tree = None
+
+    def _merge_pending(self):
+        """
+        Merge the added landmarks into the sorted axes: one insertion of all of them per axis
+
+        """
+        if len(self._pending_positions) == 0:
+            return
+
+        new_positions = np.asarray(self._pending_positions)
+        first_index = len(self._positions)
+        self._positions = np.vstack([self._positions, new_positions])
+        self._pending_positions = []
+
+        for axis in range(self.ndim):
+            order = np.argsort(new_positions[:, axis], kind='stable')
+            new_coordinates = new_positions[order, axis]
+            insert_positions = np.searchsorted(self._sorted_coordinates[axis], new_coordinates, side='right')
+            self._sorted_coordinates[axis] = np.insert(self._sorted_coordinates[axis], insert_positions, new_coordinates)
+            self._sorted_indexes[axis] = np.insert(self._sorted_indexes[axis], insert_positions, first_index + order)
+        self._tree = None
+
+    def add(self, position):
+        """
+        Add a landmark at the end of the list (kept in the buffer of added landmarks)
+
+        Parameters
+        ----------
+        position : ndarray
+            position (z, y, x) of the new landmark
+
+        """
+        self._pending_positions.append(np.asarray(position, dtype=np.float64).reshape(self.ndim))
+
+        if len(self._pending_positions) >= MAX_NBR_PENDING:
+            self._merge_pending()
+
+    def remove(self, index):
+        """
+        Remove a landmark, the indexes of the next landmarks are shifted by one
+
+        Parameters
+        ----------
+        index : int
+            index of the landmark to remove
+
+        """
+        nbr_merged = len(self._positions)
+        if index >= nbr_merged:
+            del self._pending_positions[index - nbr_merged]
+            return
+
+        self._positions = np.delete(self._positions, index, axis=0)
+
+        for axis in range(self.ndim):
+            sorted_indexes = self._sorted_indexes[axis]
+            remove_position = np.flatnonzero(sorted_indexes == index)[0]
+            sorted_indexes = np.delete(sorted_indexes, remove_position)
+            sorted_indexes[sorted_indexes > index] -= 1
+            self._sorted_indexes[axis] = sorted_indexes
+            self._sorted_coordinates[axis] = np.delete(self._sorted_coordinates[axis], remove_position)
+        self._tree = None
+
+    def nearest(self, point):
+        """
+        Find the landmark nearest to a point
+
+        Parameters
+        ----------
+        point : ndarray
+            position (z, y, x)
+
+        Returns
+        ----------
+        index : int
+            index of the nearest landmark. None if there is no landmark.
+
+        """
+        if len(self) == 0:
+            return None
+
+        point = np.asarray(point, dtype=np.float64).reshape(self.ndim)
+        nearest_distance, nearest_index = np.inf, None
+
+        if len(self._positions) > 0:
+            if self._tree is None:
+                from scipy.spatial import cKDTree
+
+                self._tree = cKDTree(self._positions)
+            nearest_distance, nearest_index = self._tree.query(point)
+
+        # added landmarks (not in the KD-tree yet)
+        if len(self._pending_positions) > 0:
+            distances = np.linalg.norm(np.asarray(self._pending_positions) - point, axis=1)
+            pending_index = int(np.argmin(distances))
+            if distances[pending_index] < nearest_distance:
+                nearest_index = len(self._positions) + pending_index
+
+        return int(nearest_index)
+
+    def within_slices(self, axis, slice_index, nbr_slices=0):
+        """
+        Find the landmarks at most nbr_slices slices away from a slice
+
+        Parameters
+        ----------
+        axis : int
+            axis of the slices
+        slice_index : int
+            index of the slice
+        nbr_slices : int
+            maximum distance to the slice (0 for the landmarks in the slice)
+
+        Returns
+        ----------
+        indexes : ndarray
+            sorted indexes of the landmarks
+
+        """
+        sorted_coordinates = self._sorted_coordinates[axis]
+        first = np.searchsorted(sorted_coordinates, slice_index - nbr_slices, side='left')
+        last = np.searchsorted(sorted_coordinates, slice_index + nbr_slices, side='right')
+        indexes = self._sorted_indexes[axis][first:last]
+
+        # added landmarks (not in the sorted axes yet)
+        if len(self._pending_positions) > 0:
+            isNear = np.abs(np.asarray(self._pending_positions)[:, axis] - slice_index) <= nbr_slices
+            indexes = np.concatenate([indexes, len(self._positions) + np.flatnonzero(isNear)])
+
+        return np.sort(indexes)
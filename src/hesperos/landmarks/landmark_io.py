@@ -0,0 +1,251 @@
+# ============ Import python packages ============
+import os
+import json
+import numpy as np
+from pathlib import Path
+
+
+# ============ Constants ============
+# DIVA JSON schema: {"_oriented_landmarks_parameters": {"_volume_positions": [{"x", "y", "z"}, ...], "_local_rotations": [{"x", "y", "z", "w"}, ...]}}
+PARAMETERS_KEY = "_oriented_landmarks_parameters"
+POSITIONS_KEY = "_volume_positions"
+ROTATIONS_KEY = "_local_rotations"
+POSITION_AXES = ("x", "y", "z")
+ROTATION_AXES = ("x", "y", "z", "w")
+
+SIDECAR_SUFFIX = ".npz"
+SIDECAR_MIN_LANDMARKS = 1000 # the binary sidecar is only written for large landmark sets
+
+
+# ============ DIVA JSON ============
+def parse_oriented_landmarks(oriented_landmarks_data):
+    """
+    Parse the content of a DIVA oriented landmarks file straight into arrays
+
+    Parameters
+    ----------
+    oriented_landmarks_data : dict
+        decoded JSON content
+
+    Returns
+    ----------
+    diva_positions : ndarray
+        (N, 3) array of DIVA positions (x, y, z)
+    quaternions : ndarray
+        (N, 4) array of local rotations (x, y, z, w)
+
+    Raises
+    ----------
+    ValueError
+        if the content does not follow the DIVA schema
+
+    """
+    try:
+        parameters = oriented_landmarks_data[PARAMETERS_KEY]
+        positions = parameters[POSITIONS_KEY]
+        rotations = parameters[ROTATIONS_KEY]
+
+        diva_positions = np.fromiter(
+            (position[axis] for position in positions for axis in POSITION_AXES), dtype=np.float64, count=3 * len(positions)
+        ).reshape(-1, 3)
+        quaternions = np.fromiter(
+            (rotation[axis] for rotation in rotations for axis in ROTATION_AXES), dtype=np.float64, count=4 * len(rotations)
+        ).reshape(-1, 4)
+    except (KeyError, TypeError) as error:
+        raise ValueError(f"Incorrect oriented landmarks format: {error}")
+
+    if len(diva_positions) != len(quaternions):
+        raise ValueError("Incorrect oriented landmarks format: different numbers of positions and rotations")
+
+    return diva_positions, quaternions
+
+
+def read_oriented_landmarks_json(file_path):
+    """
+    Read a DIVA oriented landmarks file (.json)
+
+    Parameters
+    ----------
+    file_path : str
+        path of the JSON file
+
+    Returns
+    ----------
+    diva_positions : ndarray
+        (N, 3) array of DIVA positions (x, y, z)
+    quaternions : ndarray
+        (N, 4) array of local rotations (x, y, z, w)
+
+    """
+    with open(file_path, 'r') as f:
+        oriented_landmarks_data = json.load(f)
+
+    return parse_oriented_landmarks(oriented_landmarks_data)
+
+
+def write_oriented_landmarks_json(file_path, diva_positions, quaternions):
+    """
+    Write a DIVA oriented landmarks file (.json)
+
+    Parameters
+    ----------
+    file_path : str
+        path of the JSON file
+    diva_positions : ndarray
+        (N, 3) array of DIVA positions (x, y, z)
+    quaternions : ndarray
+        (N, 4) array of local rotations (x, y, z, w)
+
+    """
+    oriented_landmarks = {
+        POSITIONS_KEY: [dict(zip(POSITION_AXES, position)) for position in np.asarray(diva_positions).reshape(-1, 3).tolist()],
+        ROTATIONS_KEY: [dict(zip(ROTATION_AXES, rotation)) for rotation in np.asarray(quaternions).reshape(-1, 4).tolist()],
+    }
+
+    with open(file_path, 'w') as f:
+        json.dump({PARAMETERS_KEY: oriented_landmarks}, f, separators=(',', ':'))
+
+
+# ============ Binary sidecar ============
+def get_sidecar_path(file_path):
+    """
+    Path of the binary sidecar of a landmarks JSON file
+
+    Parameters
+    ----------
+    file_path : str
+        path of the JSON file
+
+    Returns
+    ----------
+    sidecar_path : Path
+        path of the .npz file (next to the JSON file)
+
+    """
+    return Path(str(file_path) + SIDECAR_SUFFIX)
+
+
+def write_oriented_landmarks_npz(file_path, diva_positions, quaternions, json_file_path=None):
+    """
+    Write oriented landmarks in a compact binary file (.npz)
+
+    Parameters
+    ----------
+    file_path : str
+        path of the .npz file
+    diva_positions : ndarray
+        (N, 3) array of DIVA positions (x, y, z)
+    quaternions : ndarray
+        (N, 4) array of local rotations (x, y, z, w)
+    json_file_path : str
+        JSON file described by this sidecar (its size is stored to detect a later modification of the JSON file)
+
+    """
+    json_size = os.stat(json_file_path).st_size if json_file_path is not None else -1
+
+    with open(file_path, 'wb') as f:
+        np.savez(f, diva_positions=np.asarray(diva_positions), quaternions=np.asarray(quaternions, dtype=np.float64), json_size=json_size)
+
+
+def read_oriented_landmarks_npz(file_path):
+    """
+    Read oriented landmarks from a binary file (.npz)
+
+    Parameters
+    ----------
+    file_path : str
+        path of the .npz file
+
+    Returns
+    ----------
+    diva_positions : ndarray
+        (N, 3) array of DIVA positions (x, y, z)
+    quaternions : ndarray
+        (N, 4) array of local rotations (x, y, z, w)
+
+    """
+    with np.load(file_path) as data:
+        return data["diva_positions"], data["quaternions"]
+
+
+def is_sidecar_up_to_date(file_path):
+    """
+    Check if the binary sidecar of a JSON file exists and describes the current JSON file
+
+    Parameters
+    ----------
+    file_path : str
+        path of the JSON file
+
+    Returns
+    ----------
+    isUpToDate : bool
+        True if the sidecar can be read instead of the JSON file
+
+    """
+    sidecar_path = get_sidecar_path(file_path)
+    if not sidecar_path.exists():
+        return False
+
+    json_stat = os.stat(file_path)
+    if sidecar_path.stat().st_mtime < json_stat.st_mtime:
+        return False
+
+    try:
+        with np.load(sidecar_path) as data:
+            return int(data["json_size"]) == json_stat.st_size
+    except (OSError, KeyError, ValueError):
+        return False
+
+
+# ============ Landmark files ============
+def read_oriented_landmarks(file_path):
+    """
+    Read an oriented landmarks file: the binary sidecar is used when it is up to date, else the DIVA JSON file is parsed
+
+    Parameters
+    ----------
+    file_path : str
+        path of the JSON file
+
+    Returns
+    ----------
+    diva_positions : ndarray
+        (N, 3) array of DIVA positions (x, y, z)
+    quaternions : ndarray
+        (N, 4) array of local rotations (x, y, z, w)
+
+    """
+    if is_sidecar_up_to_date(file_path):
+        return read_oriented_landmarks_npz(get_sidecar_path(file_path))
+
+    return read_oriented_landmarks_json(file_path)
+
+
+def write_oriented_landmarks(file_path, diva_positions, quaternions, isSidecarWritten=None):
+    """
+    Write an oriented landmarks file for DIVA (.json), and its binary sidecar for large landmark sets
+
+    Parameters
+    ----------
+    file_path : str
+        path of the JSON file
+    diva_positions : ndarray
+        (N, 3) array of DIVA positions (x, y, z)
+    quaternions : ndarray
+        (N, 4) array of local rotations (x, y, z, w)
+    isSidecarWritten : bool
+        if True, the sidecar is written. If None, it is written if there are at least SIDECAR_MIN_LANDMARKS landmarks.
+
+    """
+    write_oriented_landmarks_json(file_path, diva_positions, quaternions)
+
+    if isSidecarWritten is None:
+        isSidecarWritten = len(diva_positions) >= SIDECAR_MIN_LANDMARKS
+
+    sidecar_path = get_sidecar_path(file_path)
+    if isSidecarWritten:
+        write_oriented_landmarks_npz(sidecar_path, diva_positions, quaternions, json_file_path=file_path)
+    elif sidecar_path.exists():
+        # an old sidecar would describe another landmark set
+        sidecar_path.unlink()
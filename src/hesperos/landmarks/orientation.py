@@ -0,0 +1,222 @@
+# ============ Import python packages ============
+import numpy as np
+
+
+# ============ Constants ============
+FORWARD_VECTOR = np.array([0.0, 0.0, 1.0])
+
+# quaternions (x, y, z, w) given to the landmarks added along an axis of the volume, and their orientation (x, y, z)
+AXIS_QUATERNIONS = np.array([
+    [0.0, 1.0, 0.0, 1.0], # landmark in x
+    [0.0, 1.0, 1.0, 0.0], # landmark in y
+    [0.0, 1.0, 0.0, 0.0], # landmark in z
+])
+AXIS_ORIENTATIONS = np.eye(3)
+
+
+# ============ Orientations ============
+def rotate_vectors(quaternions, vector3):
+    """
+    Rotate a vector by each quaternion : same as (quaternion * vector3) in Unity, for N quaternions at once
+    (inspired from https://answers.unity.com/questions/372371/multiply-quaternion-by-vector3-how-is-done.html)
+
+    Parameters
+    ----------
+    quaternions : ndarray
+        (N, 4) array of (x, y, z, w) quaternions
+    vector3 : ndarray
+        vector (x, y, z) to rotate
+
+    Returns
+    ----------
+    vectors : ndarray
+        (N, 3) array of the rotated vectors (x, y, z)
+
+    """
+    quaternions = np.asarray(quaternions, dtype=np.float64).reshape(-1, 4)
+    x, y, z, w = quaternions.T
+
+    rotations = np.empty((len(quaternions), 3, 3))
+    rotations[:, 0, 0] = 1.0 - 2.0 * (y * y + z * z)
+    rotations[:, 0, 1] = 2.0 * (x * y - w * z)
+    rotations[:, 0, 2] = 2.0 * (x * z + w * y)
+    rotations[:, 1, 0] = 2.0 * (x * y + w * z)
+    rotations[:, 1, 1] = 1.0 - 2.0 * (x * x + z * z)
+    rotations[:, 1, 2] = 2.0 * (y * z - w * x)
+    rotations[:, 2, 0] = 2.0 * (x * z - w * y)
+    rotations[:, 2, 1] = 2.0 * (y * z + w * x)
+    rotations[:, 2, 2] = 1.0 - 2.0 * (x * x + y * y)
+
+    return rotations @ np.asarray(vector3, dtype=np.float64)
+
+
+def quaternions_to_orientations(quaternions):
+    """
+    Compute the orientations of DIVA landmarks: forward vector rotated by the quaternion, with the z axis inverted.
+    The quaternions given to the landmarks added along an axis keep the orientation of the axis.
+
+    Parameters
+    ----------
+    quaternions : ndarray
+        (N, 4) array of (x, y, z, w) quaternions
+
+    Returns
+    ----------
+    orientations : ndarray
+        (N, 3) array of orientations (x, y, z)
+
+    """
+    quaternions = np.asarray(quaternions, dtype=np.float64).reshape(-1, 4)
+
+    orientations = rotate_vectors(quaternions, FORWARD_VECTOR)
+    orientations[:, 2] = - orientations[:, 2]
+
+    for axis_quaternion, axis_orientation in zip(AXIS_QUATERNIONS, AXIS_ORIENTATIONS):
+        orientations[np.all(quaternions == axis_quaternion, axis=1)] = axis_orientation
+
+    return orientations
+
+
+def get_axis_orientation(axis_index):
+    """
+    Orientation and quaternion of a landmark added in a 2D view, oriented along the axis orthogonal to the view
+
+    Parameters
+    ----------
+    axis_index : int
+        index of the current axis in the numpy order (z, y, x)
+
+    Returns
+    ----------
+    orientation : ndarray
+        orientation (x, y, z)
+    quaternion : ndarray
+        quaternion (x, y, z, w)
+
+    """
+    # numpy axes are ordered as (z, y, x)
+    axis = 2 - axis_index
+
+    return AXIS_ORIENTATIONS[axis].copy(), AXIS_QUATERNIONS[axis].copy()
+
+
+# ============ Positions ============
+def diva_to_volume_positions(diva_positions, shape):
+    """
+    Convert DIVA positions to voxel positions: DIVA volume is ordered as (x, y, z) with the z axis inverted,
+    numpy arrays are ordered as (z, y, x)
+
+    Parameters
+    ----------
+    diva_positions : ndarray
+        (N, 3) array of DIVA positions (x, y, z)
+    shape : tuple(int)
+        shape of the volume (z, y, x)
+
+    Returns
+    ----------
+    positions : ndarray
+        (N, 3) array of voxel positions (z, y, x)
+
+    """
+    diva_positions = np.round(np.asarray(diva_positions, dtype=np.float64).reshape(-1, 3))
+    positions = diva_positions[:, ::-1].astype(np.int64)
+    positions[:, 0] = shape[0] - positions[:, 0]
+
+    return positions
+
+
+def volume_to_diva_positions(positions, shape):
+    """
+    Convert voxel positions to DIVA positions (inverse of diva_to_volume_positions)
+
+    Parameters
+    ----------
+    positions : ndarray
+        (N, 3) array of voxel positions (z, y, x)
+    shape : tuple(int)
+        shape of the volume (z, y, x)
+
+    Returns
+    ----------
+    diva_positions : ndarray
+        (N, 3) array of DIVA positions (x, y, z)
+
+    """
+    positions = np.asarray(positions).reshape(-1, 3)
+    diva_positions = positions[:, ::-1].copy()
+    diva_positions[:, 2] = shape[0] - diva_positions[:, 2]
+
+    return diva_positions
+
+
+def are_inside_volume(positions, shape):
+    """
+    Check which positions are inside the volume (valid indexes: 0 <= position < shape along each axis)
+
+    Parameters
+    ----------
+    positions : ndarray
+        (N, 3) array of voxel positions (z, y, x)
+    shape : tuple(int)
+        shape of the volume (z, y, x)
+
+    Returns
+    ----------
+    isInside : ndarray
+        (N,) boolean array
+
+    """
+    positions = np.asarray(positions).reshape(-1, len(shape))
+
+    return np.all((positions >= 0) & (positions < np.asarray(shape)), axis=1)
+
+
+# ============ Napari layers ============
+def create_orientation_vectors(positions, orientations):
+    """
+    Create the data of a napari vectors layer: one vector per landmark, starting at its position
+
+    Parameters
+    ----------
+    positions : ndarray
+        (N, 3) array of voxel positions (z, y, x)
+    orientations : ndarray
+        (N, 3) array of orientations (x, y, z)
+
+    Returns
+    ----------
+    vectors : ndarray
+        (N, 2, 3) array of (position, projection) in the numpy order (z, y, x)
+
+    """
+    vectors = np.zeros((len(positions), 2, 3), dtype=np.float32)
+    if len(positions) > 0:
+        vectors[:, 0] = np.asarray(positions).reshape(-1, 3)
+        vectors[:, 1] = np.asarray(orientations).reshape(-1, 3)[:, ::-1]
+
+    return vectors
+
+
+def find_removed_index(old_positions, new_positions):
+    """
+    Find the index of the landmark removed from a list of positions
+
+    Parameters
+    ----------
+    old_positions : ndarray
+        (N, 3) positions before the removal
+    new_positions : ndarray
+        (N - 1, 3) positions after the removal
+
+    Returns
+    ----------
+    index : int
+        index of the removed landmark in old_positions
+
+    """
+    isDifferent = np.any(np.asarray(old_positions)[:-1] != np.asarray(new_positions), axis=1)
+    if np.any(isDifferent):
+        return int(np.argmax(isDifferent))
+
+    return len(old_positions) - 1
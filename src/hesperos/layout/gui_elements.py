@@ -14,7 +14,8 @@ from qtpy.QtWidgets import (
     QGroupBox,
     QGridLayout,
     QTextEdit,
-    QSpinBox
+    QSpinBox,
+    QInputDialog
 )
 from qtpy.QtGui import QPixmap, QFont
 from pathlib import Path, PurePath
@@ -772,4 +773,41 @@ def display_yes_no_question_box(title, message):
     if message_reply == QMessageBox.Yes:
         return True
     else:
-        return False
\ No newline at end of file
+        return False
+
+def display_item_choice_box(widget, title, message, list_items):
+    """
+    Display a list of items in a pop up window and ask the user to choose one
+
+    Parameters
+    ----------
+    widget : QWidget
+        parent widget
+    title : str
+        title of the pop up window
+    message : str
+        text to display
+    list_items : list[str]
+        items to choose from (identical items are displayed with a number to tell them apart)
+
+    Returns
+    ----------
+    index : int
+        index of the chosen item in list_items. None if Cancel.
+
+    """
+    displayed_items = []
+    for item in list_items:
+        displayed_item = item
+        nbr_duplicates = 1
+        while displayed_item in displayed_items:
+            nbr_duplicates += 1
+            displayed_item = f"{item} ({nbr_duplicates})"
+        displayed_items.append(displayed_item)
+
+    item, isOk = QInputDialog.getItem(widget, title, message, displayed_items, 0, False)
+
+    if isOk and (item in displayed_items):
+        return displayed_items.index(item)
+    else:
+        return None
@@ -78,7 +78,7 @@ class Classifier():
 
     def _prepare_data_for_inference(self):
         """
-        Extract the dataframe, all ready in the good format for the "rfc_inference" function
+        Extract the dataframe, all ready in the good format for an inference (model.predict_proba)
 
         """
         self.features = self.features_df
@@ -1,7 +1,3 @@
-# ============ Import python files ============
-from hesperos.one_shot_learning.features2d import Features2D
-
-
 # ============ Define 3D features class ============
 class Features3D:
     """
@@ -15,6 +11,7 @@ class Features3D:
         """
         self.is_feature_computed = False
         self.features_3d_list = []
+        self.source_img = None
 
     def _set_source_img(self, source_img):
         """
@@ -27,6 +24,8 @@ class Features3D:
 
         """
         self.source_img = source_img
+        self.features_3d_list = [None] * source_img.shape[0]
+        self.is_feature_computed = False
 
     def _add_2d_features(self, slice_index, features_2d_array):
         """
@@ -40,20 +39,26 @@ class Features3D:
             2D feature array
 
         """
-        self.features_3d_list.insert(slice_index, features_2d_array)
+        self.features_3d_list[slice_index] = features_2d_array
 
-    def _compute_features_3d(self):
+    def _compute_features_3d(self, slice_indexes=None):
         """
-        Compute 2D features for each slice of the 3D original image
+        Compute 2D features for each slice of the 3D original image (slices already computed are skipped)
+
+        Parameters
+        ----------
+        slice_indexes : list[int]
+            slice indexes of the 3D original image to compute. If None, all the slices are computed.
 
         """
-        features_2d_array = None
-        size_z = self.source_img.shape[0]
+        if slice_indexes is None:
+            slice_indexes = range(self.source_img.shape[0])
 
-        for z in range(size_z):
-            self._launch_3d_computation(z)
+        for z in slice_indexes:
+            if self.features_3d_list[z] is None:
+                self._launch_3d_computation(z)
 
-        self.is_feature_computed = True
+        self.is_feature_computed = all(features is not None for features in self.features_3d_list)
 
     def _launch_3d_computation(self, ind_z):
         """
@@ -65,6 +70,9 @@ class Features3D:
             slice index of the 3D original image
 
         """
+        # features2d imports pandas, scipy and scikit-image: imported when the first features are computed
+        from hesperos.one_shot_learning.features2d import Features2D
+
         features_2d = Features2D()
         features_2d._set_source_img(self.source_img[ind_z, :, :])
 
@@ -0,0 +1,199 @@
+# ============ Import python files ============
+from hesperos.one_shot_learning.features2d import TrainingFeatures
+from hesperos.one_shot_learning.utilities import get_annotated_slice_indexes, rfc_training, rfc_predict_slices
+
+
+# ============ Import python packages ============
+import queue
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ============ Define pipeline class ============
+class OneShotPipeline:
+    """
+    A class used to run the one shot learning process (features computation, training and inference) as a pipeline:
+    features of slice chunks are streamed into a bounded queue, consumed by inference workers as soon as the classifier is trained
+
+    """
+    def __init__(self, source_img, label, features_3d, output_classifier_path, output_proba=None, slice_order=None, chunk_size=4, nbr_inference_workers=2, max_queued_chunks=4):
+        """
+        Initilialisation
+
+        Parameters
+        ----------
+        source_img : ndarray
+            3D original image
+        label : ndarray
+            labelled data (same size than soure_img) with 2 classes : the region of interest and the "other structures"
+        features_3d : Features3D
+            cache of the 2D features of each slice of source_img (filled during the run)
+        output_classifier_path : str
+            path file where the classifier will be exported as a .pckl file
+        output_proba : ndarray
+            preallocated uint8 array (same size than source_img) where probabilities are written. If None, a new array is created.
+        slice_order : list[int]
+            order in which slices are computed and predicted. If None, slices are taken from first to last.
+        chunk_size : int
+            number of slices in a chunk (unit of work of the inference workers)
+        nbr_inference_workers : int
+            number of threads running inference
+        max_queued_chunks : int
+            maximum number of chunks with computed features waiting for inference (bounds how far feature computation runs ahead)
+
+        """
+        self.source_img = source_img
+        self.label = label
+        self.features_3d = features_3d
+        self.output_classifier_path = output_classifier_path
+
+        if output_proba is None:
+            output_proba = np.zeros(source_img.shape, dtype=np.uint8)
+        self.output_proba = output_proba
+
+        if slice_order is None:
+            slice_order = range(source_img.shape[0])
+        slice_order = list(slice_order)
+        self.chunks = [slice_order[i:i + chunk_size] for i in range(0, len(slice_order), chunk_size)]
+
+        self.nbr_inference_workers = nbr_inference_workers
+        self.chunk_queue = queue.Queue(maxsize=max_queued_chunks)
+        self.done_queue = queue.Queue()
+
+        self.model = None
+        self.model_ready = threading.Event()
+        self.stop_event = threading.Event()
+
+    def cancel(self):
+        """
+        Ask all the stages of the pipeline to stop as soon as possible
+
+        """
+        self.stop_event.set()
+        self.model_ready.set()
+
+    def run(self):
+        """
+        Run the pipeline. Generator yielding the slice indexes of each chunk once its probabilities are written in output_proba.
+        Closing the generator cancels the pipeline.
+
+        Yields
+        ----------
+        slice_indexes : list[int]
+            slice indexes of the chunk just predicted
+
+        """
+        # === Features of the annotated slices are needed before training ===
+        if self.features_3d.source_img is None:
+            self.features_3d._set_source_img(self.source_img)
+
+        annotated_slice_indexes = get_annotated_slice_indexes(self.label)
+        self.features_3d._compute_features_3d(annotated_slice_indexes)
+
+        with ThreadPoolExecutor(max_workers=2 + self.nbr_inference_workers) as executor:
+            futures = [
+                executor.submit(self._train, annotated_slice_indexes),
+                executor.submit(self._produce_features),
+            ]
+            futures += [executor.submit(self._infer) for _ in range(self.nbr_inference_workers)]
+
+            try:
+                nbr_finished_workers = 0
+                while nbr_finished_workers < self.nbr_inference_workers:
+                    slice_indexes = self.done_queue.get()
+                    if slice_indexes is None:
+                        nbr_finished_workers += 1
+                    else:
+                        yield slice_indexes
+            finally:
+                # stop the stages still running (generator closed or error raised)
+                self.cancel()
+
+            # re-raise errors of the stages
+            for future in futures:
+                future.result()
+
+    def _train(self, annotated_slice_indexes):
+        """
+        Train the classifier on the features of the annotated pixels
+
+        Parameters
+        ----------
+        annotated_slice_indexes : ndarray
+            indexes of the slices containing annotations
+
+        """
+        try:
+            # suppose only 2 labels
+            _, label_roi, label_other = np.unique(self.label)
+
+            train_features = TrainingFeatures()
+            for z in annotated_slice_indexes:
+                # Extract only features of tagged pixels
+                train_features.features_2d_array = self.features_3d.features_3d_list[z]
+                train_features._extract_tagged_features(self.label[z, :, :] == label_roi, self.label[z, :, :] == label_other)
+
+            train_features._create_features_df()
+
+            self.model = rfc_training(train_features.features_df, self.output_classifier_path)
+
+        finally:
+            # release the inference workers (they stop if the model is missing)
+            self.model_ready.set()
+
+    def _produce_features(self):
+        """
+        Compute the features of each chunk and put it in the bounded queue of chunks to infer
+
+        """
+        try:
+            for chunk in self.chunks:
+                if self.stop_event.is_set():
+                    return
+                self.features_3d._compute_features_3d(chunk)
+                self._put_chunk(chunk)
+        finally:
+            for _ in range(self.nbr_inference_workers):
+                self._put_chunk(None)
+
+    def _put_chunk(self, chunk):
+        """
+        Put a chunk in the queue, waiting for a free place unless the pipeline is cancelled
+
+        Parameters
+        ----------
+        chunk : list[int]
+            slice indexes of the chunk (None to signal the end of the chunks)
+
+        """
+        while not self.stop_event.is_set():
+            try:
+                self.chunk_queue.put(chunk, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _infer(self):
+        """
+        Predict the probabilities of the chunks of the queue once the classifier is trained
+
+        """
+        try:
+            self.model_ready.wait()
+
+            while (self.model is not None) and (not self.stop_event.is_set()):
+                try:
+                    chunk = self.chunk_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+                if chunk is None:
+                    return
+
+                features_2d_arrays = [self.features_3d.features_3d_list[z] for z in chunk]
+                self.output_proba[chunk] = rfc_predict_slices(self.model, features_2d_arrays)
+                self.done_queue.put(chunk)
+
+        finally:
+            self.done_queue.put(None)
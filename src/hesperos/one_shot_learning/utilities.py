@@ -1,6 +1,5 @@
 # ============ Import python files ============
 from hesperos.one_shot_learning.classifier import RandomForestClassifier
-from hesperos.one_shot_learning.features2d import TrainingFeatures, InferingFeatures
 
 
 # ============ Import python packages ============
@@ -10,6 +9,58 @@ import pickle
 import numpy as np
 
 
+# ============ Find the slices used for training ============
+def get_annotated_slice_indexes(label, halo=0):
+    """
+    Find the indexes of the slices (along the first axis) containing at least one annotated pixel
+
+    Parameters
+    ----------
+    label : ndarray
+        labelled data (3D) where 0 is the background
+    halo : int
+        number of neighbouring slices added on each side of an annotated slice (for features using neighbouring slices)
+
+    Returns
+    ----------
+    slice_indexes : ndarray
+        sorted indexes of the annotated slices (and their halo)
+
+    """
+    size_z = label.shape[0]
+    is_annotated = np.any(label.reshape(size_z, -1) != 0, axis=1)
+
+    if halo > 0:
+        # a slice is kept if an annotated slice lies within the halo distance
+        cumulative = np.concatenate(([0], np.cumsum(is_annotated)))
+        lower = np.clip(np.arange(size_z) - halo, 0, size_z)
+        upper = np.clip(np.arange(size_z) + halo + 1, 0, size_z)
+        is_annotated = (cumulative[upper] - cumulative[lower]) > 0
+
+    return np.flatnonzero(is_annotated)
+
+
+def get_slice_order_from_center(size_z, center_index):
+    """
+    Order the slice indexes by distance to a center slice (the center first, then its neighbours alternately above and below)
+
+    Parameters
+    ----------
+    size_z : int
+        number of slices
+    center_index : int
+        index of the slice to start from (e.g. the slice currently displayed)
+
+    Returns
+    ----------
+    slice_order : list[int]
+        all the slice indexes, ordered by distance to the center slice
+
+    """
+    center_index = int(np.clip(center_index, 0, size_z - 1))
+    return sorted(range(size_z), key=lambda z: abs(z - center_index))
+
+
 # ============ Train a classifier on the tagged pixels only ============
 def rfc_training(features_df, output_classifier_path):
     """
@@ -26,6 +77,12 @@ def rfc_training(features_df, output_classifier_path):
             }
     output_classifier_path : str
         path file where the classifier will be exported as a .pckl file
+
+    Returns
+    ----------
+    model : sklearn.ensemble.RandomForestClassifier
+        trained classifier
+
     """
 
     # === Create Random Forest Classifier
@@ -41,55 +98,42 @@ def rfc_training(features_df, output_classifier_path):
     # === Export the classifier
     pickle.dump(rfc.model, open(output_classifier_path, 'wb'))
 
+    return rfc.model
+
 
 # ============ Infer a probability for all the pixels of a 3D image ============
-def rfc_inference(features_df, output_classifier_path, proba_list, size_y, size_x):
+def rfc_predict_slices(model, features_2d_arrays):
     """
-    Run a inference of a trained Random Forest Classifier on the features data given (without label data)
+    Run a inference of a trained classifier on the 2D features of several slices at once
 
     Parameters
     ----------
-    features_df : dataframe
-        2D features (normed 0-255) of all pixels of a 2D image (so the size of the dataframe is size_x*size_y)
-        as {  0 : [Feature1, Feature2, ...],
-            1 : [Feature1, Feature2, ...]
-                ...
-            }
-    output_classifier_path : str
-        path file where the classifier is loaded
-    proba_list : list
-        description
-    size_y : int
-        description
-    size_x : int
-        description
-
-    """
-
-    # === Create Random Forest Classifier
-    rfc = RandomForestClassifier(classifier_path=output_classifier_path, features_df=features_df)
+    model : sklearn.ensemble.RandomForestClassifier
+        trained classifier
+    features_2d_arrays : list[ndarray]
+        2D features array of each slice, as (nb_features, size_y, size_x)
 
-    # === Load features data
-    rfc._prepare_data_for_inference()
+    Returns
+    ----------
+    output_proba : ndarray
+        probabilities normed between 0 to 255 (uint8) as (nb_slices, size_y, size_x)
 
-    # === Run inference to predict output log probabilities ===
-    proba = rfc.model.predict_proba(rfc.features)
-    proba = proba[:,1]
-    nonzero_proba = np.array([min(max(p, 0.001), 0.999) for p in proba])
-    log_proba = np.log(nonzero_proba)
-    log_proba[np.where(np.isinf(log_proba))] = -100
+    """
+    features = np.stack(features_2d_arrays, axis=1)
+    nb_features = features.shape[0]
 
-    # === Convert it to probabilities ===
-    output_proba = np.exp(log_proba)
-    output_proba = output_proba * 255
+    proba = model.predict_proba(features.reshape(nb_features, -1).T)[:, 1]
+    # probabilities are kept between 0.001 and 0.999
+    output_proba = np.clip(proba, 0.001, 0.999) * 255
 
-    proba_list.append(output_proba.reshape(size_y, size_x).astype(np.uint8))
+    return output_proba.reshape(features.shape[1:]).astype(np.uint8)
 
 
 # ============ Run Process ============
-def run_one_shot_learning(source_img, label, output_classifier_path):
+def run_one_shot_learning(source_img, label, output_classifier_path, output_proba=None, slice_order=None):
     """
-    Run one shot learning proccess (learning and inference)
+    Run one shot learning proccess (learning and inference).
+    Features computation, training and inference are pipelined (see OneShotPipeline).
 
     Parameters
     ----------
@@ -99,64 +143,30 @@ def run_one_shot_learning(source_img, label, output_classifier_path):
         labelled data (same size than soure_img) with 2 classes : the region of interest (1) and the "other structures" (2)
     output_classifier_path : str
         path to save the model
+    output_proba : ndarray
+        preallocated uint8 array (same size than source_img) where probabilities are written. If None, a new array is created.
+    slice_order : list[int]
+        order in which slices are predicted. If None, slices are taken from first to last.
 
     Returns
     ----------
     output_proba : ndarray
-        output probabilities normed between 0 to 1 (same size than source_img) where 1 is the highest probabilities for a pixel to be in the region of interest
+        output probabilities normed between 0 to 255 (same size than source_img) where 255 is the highest probabilities for a pixel to be in the region of interest
 
     """
-
-    # === Load data ===
-    size_z , size_y, size_x = source_img.shape
-
-    # === Extract tagged pixels ===
-    # suppose only 2 labels
-    _, label_roi, label_other = np.unique(label)
-
-    mask_roi = (label == label_roi)
-    mask_other = (label == label_other)
-
-    # incr = round(source_img.shape[size_z]/50)
-
-    # === Compute all features ===
-    if not napari.features_3d.is_feature_computed:
-        napari.features_3d._set_source_img(source_img)
-        napari.features_3d._compute_features_3d()
-
-    # === Create features data needed for training a RFC ===
-    train_features = TrainingFeatures()
-    for z in range(size_z):
-        # Extract only features of tagged pixels
-        train_features.features_2d_array = napari.features_3d.features_3d_list[z]
-        train_features._extract_tagged_features(mask_roi[z, :, :], mask_other[z, :, :])
-
-    train_features._create_features_df()
-
-    # === Train the classifier ===
-    rfc_training(train_features.features_df, output_classifier_path)
-    del train_features
-
-    # === Create 2D features data needed to infer with a RFC ===
-    proba_list = []
-    # for z in range(source_img.shape[0]):
-    #     infer_features = InferingFeatures()
-    #     infer_features._set_source_img(source_img[z, :, :])
-    #     # Compute 2D features
-    #     infer_features._compute_features_2d()
-    #     # Create feature dataframe
-    #     infer_features._create_features_df()
-
-    for z in range(size_z):
-        infer_features = InferingFeatures()
-        infer_features.features_2d_array = napari.features_3d.features_3d_list[z]
-        # Create feature dataframe
-        infer_features._create_features_df()
-
-    # === Infer the classifier for the corresponding 2D slice ===
-        rfc_inference(infer_features.features_df, output_classifier_path, proba_list, size_y, size_x)
-
-    # === Display the output results ===
-    output_proba = np.stack(proba_list, axis=0)
-
-    return output_proba
\ No newline at end of file
+    # imported here to avoid a circular import (the pipeline uses the functions of this file)
+    from hesperos.one_shot_learning.pipeline import OneShotPipeline
+
+    pipeline = OneShotPipeline(
+        source_img=source_img,
+        label=label,
+        features_3d=napari.features_3d,
+        output_classifier_path=output_classifier_path,
+        output_proba=output_proba,
+        slice_order=slice_order,
+    )
+
+    for _ in pipeline.run():
+        pass
+
+    return pipeline.output_proba